@@ -0,0 +1,371 @@
+"""Benchmark offline del pipeline de extracción (sin red ni navegador).
+
+Ejecuta la extracción del perfil de cada sitio (``mercadoscript.profiles``)
+y la fusión de duplicados del motor sobre un corpus de páginas guardadas y reporta páginas/s, productos/s, latencia p50/p95 por
+página y pico de memoria. Los resultados se guardan en JSON para comparar
+ejecuciones en el tiempo.
+
+Estructura del corpus::
+
+    corpus/
+        sirena/home/*.html       # página principal (descubrimiento de categorías)
+        sirena/listing/*.html    # páginas de categoría con productos
+        jumbo/listing/*.html
+        nacional/listing/*.html
+        bravo/listing/*.html
+        <retailer>/manifest.json # opcional: {"archivo.html": {"url": ..., "category": ...}}
+
+Uso::
+
+    python benchmarks/extraction_bench.py synthesize benchmarks/corpus
+    python benchmarks/extraction_bench.py run benchmarks/corpus --output resultados.json
+    python benchmarks/extraction_bench.py run benchmarks/corpus --compare anterior.json
+
+``synthesize`` genera un corpus sintético a partir de los inventarios CSV del
+repositorio, útil cuando no hay páginas reales guardadas.
+"""
+import argparse
+import contextlib
+import csv
+import html
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from bs4 import BeautifulSoup
+
+BASE_URLS = {
+    'sirena': 'https://www.sirena.do/',
+    'jumbo': 'https://jumbo.com.do/',
+    'nacional': 'https://supermercadosnacional.com/',
+    'bravo': 'https://www.superbravo.com.do/',
+}
+
+INVENTORY_FILES = {
+    'sirena': ('Inventario_Sirena.csv', 'nombre', 'precio', 'categoria'),
+    'jumbo': ('Inventario_Jumbo.csv', 'nombre', 'precio', 'categoria'),
+    'nacional': ('inventario_nacional_1748139428.csv', 'Nombre', 'Precio', 'Categorias'),
+    'bravo': ('Inventario_Bravo.csv', 'Nombre', 'Precio', 'Categoria'),
+}
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def load_corpus(corpus_dir, retailer, page_type):
+    """Cargar las páginas de un retailer como lista de (nombre, html, url, categoría)"""
+    folder = Path(corpus_dir) / retailer / page_type
+    if not folder.is_dir():
+        return []
+
+    manifest_path = Path(corpus_dir) / retailer / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8')) if manifest_path.exists() else {}
+
+    pages = []
+    for path in sorted(folder.glob('*.html')):
+        meta = manifest.get(path.name, {})
+        pages.append((
+            path.name,
+            path.read_text(encoding='utf-8', errors='replace'),
+            meta.get('url', BASE_URLS[retailer]),
+            meta.get('category', path.stem),
+        ))
+    return pages
+
+
+def _read_inventory(retailer):
+    filename, name_col, price_col, category_col = INVENTORY_FILES[retailer]
+    with open(REPO_ROOT / filename, newline='', encoding='utf-8') as f:
+        return [(row[name_col], row[price_col], row[category_col].split(';')[0].strip())
+                for row in csv.DictReader(f)]
+
+
+def _boilerplate(base_url, categories):
+    """Cabecera y pie típicos: la extracción también paga por recorrerlos"""
+    nav = ''.join(
+        f'<li><a href="{base_url}{html.escape(c.lower().replace(" ", "-"))}/">{html.escape(c)}</a></li>'
+        for c in categories
+    )
+    header = (f'<header class="header"><nav class="main-menu navigation"><ul>{nav}</ul></nav>'
+              f'<div class="search"><a href="{base_url}search">Buscar</a></div></header>')
+    footer = ('<footer><ul><li><a href="/contacto">Contacto</a></li><li><a href="/ayuda">Ayuda</a></li></ul>'
+              '<p>Copyright - Todos los derechos reservados</p></footer>')
+    return header, footer
+
+
+def _listing_page(base_url, category, products, page_number, total_pages, categories):
+    header, footer = _boilerplate(base_url, categories)
+    slug = category.lower().replace(' ', '-')
+    cards = []
+    for i, (name, price, _) in enumerate(products):
+        name_html = html.escape(name)
+        cards.append(
+            f'<li class="product-item item"><div class="product-card card">'
+            f'<a class="product-item-link" href="{base_url}producto/{slug}-{page_number}-{i}" title="{name_html}">'
+            f'<img src="/img/{i}.jpg" alt="{name_html}"></a>'
+            f'<h3 class="product-name">{name_html}</h3>'
+            f'<span class="price">{html.escape(price)}</span>'
+            f'<button>Añadir al carrito</button></div></li>'
+        )
+    pages = ''.join(
+        f'<li><a href="{base_url}{slug}?p={n}">{n}</a></li>' for n in range(1, total_pages + 1)
+    )
+    return (
+        f'<html><head><title>{html.escape(category)}</title></head><body>{header}'
+        f'<main><div class="sidebar filters"><a href="{base_url}{slug}/ofertas">Ofertas {html.escape(category)}</a></div>'
+        f'<ol class="products list product-grid">{"".join(cards)}</ol>'
+        f'<div class="pagination"><ul>{pages}</ul></div></main>{footer}</body></html>'
+    )
+
+
+def synthesize_corpus(corpus_dir, page_size=24, max_pages=40):
+    """Generar un corpus sintético a partir de los inventarios CSV del repositorio"""
+    for retailer, base_url in BASE_URLS.items():
+        rows = _read_inventory(retailer)
+        categories = sorted({row[2] for row in rows if row[2]})
+        listing_dir = Path(corpus_dir) / retailer / 'listing'
+        home_dir = Path(corpus_dir) / retailer / 'home'
+        listing_dir.mkdir(parents=True, exist_ok=True)
+        home_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {}
+        by_category = {}
+        for row in rows:
+            by_category.setdefault(row[2], []).append(row)
+
+        page_count = 0
+        for category, products in by_category.items():
+            chunks = [products[i:i + page_size] for i in range(0, len(products), page_size)]
+            for page_number, chunk in enumerate(chunks, 1):
+                if page_count >= max_pages:
+                    break
+                name = f'{page_count:03d}.html'
+                url = f"{base_url}{category.lower().replace(' ', '-')}?p={page_number}"
+                (listing_dir / name).write_text(
+                    _listing_page(base_url, category, chunk, page_number, len(chunks), categories),
+                    encoding='utf-8'
+                )
+                manifest[name] = {'url': url, 'category': category}
+                page_count += 1
+
+        header, footer = _boilerplate(base_url, categories)
+        (home_dir / 'home.html').write_text(
+            f'<html><body>{header}<main><div class="category-list">{header}</div></main>{footer}</body></html>',
+            encoding='utf-8'
+        )
+        (Path(corpus_dir) / retailer / 'manifest.json').write_text(
+            json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8'
+        )
+        print(f"✓ {retailer}: {page_count} páginas de listado")
+
+
+# ---------------------------------------------------------------------------
+# Objetivos del benchmark
+# ---------------------------------------------------------------------------
+
+def build_targets():
+    """Cada objetivo: (retailer, función, tipo de página, fn(soup, url, categoría) -> items)"""
+    from mercadoscript.profiles import profile
+
+    targets = []
+    for retailer in BASE_URLS:
+        site = profile(retailer)
+        targets.append((retailer, 'extract_products', 'listing',
+                        lambda soup, url, category, site=site: site.extract_products(soup, url)))
+        targets.append((retailer, 'category_links', 'home',
+                        lambda soup, url, category, site=site: site.category_links(soup, url)))
+        if site.subcategories:
+            targets.append((retailer, 'subcategory_links', 'listing',
+                            lambda soup, url, category, site=site: site.subcategory_links(
+                                soup, url, {'name': category, 'url': url})))
+        targets.append((retailer, 'pagination_links', 'listing',
+                        lambda soup, url, category, site=site: site.pagination_links(soup, url)))
+    return targets
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _quiet():
+    """Silenciar prints y logs de los scrapers para no medir la consola"""
+    stack = contextlib.ExitStack()
+    devnull = stack.enter_context(open(os.devnull, 'w'))
+    stack.enter_context(contextlib.redirect_stdout(devnull))
+    return stack
+
+
+def run_target(pages, fn, repeat=1):
+    """Medir un objetivo: una pasada cronometrada y otra con tracemalloc"""
+    latencies = []
+    items = 0
+    outputs = []
+    started = time.perf_counter()
+    with _quiet():
+        for _ in range(repeat):
+            for _, page_html, url, category in pages:
+                t0 = time.perf_counter()
+                soup = BeautifulSoup(page_html, 'html.parser')
+                result = fn(soup, url, category)
+                latencies.append(time.perf_counter() - t0)
+                items += len(result)
+                outputs.append((category, url, result))
+    elapsed = time.perf_counter() - started
+
+    # Pasada separada para memoria: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    with _quiet():
+        for _, page_html, url, category in pages:
+            fn(BeautifulSoup(page_html, 'html.parser'), url, category)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    page_count = len(latencies)
+    return {
+        'pages': page_count,
+        'items': items,
+        'seconds': round(elapsed, 4),
+        'pages_per_sec': round(page_count / elapsed, 2) if elapsed else None,
+        'items_per_sec': round(items / elapsed, 2) if elapsed else None,
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 0.95) * 1000, 3),
+        'peak_mem_kb': round(peak / 1024, 1),
+    }, outputs
+
+
+def run_nacional_dedupe(outputs):
+    """merge_similar trabaja sobre todo el inventario, no por página"""
+    from mercadoscript.engine import merge_similar
+
+    productos = [
+        {**p, 'categoria': category, 'url_categoria': url}
+        for category, url, result in outputs for p in result
+    ]
+    started = time.perf_counter()
+    with _quiet():
+        unicos = merge_similar(productos)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    with _quiet():
+        merge_similar(productos)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'pages': 0,
+        'items': len(productos),
+        'unique': len(unicos),
+        'seconds': round(elapsed, 4),
+        'items_per_sec': round(len(productos) / elapsed, 2) if elapsed else None,
+        'peak_mem_kb': round(peak / 1024, 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(corpus_dir, only=None, repeat=1):
+    targets = build_targets()
+    logging.getLogger().setLevel(logging.WARNING)
+    results = []
+    nacional_outputs = []
+
+    for retailer, name, page_type, fn in targets:
+        if only and retailer not in only:
+            continue
+        pages = load_corpus(corpus_dir, retailer, page_type)
+        if not pages:
+            print(f"⚠️ {retailer}/{page_type}: corpus vacío, se omite {name}")
+            continue
+
+        metrics, outputs = run_target(pages, fn, repeat)
+        results.append({'retailer': retailer, 'target': name, **metrics})
+        print(f"✓ {retailer}.{name}: {metrics['pages_per_sec']} pág/s, {metrics['items_per_sec']} items/s, "
+              f"p50 {metrics['p50_ms']} ms, p95 {metrics['p95_ms']} ms, pico {metrics['peak_mem_kb']} KB")
+        if (retailer, name) == ('nacional', 'extract_products'):
+            nacional_outputs = outputs
+
+    if nacional_outputs:
+        metrics = run_nacional_dedupe(nacional_outputs)
+        results.append({'retailer': 'nacional', 'target': 'merge_similar', **metrics})
+        print(f"✓ nacional.merge_similar: {metrics['items']} productos en {metrics['seconds']} s, "
+              f"pico {metrics['peak_mem_kb']} KB")
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': str(corpus_dir),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(previous, current):
+    """Mostrar la variación de throughput y latencia frente a una ejecución anterior"""
+    before = {(r['retailer'], r['target']): r for r in previous['results']}
+    print(f"\n📊 COMPARACIÓN CON {previous.get('commit')} ({previous.get('timestamp')}):")
+    for result in current['results']:
+        old = before.get((result['retailer'], result['target']))
+        if not old:
+            continue
+        parts = []
+        for key in ('items_per_sec', 'p50_ms', 'p95_ms', 'peak_mem_kb'):
+            if old.get(key) and result.get(key) is not None:
+                change = (result[key] - old[key]) / old[key] * 100
+                parts.append(f"{key} {change:+.1f}%")
+        print(f"   {result['retailer']}.{result['target']}: {', '.join(parts)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline de extracción")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    synth = subparsers.add_parser('synthesize', help="Generar corpus sintético desde los CSV")
+    synth.add_argument('corpus')
+    synth.add_argument('--page-size', type=int, default=24)
+    synth.add_argument('--max-pages', type=int, default=40)
+
+    run = subparsers.add_parser('run', help="Ejecutar el benchmark sobre un corpus")
+    run.add_argument('corpus')
+    run.add_argument('--only', nargs='*', choices=sorted(BASE_URLS), help="Limitar a estos retailers")
+    run.add_argument('--repeat', type=int, default=1, help="Repeticiones de la pasada cronometrada")
+    run.add_argument('--output', help="Archivo JSON de resultados")
+    run.add_argument('--compare', help="JSON de una ejecución anterior")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'synthesize':
+        synthesize_corpus(args.corpus, args.page_size, args.max_pages)
+        return
+
+    report = run_benchmark(args.corpus, args.only, args.repeat)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"💾 Resultados guardados en {args.output}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding='utf-8')), report)
+
+
+if __name__ == "__main__":
+    main()
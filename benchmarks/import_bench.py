@@ -0,0 +1,123 @@
+"""Benchmark del tiempo de importación de cada punto de entrada.
+
+Cada medición se hace en un intérprete nuevo (``python -X importtime``), así
+que incluye todo lo que el script carga al importarse. Además de la mediana
+de varias repeticiones, se reportan los paquetes más costosos y se
+comprueba que las dependencias pesadas (Selenium, bs4, requests) no se
+cargan hasta que se usan.
+
+Uso::
+
+    python benchmarks/import_bench.py
+    python benchmarks/import_bench.py --repeat 10 --output importacion.json
+    python benchmarks/import_bench.py --compare importacion_anterior.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = ('Sirena', 'Jumbo', 'Nacional', 'Bravo', 'check_webdriver', 'mercadoscript.frontier')
+HEAVY_MODULES = ('selenium', 'bs4', 'requests')
+
+_PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def _parse_importtime(stderr):
+    """Tiempo propio (µs) sumado por paquete de primer nivel"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        top = name.split('.', 1)[0]
+        packages[top] = packages.get(top, 0) + int(own)
+    return packages
+
+
+def measure(module, repeat=5):
+    """Medir la importación de ``module`` en ``repeat`` intérpretes nuevos"""
+    times, heavy, packages = [], [], {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"No se pudo importar {module}: {result.stderr.strip().splitlines()[-1:]}")
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(probe['seconds'])
+        heavy = probe['heavy']
+        packages = _parse_importtime(result.stderr)
+    return {
+        'entry_point': module,
+        'median_ms': round(statistics.median(times) * 1000, 1),
+        'min_ms': round(min(times) * 1000, 1),
+        'heavy_loaded': heavy,
+        'top_packages': sorted(
+            ({'package': name, 'ms': round(us / 1000, 1)} for name, us in packages.items()),
+            key=lambda p: p['ms'], reverse=True
+        )[:5],
+    }
+
+
+def run_benchmark(entry_points=ENTRY_POINTS, repeat=5):
+    results = []
+    print(f"\n⏱️  TIEMPO DE IMPORTACIÓN ({repeat} repeticiones, intérprete nuevo en cada una):")
+    print("-" * 78)
+    for module in entry_points:
+        result = measure(module, repeat)
+        results.append(result)
+        heavy = ', '.join(result['heavy_loaded']) or 'ninguna'
+        top = ', '.join(f"{p['package']} {p['ms']:.0f}" for p in result['top_packages'][:3])
+        print(f"   {module:<24} {result['median_ms']:>7.1f} ms  pesadas: {heavy:<22} top: {top}")
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'results': results,
+    }
+
+
+def compare(previous, current):
+    """Variación de la mediana frente a una ejecución anterior"""
+    before = {r['entry_point']: r for r in previous['results']}
+    print(f"\n📊 COMPARACIÓN CON {previous.get('timestamp')}:")
+    for result in current['results']:
+        old = before.get(result['entry_point'])
+        if old and old.get('median_ms'):
+            change = (result['median_ms'] - old['median_ms']) / old['median_ms'] * 100
+            print(f"   {result['entry_point']}: {old['median_ms']:.1f} → {result['median_ms']:.1f} ms ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de importación de los puntos de entrada")
+    parser.add_argument('--only', nargs='*', help="Limitar a estos módulos")
+    parser.add_argument('--repeat', type=int, default=5, help="Intérpretes nuevos por punto de entrada")
+    parser.add_argument('--output', help="Archivo JSON de resultados")
+    parser.add_argument('--compare', help="JSON de una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.only or ENTRY_POINTS, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultados guardados en {args.output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
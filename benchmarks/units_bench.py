@@ -0,0 +1,80 @@
+"""Benchmark del parser de tamaño y precio por unidad.
+
+Repite los nombres y precios de los inventarios CSV del repositorio hasta
+``--rows`` filas y mide ``units.unit_prices`` sobre el lote completo. Se
+compara con un recorrido fila a fila (``SIZE_PATTERN.search`` por nombre)
+como referencia.
+
+Uso::
+
+    python benchmarks/units_bench.py
+    python benchmarks/units_bench.py --rows 1000000 --repeat 3
+"""
+import argparse
+import csv
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from mercadoscript import units  # noqa: E402
+
+INVENTORIES = ('Inventario_Jumbo.csv', 'Inventario_Sirena.csv', 'Inventario_Bravo.csv',
+               'inventario_nacional_1748139428.csv')
+
+
+def load_rows(rows):
+    names, prices = [], []
+    for filename in INVENTORIES:
+        path = REPO_ROOT / filename
+        if not path.exists():
+            continue
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                row = {key.lower(): value for key, value in row.items()}
+                names.append(row.get('nombre', ''))
+                prices.append(row.get('precio', ''))
+    if not names:
+        raise SystemExit("❌ No hay inventarios CSV en el repositorio")
+    repeat = rows // len(names) + 1
+    return (names * repeat)[:rows], (prices * repeat)[:rows]
+
+
+def per_row(names):
+    # Referencia: una búsqueda por fila, lo que el lote evita
+    return [units.SIZE_PATTERN.search(name) for name in names]
+
+
+def timed(function, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del parser de precio por unidad")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    names, prices = load_rows(args.rows)
+    batch = timed(units.unit_prices, names, prices, repeat=args.repeat)
+    sizes = timed(units.parse_sizes, names, repeat=args.repeat)
+    reference = timed(per_row, names, repeat=args.repeat)
+    parsed = sum(1 for size in units.parse_sizes(names) if size)
+
+    print(f"\n⏱️  PRECIO POR UNIDAD ({len(names):,} filas, mediana de {args.repeat}):")
+    print(f"   Lote completo (tamaño + precio): {batch * 1000:8.1f} ms  ({len(names) / batch:,.0f} filas/s)")
+    print(f"   Solo tamaños:                    {sizes * 1000:8.1f} ms")
+    print(f"   Referencia fila a fila (search): {reference * 1000:8.1f} ms")
+    print(f"   Con tamaño: {parsed:,} ({parsed / len(names):.0%})")
+
+
+if __name__ == "__main__":
+    main()
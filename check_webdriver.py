@@ -1,25 +1,65 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-import traceback
+import argparse
 import sys
+import traceback
+
+from mercadoscript import browser_service, preflight
 
-print(f"Python version: {sys.version}")
-print(f"Selenium version: {webdriver.__version__}")
 
-try:
+def launch_chrome():
+    """Boot a real headless Chrome with the cached environment"""
+    from mercadoscript import browser
+
+    options = browser.Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
     print("Attempting to initialize Chrome WebDriver...")
-    driver = webdriver.Chrome()
+    driver = browser.create_chrome(options)
     print("SUCCESS: Chrome WebDriver initialized successfully!")
     print(f"Chrome Driver version: {driver.capabilities['chrome']['chromedriverVersion']}")
     print(f"Chrome Browser version: {driver.capabilities['browserVersion']}")
     driver.quit()
     print("WebDriver closed properly.")
-except Exception as e:
-    print(f"ERROR: {type(e).__name__}: {e}")
-    print("\nDetailed traceback:")
-    traceback.print_exc()
-    print("\nPossible issues:")
-    print("1. Chrome browser not installed")
-    print("2. WebDriver not in PATH or incompatible with Chrome version")
-    print("3. Permission issues or antivirus blocking WebDriver")
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the Chrome/WebDriver environment")
+    parser.add_argument('--refresh', action='store_true', help="Ignore the cached preflight and detect again")
+    parser.add_argument('--launch', action='store_true', help="Also boot a real Chrome to confirm it works")
+    parser.add_argument('--service', nargs='?', const=browser_service.DEFAULT_ADDRESS, metavar='HOST:PORT',
+                        help="Also check the persistent browser service")
+    args = parser.parse_args(argv)
+
+    print(f"Python version: {sys.version}")
+    info = preflight.preflight(refresh=args.refresh)
+    print(f"Selenium version: {info['fingerprint']['selenium'] or 'not installed'}")
+    print(f"Chrome: {info['chrome_path'] or 'not found'} ({info['chrome_version'] or 'unknown version'})")
+    print(f"ChromeDriver: {info['driver_path'] or 'not found'} ({info['driver_version'] or 'unknown version'})")
+    print(f"Preflight: {'cached in ' + preflight.CACHE_PATH if info['cached'] else 'detected now'}")
+
+    issues = preflight.problems(info)
+    for issue in issues:
+        print(f"WARNING: {issue}")
+
+    if args.service:
+        version = browser_service.health(args.service)
+        print(f"Browser service at {args.service}: {version['Browser'] if version else 'not responding'}")
+
+    if not args.launch:
+        return 1 if issues and not info['chrome_path'] else 0
+
+    try:
+        launch_chrome()
+        return 0
+    except Exception as e:
+        print(f"ERROR: {type(e).__name__}: {e}")
+        print("\nDetailed traceback:")
+        traceback.print_exc()
+        print("\nPossible issues:")
+        print("1. Chrome browser not installed")
+        print("2. WebDriver not in PATH or incompatible with Chrome version")
+        print("3. Permission issues or antivirus blocking WebDriver")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
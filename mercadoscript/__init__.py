@@ -0,0 +1,8 @@
+"""Componentes compartidos por los scrapers de Mercadoscript.
+
+Los scripts de cada supermercado (Sirena.py, Jumbo.py, Nacional.py y
+Bravo.py) siguen siendo los puntos de entrada, como envoltorios finos del
+motor común (``engine``); este paquete agrupa ese motor, la infraestructura
+que comparten y los perfiles declarativos con las reglas de cada sitio
+(``profiles``).
+"""
@@ -0,0 +1,385 @@
+"""API HTTP local de consulta sobre los últimos resultados de los scrapers.
+
+Sirve en JSON, sin que los consumidores tengan que leer nuestros CSV:
+
+* ``GET /retailers``: retailers cargados, con su archivo y número de productos;
+* ``GET /products?retailer=jumbo&category=Lácteos&page=2&per_page=50``;
+* ``GET /search?q=leche entera&max_price=150&sort=precio_por_unidad``;
+* ``GET /categories?retailer=nacional``: categorías con su número de productos;
+* ``GET /history?q=leche entera lider 1 lt&retailer=nacional``: precio del
+  producto en cada inventario guardado de ese retailer;
+* ``GET /health`` y ``POST /refresh`` (recargar ya, p. ej. al terminar un run).
+
+Los datos calientes viven en memoria en un ``Snapshot`` inmutable (índice
+de búsqueda, categorías, historial). Un hilo comprueba cada
+``--refresh-interval`` segundos si algún scraper escribió un inventario
+nuevo; si es así construye un snapshot nuevo y lo sustituye de una vez, así
+que ninguna petición ve datos a medias. El historial se lee archivo a
+archivo y cada archivo ya leído se reutiliza mientras no cambie.
+
+Cada respuesta lleva un ``ETag`` ligado a la versión del snapshot; con
+``If-None-Match`` se responde ``304`` sin cuerpo. Las respuestas se cachean
+ya serializadas (LRU por ruta y parámetros) hasta el siguiente refresco.
+Las listas se paginan con ``page`` y ``per_page`` (máximo ``MAX_PER_PAGE``).
+
+Uso::
+
+    python -m mercadoscript.api --port 8780
+    curl 'http://127.0.0.1:8780/search?q=leche%20entera&per_page=5'
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from mercadoscript import inventories
+from mercadoscript.core import normalizar_texto, normalizar_textos
+from mercadoscript.search import SORT_KEYS, SearchIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8780
+DEFAULT_REFRESH_INTERVAL = 30
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+CACHE_SIZE = 1024
+
+PUBLIC_FIELDS = ('retailer', 'nombre', 'precio', 'precio_num', 'categoria', 'cantidad_base', 'unidad_base',
+                 'precio_por_unidad', 'url', 'sku')
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _public(record):
+    return {field: record.get(field) for field in PUBLIC_FIELDS}
+
+
+class PriceHistory:
+    """Precio de cada producto en cada inventario guardado, por retailer"""
+
+    def __init__(self):
+        self._files = {}  # firma -> (fecha, {clave: (precio_num, precio)})
+
+    def _load(self, path, retailer):
+        signature = inventories.signature(path)
+        cached = self._files.get(signature)
+        if cached is None:
+            records = inventories.load_inventory(path, retailer)
+            keys = normalizar_textos([r['nombre'] for r in records])
+            prices = {}
+            for key, record in zip(keys, records):
+                prices.setdefault(key, (record['precio_num'], record['precio']))
+            cached = self._files[signature] = (os.path.getmtime(path), prices)
+        return signature, cached
+
+    def build(self, directory, retailers):
+        """Historial ``{retailer: [(fecha, archivo, precios)]}`` en orden cronológico"""
+        history, live = {}, set()
+        for retailer in retailers:
+            runs = []
+            for path in inventories.inventory_files(retailer, directory):
+                signature, (timestamp, prices) = self._load(path, retailer)
+                live.add(signature)
+                runs.append((timestamp, os.path.basename(path), prices))
+            history[retailer] = sorted(runs, key=lambda run: run[0])
+        for signature in set(self._files) - live:
+            del self._files[signature]
+        return history
+
+
+class Snapshot:
+    """Vista inmutable de los datos servidos; se reemplaza entera al refrescar"""
+
+    def __init__(self, index, history):
+        # Copia congelada del índice: un refresco posterior no altera este snapshot
+        self.index = SearchIndex(index.directory, index.retailers)
+        self.index.segments = self.segments = dict(index.segments)
+        self.index.generation = index.generation
+        self.history = history
+        self.version = hashlib.md5(repr(sorted(
+            (retailer, segment.signature) for retailer, segment in self.segments.items()
+        )).encode()).hexdigest()[:12]
+        self.loaded_at = time.time()
+        self.categories = {
+            retailer: Counter(record['categoria'] for record in segment.records)
+            for retailer, segment in self.segments.items()
+        }
+
+    def _segments(self, retailers):
+        if not retailers:
+            return list(self.segments.values())
+        unknown = set(retailers) - set(self.segments)
+        if unknown:
+            raise BadRequest(f"Retailer desconocido: {', '.join(sorted(unknown))}")
+        return [self.segments[retailer] for retailer in retailers]
+
+    def retailers(self):
+        return [
+            {'retailer': retailer, 'productos': len(segment), 'archivo': os.path.basename(segment.signature[0]),
+             'actualizado': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(segment.signature[1] / 1e9))}
+            for retailer, segment in self.segments.items()
+        ]
+
+    def products(self, retailers=None, category=None):
+        for segment in self._segments(retailers):
+            for record in segment.records:
+                if category is None or record['categoria'] == category:
+                    yield record
+
+    def search(self, query, limit, **filters):
+        retailers = filters.pop('retailers', None)
+        self._segments(retailers)
+        return self.index.search(query, k=limit, retailers=retailers, **filters)
+
+    def category_counts(self, retailers=None):
+        counts = Counter()
+        for segment in self._segments(retailers):
+            counts.update(self.categories[segment.retailer])
+        return [{'categoria': name, 'productos': count} for name, count in counts.most_common()]
+
+    def price_history(self, name, retailers=None):
+        self._segments(retailers)
+        key = normalizar_texto(name)
+        series = []
+        for retailer in retailers or self.history:
+            points = [
+                {'fecha': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp)), 'archivo': filename,
+                 'precio': prices[key][1], 'precio_num': prices[key][0]}
+                for timestamp, filename, prices in self.history.get(retailer, ()) if key in prices
+            ]
+            if points:
+                series.append({'retailer': retailer, 'puntos': points})
+        return series
+
+
+class QueryService:
+    """Índice, historial y snapshot vigente; refresca cuando llega un inventario nuevo"""
+
+    def __init__(self, directory='.', retailers=inventories.RETAILERS):
+        self.directory = directory
+        self.retailers = retailers
+        self.index = SearchIndex(directory, retailers)
+        self.price_history = PriceHistory()
+        self.snapshot = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        with self._lock:
+            changed = self.index.refresh()
+            if not changed and not force:
+                return False
+            snapshot = Snapshot(self.index, self.price_history.build(self.directory, self.retailers))
+            self.snapshot = snapshot  # sustitución atómica: las peticiones en curso conservan el anterior
+        logger.info(f"🔄 Snapshot {snapshot.version}: {len(self.index)} productos "
+                    f"({', '.join(changed) or 'sin cambios'})")
+        return True
+
+    def watch(self, interval=DEFAULT_REFRESH_INTERVAL):
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"❌ Error refrescando inventarios: {e}")
+        thread = threading.Thread(target=loop, name='api-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def _page(items, params):
+    page = _int_param(params, 'page', 1, minimum=1)
+    per_page = min(_int_param(params, 'per_page', DEFAULT_PER_PAGE, minimum=1), MAX_PER_PAGE)
+    start = (page - 1) * per_page
+    items = list(items) if not isinstance(items, list) else items
+    return {
+        'items': [_public(item) if 'retailer' in item and 'nombre' in item else item
+                  for item in items[start:start + per_page]],
+        'page': page, 'per_page': per_page, 'total': len(items),
+        'next_page': page + 1 if start + per_page < len(items) else None,
+    }
+
+
+def _int_param(params, name, default, minimum=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise BadRequest(f"'{name}' debe ser un entero")
+    if minimum is not None and value < minimum:
+        raise BadRequest(f"'{name}' debe ser >= {minimum}")
+    return value
+
+
+def _float_param(params, name):
+    if name not in params:
+        return None
+    try:
+        return float(params[name])
+    except ValueError:
+        raise BadRequest(f"'{name}' debe ser un número")
+
+
+def _retailers_param(params):
+    value = params.get('retailer')
+    return [retailer.strip() for retailer in value.split(',') if retailer.strip()] if value else None
+
+
+def handle_query(snapshot, route, params):
+    """Cuerpo JSON de una consulta GET"""
+    retailers = _retailers_param(params)
+    if route == '/health':
+        return {'status': 'ok', 'version': snapshot.version, 'productos': len(snapshot.index)}
+    if route == '/retailers':
+        return {'items': snapshot.retailers(), 'version': snapshot.version}
+    if route == '/products':
+        return _page(snapshot.products(retailers, params.get('category')), params)
+    if route == '/categories':
+        return _page(snapshot.category_counts(retailers), params)
+    if route == '/search':
+        if 'q' not in params:
+            raise BadRequest("Falta el parámetro 'q'")
+        sort = params.get('sort', 'precio')
+        if sort not in SORT_KEYS:
+            raise BadRequest(f"'sort' debe ser uno de: {', '.join(SORT_KEYS)}")
+        page = _int_param(params, 'page', 1, minimum=1)
+        per_page = min(_int_param(params, 'per_page', DEFAULT_PER_PAGE, minimum=1), MAX_PER_PAGE)
+        # El top-k del índice alcanza hasta el final de la página pedida
+        results = snapshot.search(params['q'], page * per_page + 1, retailers=retailers, sort=sort,
+                                  min_price=_float_param(params, 'min_price'),
+                                  max_price=_float_param(params, 'max_price'))
+        body = _page(results, params)
+        body['total'] = None  # el índice no cuenta todas las coincidencias
+        return body
+    if route == '/history':
+        if 'q' not in params:
+            raise BadRequest("Falta el parámetro 'q' (nombre del producto)")
+        return {'items': snapshot.price_history(params['q'], retailers)}
+    return None
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service, host='127.0.0.1', port=DEFAULT_PORT, cache_size=CACHE_SIZE):
+        self.service = service
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_version = None
+        self._cache_lock = threading.Lock()
+        super().__init__((host, port), _QueryRequestHandler)
+
+    def cached_response(self, snapshot, key, build):
+        """``(etag, cuerpo)`` desde la caché LRU, válida para la versión del snapshot"""
+        with self._cache_lock:
+            if self._cache_version != snapshot.version:
+                self._cache.clear()
+                self._cache_version = snapshot.version
+            hit = self._cache.get(key)
+            if hit:
+                self._cache.move_to_end(key)
+                return hit
+        body = build()
+        if body is None:
+            return None
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        entry = (f'"{snapshot.version}-{hashlib.md5(data).hexdigest()[:12]}"', data)
+        with self._cache_lock:
+            if self._cache_version == snapshot.version:
+                self._cache[key] = entry
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entry
+
+
+class _QueryRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive: muchos clientes hacen varias consultas seguidas
+    disable_nagle_algorithm = True  # cabeceras y cuerpo van en escrituras separadas
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = url.path.rstrip('/') or '/'
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        snapshot = self.server.service.snapshot
+        key = (route, tuple(sorted(params.items())))
+        try:
+            entry = self.server.cached_response(snapshot, key, lambda: handle_query(snapshot, route, params))
+        except BadRequest as e:
+            self._reply(400, {'error': str(e)})
+            return
+        except Exception as e:
+            logger.error(f"❌ Error en {self.path}: {e}")
+            self._reply(500, {'error': str(e)})
+            return
+        if entry is None:
+            self._reply(404, {'error': f"Ruta desconocida: {route}"})
+            return
+        etag, data = entry
+        if etag in (self.headers.get('If-None-Match') or ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, data, etag)
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip('/') != '/refresh':
+            self._reply(404, {'error': f"Ruta desconocida: {self.path}"})
+            return
+        changed = self.server.service.refresh()
+        self._reply(200, {'refreshed': changed, 'version': self.server.service.snapshot.version})
+
+    def _reply(self, status, body):
+        self._send(status, json.dumps(body, ensure_ascii=False).encode('utf-8'))
+
+    def _send(self, status, data, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API local de consulta sobre los últimos inventarios")
+    parser.add_argument('--dir', default='.', help="Directorio con los CSV de los scrapers")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--refresh-interval', type=float, default=DEFAULT_REFRESH_INTERVAL,
+                        help="Segundos entre comprobaciones de inventarios nuevos")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    service = QueryService(args.dir)
+    service.watch(args.refresh_interval)
+    server = QueryServer(service, args.host, args.port)
+    logger.info(f"🚀 API de consulta en http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Backend de navegador: todo lo que depende de Selenium.
+
+Los scrapers importan este módulo con ``core.lazy_import``, así que Selenium
+solo se carga cuando de verdad se abre un navegador. ``create_chrome`` usa la
+comprobación previa cacheada (``mercadoscript.preflight``) para pasar la ruta
+de chromedriver y de Chrome directamente, sin que Selenium Manager vuelva a
+resolverlas en cada arranque.
+
+Con ``service_address`` no se lanza ningún Chrome: la sesión se conecta al
+navegador persistente de ``mercadoscript.browser_service`` y trabaja en una
+pestaña propia, que se cierra con ``quit()`` sin apagar el navegador.
+"""
+import logging
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from mercadoscript import browser_service, metrics, preflight
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'By', 'EC', 'NoSuchElementException', 'Options', 'TimeoutException', 'WebDriverException', 'WebDriverWait',
+    'attach_chrome', 'create_chrome',
+]
+
+
+class AttachedChrome(webdriver.Chrome):
+    """Sesión sobre el navegador persistente, aislada en su propia pestaña"""
+
+    _own_tab = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.switch_to.new_window('tab')
+        self._own_tab = self.current_window_handle
+
+    def quit(self):
+        try:
+            if self._own_tab and self._own_tab in self.window_handles:
+                self.switch_to.window(self._own_tab)
+                self.close()
+        except WebDriverException:
+            pass
+        super().quit()
+
+
+def attach_chrome(address):
+    """Conectarse al navegador persistente, reiniciándolo una vez si no responde"""
+    driver_path = preflight.preflight().get('driver_path')
+    for attempt in range(2):
+        browser_service.ensure_running(address, restart=attempt > 0)
+        options = Options()
+        options.debugger_address = address
+        try:
+            driver = AttachedChrome(service=Service(executable_path=driver_path), options=options)
+            metrics.increment('browser_service_attached')
+            return driver
+        except WebDriverException:
+            if attempt:
+                raise
+            logger.warning(f"⚠️ No se pudo conectar al navegador en {address}; reiniciándolo")
+
+
+def create_chrome(options, service_address=None):
+    """Crear un Chrome con las rutas de la comprobación previa cacheada"""
+    if service_address:
+        return attach_chrome(service_address)
+    info = preflight.preflight()
+    if info.get('chrome_path') and not options.binary_location:
+        options.binary_location = info['chrome_path']
+    service = Service(executable_path=info.get('driver_path'))
+    try:
+        return webdriver.Chrome(service=service, options=options)
+    except WebDriverException:
+        if not info.get('cached'):
+            raise
+        # La caché pudo quedar obsoleta (Chrome actualizado): detectar de nuevo y reintentar una vez
+        logger.warning("⚠️ Falló el arranque con el entorno cacheado; repitiendo la detección")
+        info = preflight.preflight(refresh=True)
+        options.binary_location = info.get('chrome_path') or ''
+        return webdriver.Chrome(service=Service(executable_path=info.get('driver_path')), options=options)
@@ -0,0 +1,228 @@
+"""Servicio de navegador persistente compartido entre ejecuciones.
+
+Mantiene un Chrome headless de larga duración con depuración remota
+(``--remote-debugging-port``), un perfil persistente en
+``.cache/chrome-profile`` y su caché HTTP en disco. Los scrapers se conectan
+a él (``--browser-service``) en lugar de lanzar un Chrome nuevo, así que se
+ahorran el arranque del navegador y reutilizan cookies, recursos estáticos y
+DNS ya resueltos de ejecuciones anteriores.
+
+El estado (pid, puerto, perfil) se guarda en ``.cache/browser_service.json``.
+La salud se comprueba con el endpoint ``/json/version`` de DevTools; si no
+responde, ``ensure_running`` vuelve a lanzar el navegador. ``run`` lo
+supervisa en primer plano y lo reinicia automáticamente si se cae.
+
+Uso::
+
+    python -m mercadoscript.browser_service start
+    python -m mercadoscript.browser_service status
+    python -m mercadoscript.browser_service run      # supervisado
+    python -m mercadoscript.browser_service stop
+    python Sirena.py --headless --browser-service
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from mercadoscript import core, metrics, preflight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9222
+DEFAULT_ADDRESS = f'{DEFAULT_HOST}:{DEFAULT_PORT}'
+PROFILE_DIR = os.path.join('.cache', 'chrome-profile')
+STATE_PATH = os.path.join('.cache', 'browser_service.json')
+ENV_VAR = 'MERCADOSCRIPT_BROWSER_SERVICE'
+
+STARTUP_TIMEOUT = 20
+HEALTH_INTERVAL = 10
+DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+CHROME_ARGUMENTS = (
+    '--headless=new',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-extensions',
+    '--window-size=1920,1080',
+)
+
+
+def add_browser_service_arguments(parser):
+    parser.add_argument('--browser-service', nargs='?', const=DEFAULT_ADDRESS, default=os.environ.get(ENV_VAR),
+                        metavar='HOST:PUERTO',
+                        help=f"Conectarse al navegador persistente en lugar de lanzar Chrome "
+                             f"(por defecto {DEFAULT_ADDRESS}; también {ENV_VAR})")
+
+
+def parse_address(address):
+    host, _, port = (address or DEFAULT_ADDRESS).rpartition(':')
+    return host or DEFAULT_HOST, int(port)
+
+
+def is_local(host):
+    return host in ('127.0.0.1', 'localhost', '::1')
+
+
+def health(address, timeout=2):
+    """Información de ``/json/version`` o None si el navegador no responde"""
+    host, port = parse_address(address)
+    try:
+        with urllib.request.urlopen(f'http://{host}:{port}/json/version', timeout=timeout) as response:
+            return json.load(response)
+    except (OSError, ValueError, urllib.error.URLError):
+        return None
+
+
+def load_state(state_path=STATE_PATH):
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, state_path=STATE_PATH):
+    directory = os.path.dirname(state_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def chrome_command(chrome_path, port, profile_dir=PROFILE_DIR):
+    profile_dir = os.path.abspath(profile_dir)
+    return [
+        chrome_path,
+        f'--remote-debugging-port={port}',
+        f'--user-data-dir={profile_dir}',
+        f'--disk-cache-dir={os.path.join(profile_dir, "http-cache")}',
+        f'--disk-cache-size={DISK_CACHE_BYTES}',
+        f'--user-agent={core.HEADERS["User-Agent"]}',
+        *CHROME_ARGUMENTS,
+        'about:blank',
+    ]
+
+
+def _detached_kwargs():
+    if os.name == 'nt':
+        flags = subprocess.CREATE_NEW_PROCESS_GROUP | getattr(subprocess, 'DETACHED_PROCESS', 0)
+        return {'creationflags': flags}
+    return {'start_new_session': True}
+
+
+def start(address=DEFAULT_ADDRESS, profile_dir=PROFILE_DIR, state_path=STATE_PATH, timeout=STARTUP_TIMEOUT):
+    """Lanzar Chrome con depuración remota y esperar a que responda"""
+    host, port = parse_address(address)
+    if not is_local(host):
+        raise RuntimeError(f"No se puede lanzar un navegador en un host remoto ({host})")
+    info = preflight.preflight()
+    if not info.get('chrome_path'):
+        raise RuntimeError("Chrome no encontrado; ejecuta check_webdriver.py")
+
+    os.makedirs(profile_dir, exist_ok=True)
+    log = open(os.path.join(profile_dir, 'service.log'), 'ab')
+    process = subprocess.Popen(chrome_command(info['chrome_path'], port, profile_dir), stdin=subprocess.DEVNULL,
+                               stdout=log, stderr=log, **_detached_kwargs())
+    log.close()
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        version = health(address)
+        if version:
+            save_state({'pid': process.pid, 'address': f'{host}:{port}', 'profile_dir': os.path.abspath(profile_dir),
+                        'browser': version.get('Browser'), 'started_at': time.time()}, state_path)
+            logger.info(f"🌐 Navegador persistente listo en {host}:{port} ({version.get('Browser')})")
+            return process.pid
+        if process.poll() is not None:
+            break
+        time.sleep(0.25)
+    process.kill()
+    raise RuntimeError(f"El navegador no respondió en {host}:{port}; revisa {profile_dir}/service.log")
+
+
+def stop(state_path=STATE_PATH):
+    """Detener el navegador lanzado por ``start``"""
+    state = load_state(state_path)
+    pid = state.get('pid')
+    if not pid:
+        return False
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        pass
+    try:
+        os.remove(state_path)
+    except OSError:
+        pass
+    return True
+
+
+def ensure_running(address=DEFAULT_ADDRESS, restart=False):
+    """Devolver la dirección de un navegador sano, lanzándolo o reiniciándolo si hace falta"""
+    host, _ = parse_address(address)
+    if not restart and health(address):
+        return address
+    if not is_local(host):
+        raise RuntimeError(f"El servicio de navegador en {address} no responde")
+    if load_state().get('address') == address:
+        logger.warning(f"⚠️ El navegador persistente en {address} no responde; reiniciándolo")
+        metrics.increment('browser_service_restarts')
+        stop()
+        time.sleep(1)
+    start(address)
+    return address
+
+
+def supervise(address=DEFAULT_ADDRESS, interval=HEALTH_INTERVAL):
+    """Mantener el navegador vivo, reiniciándolo cuando deja de responder"""
+    ensure_running(address)
+    try:
+        while True:
+            time.sleep(interval)
+            if not health(address):
+                ensure_running(address, restart=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Navegador persistente compartido por los scrapers")
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'run'])
+    parser.add_argument('--address', default=DEFAULT_ADDRESS, help="HOST:PUERTO de depuración remota")
+    parser.add_argument('--interval', type=float, default=HEALTH_INTERVAL,
+                        help="Segundos entre comprobaciones de salud (run)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'start':
+        ensure_running(args.address)
+    elif args.command == 'stop':
+        print("🛑 Navegador detenido" if stop() else "No hay navegador persistente en ejecución")
+    elif args.command == 'status':
+        version = health(args.address)
+        print(json.dumps({'address': args.address, 'healthy': bool(version),
+                          'browser': (version or {}).get('Browser'), **load_state()}, indent=2))
+        return 0 if version else 1
+    else:
+        logger.info(f"🚀 Supervisando el navegador persistente en {args.address}")
+        supervise(args.address, args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
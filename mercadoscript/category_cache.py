@@ -0,0 +1,194 @@
+"""Caché persistente del árbol de categorías por retailer.
+
+El árbol de categorías de un supermercado cambia como mucho una vez por
+semana, pero descubrirlo exige renderizar la página principal y recorrerla
+con heurísticas costosas. Este módulo guarda el resultado en
+``.cache/categorias/<retailer>.json`` con un TTL configurable.
+
+Mientras la caché está vigente, ``validate_in_background`` hace una
+comprobación barata en un hilo aparte: descarga el HTML crudo de la página
+principal (sin navegador), extrae las secciones de primer nivel de sus
+enlaces de categoría y las compara con las registradas por ``save`` al
+descubrir las categorías. Si aparece una sección nueva, la caché se marca
+como obsoleta y la siguiente ejecución vuelve a descubrir las categorías.
+
+Solo cuentan los enlaces del menú (``MENU_SELECTOR``) que acepta el filtro
+de categorías del perfil del sitio: en Magento (Jumbo, Nacional) los
+productos viven en ``/<slug>.html``, así que cada producto destacado o
+promoción nueva de la portada sería una "sección nueva".
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urljoin, urlparse
+
+from mercadoscript.core import lazy_import, parse_html
+from mercadoscript.profiles import PROFILES, profile
+
+requests = lazy_import('requests')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'categorias')
+DEFAULT_TTL_HOURS = 24 * 7
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+}
+
+# Enlaces de navegación de la portada; sin menú reconocible se usan todos
+MENU_SELECTOR = ('nav a[href], header a[href], [role="navigation"] a[href], [class*="menu"] a[href], '
+                 '[class*="nav"] a[href]')
+
+
+def top_level_sections(base_url, session=None, timeout=15, is_category=None):
+    """Primer segmento de ruta de los enlaces de categoría de la página principal"""
+    session = session or requests.Session()
+    response = session.get(base_url, headers=HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return sections_from_html(response.text, base_url, is_category)
+
+
+def sections_from_html(html, base_url, is_category=None):
+    """Primer segmento de ruta de los enlaces internos del menú de un HTML.
+
+    ``is_category(url, texto)`` (el filtro del perfil del sitio) descarta
+    además los enlaces del menú que no son categorías.
+    """
+    host = urlparse(base_url).netloc.lower().replace('www.', '')
+    soup = parse_html(html)
+    links = soup.select(MENU_SELECTOR) or soup.find_all('a', href=True)
+    sections = set()
+    for link in links:
+        href = link['href'].strip()
+        if not href or href.startswith('#'):
+            continue
+        url = urljoin(base_url, href)
+        parsed = urlparse(url)
+        if parsed.netloc.lower().replace('www.', '') != host:
+            continue
+        if is_category and not is_category(url, link.get_text(' ', strip=True)):
+            continue
+        segment = parsed.path.strip('/').split('/', 1)[0]
+        if segment:
+            sections.add(segment.lower())
+    return sections
+
+
+class CategoryCache:
+    def __init__(self, retailer, ttl_hours=DEFAULT_TTL_HOURS, cache_dir=DEFAULT_CACHE_DIR, is_category=None):
+        self.retailer = retailer
+        # Filtro de categorías de las secciones de referencia: el del perfil del sitio si lo tiene
+        if is_category is None and retailer in PROFILES:
+            is_category = profile(retailer).is_category
+        self.is_category = is_category
+        self.ttl_seconds = ttl_hours * 3600
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, f"{retailer}.json")
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, data):
+        # Escritura atómica: un worker leyendo nunca ve un JSON a medias
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def load(self, force_refresh=False):
+        """Datos cacheados, o None si no existen, caducaron, están obsoletos o se fuerza refresco"""
+        if force_refresh or self.ttl_seconds <= 0:
+            return None
+        data = self._read()
+        if not data:
+            return None
+        age = time.time() - data.get('saved_at', 0)
+        if age > self.ttl_seconds:
+            logger.info(f"🗂️  Caché de categorías de {self.retailer} caducada ({age / 3600:.1f} h)")
+            return None
+        if data.get('stale'):
+            logger.info(f"🗂️  Caché de categorías de {self.retailer} obsoleta: {data['stale']}")
+            return None
+        logger.info(f"🗂️  Usando caché de categorías de {self.retailer} ({age / 3600:.1f} h de antigüedad)")
+        return data
+
+    def save(self, categories, base_url=None, home_html=None, **extra):
+        """Guardar un árbol recién descubierto.
+
+        Con ``base_url`` se registran además las secciones de primer nivel de
+        la página principal en el momento del descubrimiento, la referencia de
+        ``validate``. Por defecto se descarga en crudo, igual que al validar;
+        ``home_html`` permite pasar una página principal ya descargada.
+        """
+        if base_url:
+            try:
+                sections = (sections_from_html(home_html, base_url, self.is_category) if home_html is not None
+                            else top_level_sections(base_url, is_category=self.is_category))
+                extra['top_level_sections'] = sorted(sections)
+            except requests.RequestException as e:
+                logger.debug(f"Secciones de referencia no registradas: {e}")
+        data = {'retailer': self.retailer, 'saved_at': time.time(), 'categories': categories, **extra}
+        with self._lock:
+            self._write(data)
+        logger.info(f"🗂️  Caché de categorías guardada en {self.path}")
+        return data
+
+    def update(self, **fields):
+        """Añadir campos (p. ej. subcategorías) sin renovar el TTL"""
+        with self._lock:
+            data = self._read()
+            if not data:
+                return
+            data.update(fields)
+            self._write(data)
+
+    def mark_stale(self, reason):
+        self.update(stale=reason)
+        logger.info(f"🗂️  Caché de {self.retailer} marcada como obsoleta: {reason}")
+
+    def validate(self, base_url):
+        """Comprobar solo si aparecieron secciones de primer nivel nuevas"""
+        try:
+            sections = top_level_sections(base_url, is_category=self.is_category)
+        except requests.RequestException as e:
+            logger.debug(f"Validación de caché omitida: {e}")
+            return None
+
+        data = self._read() or {}
+        baseline = set(data.get('top_level_sections') or [])
+        if not baseline:
+            # Sin referencia del descubrimiento no se puede comparar: tomar la de
+            # ahora ocultaría las secciones aparecidas desde entonces
+            self.mark_stale("sin secciones de referencia")
+            return None
+
+        new_sections = sections - baseline
+        if new_sections:
+            self.mark_stale(f"secciones nuevas: {', '.join(sorted(new_sections)[:10])}")
+        return new_sections
+
+    def validate_in_background(self, base_url):
+        """Lanzar ``validate`` en un hilo de fondo; no bloquea el scraping"""
+        thread = threading.Thread(target=self.validate, args=(base_url,), name=f"validar-{self.retailer}",
+                                  daemon=True)
+        thread.start()
+        return thread
+
+
+def add_cache_arguments(parser):
+    """Opciones de línea de comandos comunes a los scrapers con caché de categorías"""
+    parser.add_argument('--category-ttl', type=float, default=DEFAULT_TTL_HOURS,
+                        help="Horas de validez de la caché de categorías (0 la desactiva)")
+    parser.add_argument('--refresh-categories', action='store_true',
+                        help="Ignorar la caché y volver a descubrir las categorías")
@@ -0,0 +1,175 @@
+"""Cortocircuito por host para no perder tiempo con un sitio caído.
+
+Cuando un supermercado está caído o nos bloquea, cada categoría seguía
+pasando por la escalera completa de reintentos (3 intentos × (5 s +
+timeout) en ``get_page_with_retry`` y ``obtener_pagina``): un sitio muerto
+podía consumir una hora.
+
+``CircuitBreaker`` lleva, por host, el resultado de las últimas descargas:
+
+* ``closed`` (normal): se descarga; si en la ventana de las últimas
+  ``--circuit-window`` descargas la tasa de errores llega a
+  ``--circuit-failure-rate`` (con al menos ``--circuit-min-requests``), se
+  abre;
+* ``open``: las descargas fallan al instante, sin red ni esperas, durante
+  ``--circuit-cooldown`` segundos;
+* ``half_open``: pasado ese tiempo se deja pasar una sola descarga de
+  prueba; si funciona el circuito se cierra y, si no, se vuelve a abrir con
+  el doble de espera (hasta ``MAX_COOLDOWN``).
+
+Cuentan como error los fallos de conexión, los timeouts, las respuestas 5xx,
+403 y 429 y las páginas vacías; un 404 demuestra que el host responde. Cada
+cambio de estado se registra en ``mercadoscript.metrics``
+(``circuit_transitions``) y aparece en el resumen de la ejecución, junto con
+las descargas rechazadas (``circuit_rejected``).
+
+Uso::
+
+    breaker = circuit.breakers.for_url(url)
+    if not breaker.allow():
+        return None
+    ...
+    breaker.record(ok)
+"""
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from mercadoscript import metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_MIN_REQUESTS = 5
+DEFAULT_WINDOW = 20
+DEFAULT_COOLDOWN = 60.0
+MAX_COOLDOWN = 900.0
+
+# Respuestas que indican que el host no está sirviendo (o nos bloquea)
+HOST_FAILURE_STATUS = (403, 429)
+
+
+def add_circuit_arguments(parser):
+    """Opciones de línea de comandos comunes a todos los scrapers"""
+    parser.add_argument('--circuit-failure-rate', type=float, default=DEFAULT_FAILURE_RATE, metavar='TASA',
+                        help="Tasa de errores (0-1) que abre el circuito de un host")
+    parser.add_argument('--circuit-min-requests', type=int, default=DEFAULT_MIN_REQUESTS, metavar='N',
+                        help="Descargas mínimas en la ventana antes de poder abrir el circuito")
+    parser.add_argument('--circuit-window', type=int, default=DEFAULT_WINDOW, metavar='N',
+                        help="Últimas descargas que cuentan para la tasa de errores")
+    parser.add_argument('--circuit-cooldown', type=float, default=DEFAULT_COOLDOWN, metavar='SEGUNDOS',
+                        help="Segundos con el circuito abierto antes de probar de nuevo (0 lo desactiva)")
+
+
+def configure(args):
+    """Aplicar las opciones de línea de comandos al registro global"""
+    breakers.configure(
+        failure_rate=args.circuit_failure_rate,
+        min_requests=args.circuit_min_requests,
+        window=args.circuit_window,
+        cooldown=args.circuit_cooldown,
+    )
+
+
+def is_host_failure(status_code):
+    return status_code >= 500 or status_code in HOST_FAILURE_STATUS
+
+
+class CircuitBreaker:
+    def __init__(self, host, failure_rate=DEFAULT_FAILURE_RATE, min_requests=DEFAULT_MIN_REQUESTS,
+                 window=DEFAULT_WINDOW, cooldown=DEFAULT_COOLDOWN):
+        self.host = host
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=max(1, window))
+        self.opened_at = 0.0
+        self.current_cooldown = cooldown
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.cooldown > 0
+
+    def _transition(self, state, reason):
+        previous, self.state = self.state, state
+        metrics.increment('circuit_transitions', host=self.host, state=state)
+        icon = {OPEN: '🔴', HALF_OPEN: '🟡', CLOSED: '🟢'}[state]
+        logger.warning(f"{icon} Circuito de {self.host}: {previous} -> {state} ({reason})")
+
+    def allow(self):
+        """¿Se puede descargar de este host ahora? Si no, se cuenta como rechazo"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.current_cooldown:
+                self._transition(HALF_OPEN, f"{self.current_cooldown:g} s sin descargar")
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True  # Solo una descarga de prueba a la vez
+                return True
+        metrics.increment('circuit_rejected', host=self.host)
+        return False
+
+    def record(self, ok):
+        """Registrar el resultado de una descarga permitida por ``allow``"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probing = False
+                if ok:
+                    self.outcomes.clear()
+                    self.current_cooldown = self.cooldown
+                    self._transition(CLOSED, "descarga de prueba correcta")
+                else:
+                    self.current_cooldown = min(self.current_cooldown * 2, MAX_COOLDOWN)
+                    self._open("descarga de prueba fallida")
+                return
+            if self.state == OPEN:
+                return  # Descarga que empezó antes de abrirse
+            self.outcomes.append(ok)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) >= self.min_requests and failures / len(self.outcomes) >= self.failure_rate:
+                self._open(f"{failures} errores en las últimas {len(self.outcomes)} descargas")
+
+    def _open(self, reason):
+        self.opened_at = time.monotonic()
+        self._transition(OPEN, f"{reason}; {self.current_cooldown:g} s de espera")
+
+    def is_open(self):
+        return self.state == OPEN
+
+
+class CircuitBreakers:
+    """Un ``CircuitBreaker`` por host, creado al primer uso"""
+
+    def __init__(self):
+        self.options = {}
+        self.by_host = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **options):
+        with self._lock:
+            self.options = options
+            self.by_host.clear()
+
+    def for_url(self, url):
+        host = (urlsplit(url).hostname or '').lower()
+        host = host[4:] if host.startswith('www.') else host
+        breaker = self.by_host.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self.by_host.setdefault(host, CircuitBreaker(host, **self.options))
+        return breaker
+
+
+# Registro global del proceso
+breakers = CircuitBreakers()
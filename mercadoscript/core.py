@@ -0,0 +1,132 @@
+"""Núcleo ligero compartido por los scrapers.
+
+Reúne las utilidades que cada script repetía (descarga con reintentos,
+normalización de texto y precios, hash de producto) y las importaciones
+diferidas: importar este módulo no carga ``requests``, ``bs4`` ni Selenium.
+Cada dependencia pesada se importa la primera vez que de verdad se usa, así
+que ``--help``, el modo worker o un scraper HTTP arrancan sin pagar el coste
+del navegador.
+"""
+import hashlib
+import importlib
+import re
+import threading
+import time
+
+from mercadoscript import circuit, metrics
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive'
+}
+
+DEFAULT_PARSER = 'html.parser'
+
+
+class LazyModule:
+    """Módulo que se importa de verdad en el primer acceso a un atributo"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'cargado' if self._module is not None else 'diferido'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name):
+    """Importación diferida de ``name``"""
+    return LazyModule(name)
+
+
+requests = lazy_import('requests')
+_bs4 = lazy_import('bs4')
+
+
+def parse_html(html, parser=DEFAULT_PARSER):
+    """Parsear HTML con BeautifulSoup; el backend se carga al primer uso"""
+    return _bs4.BeautifulSoup(html, parser)
+
+
+def obtener_pagina(url, timeout=30, reintentos=3, verify=True, headers=None):
+    """Obtener contenido de una página web"""
+    if not verify:
+        # Deshabilitar warnings de SSL solo si de verdad se desactiva la verificación
+        urllib3 = importlib.import_module('urllib3')
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    breaker = circuit.breakers.for_url(url)
+    for intento in range(reintentos):
+        if not breaker.allow():
+            print(f"⛔ Circuito abierto para {breaker.host}: se omite {url[:80]}")
+            return None
+        try:
+            print(f"Obteniendo: {url[:80]}...")
+            metrics.increment('requests')
+            with metrics.span('fetch'):
+                response = requests.get(url, headers=headers or HEADERS, timeout=timeout, verify=verify)
+                response.raise_for_status()
+            breaker.record(True)
+            print(f"✓ Página obtenida ({response.status_code}) - {len(response.text)} caracteres")
+            metrics.increment('pages_loaded')
+            return response.text
+        except Exception as e:
+            # Un 404 demuestra que el host responde; conexión, timeout, 5xx, 403 y 429 no
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            breaker.record(status is not None and not circuit.is_host_failure(status))
+            metrics.increment('page_errors')
+            print(f"Error intento {intento + 1}: {e}")
+            if intento < reintentos - 1 and not breaker.is_open():
+                time.sleep(5)
+
+    print(f"❌ Error después de {reintentos} intentos")
+    return None
+
+
+_ACENTOS = str.maketrans({'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u', 'ñ': 'n', 'ü': 'u'})
+
+
+def normalizar_texto(texto):
+    """Normalizar texto para comparación (quitar espacios, acentos, mayúsculas)"""
+    if not texto:
+        return ""
+    return re.sub(r'\s+', ' ', texto.lower().strip()).translate(_ACENTOS)
+
+
+_ESPACIOS_EN_LINEA = re.compile(r'[^\S\n]+')
+
+
+def normalizar_textos(textos):
+    """``normalizar_texto`` para una lista entera en una sola pasada"""
+    textos = [(texto or '').replace('\n', ' ') for texto in textos]
+    unidos = _ESPACIOS_EN_LINEA.sub(' ', '\n'.join(textos).lower()).translate(_ACENTOS)
+    return [texto.strip() for texto in unidos.split('\n')] if textos else []
+
+
+def normalizar_precio(precio):
+    """Normalizar precio para comparación"""
+    if not precio or precio == "Sin precio":
+        return ""
+
+    # Extraer solo números y puntos/comas y normalizar separadores decimales
+    return re.sub(r'[^\d.,]', '', precio).replace(',', '.')
+
+
+def generar_hash_producto(nombre, precio):
+    """Generar hash único basado en nombre y precio normalizados"""
+    texto_unico = f"{normalizar_texto(nombre)}|{normalizar_precio(precio)}"
+    return hashlib.md5(texto_unico.encode('utf-8')).hexdigest()
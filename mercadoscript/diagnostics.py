@@ -0,0 +1,191 @@
+"""Diagnóstico barato de la estructura HTML de una página de listado.
+
+Sustituye los recorridos completos del DOM (uno por ``find_all``) por una
+sola pasada sobre los nodos que acumula todo a la vez: elementos con
+``product`` en la clase o el id, contenedores con muchos hijos directos
+(posibles grids) y elementos con precios. Las comprobaciones caras, que
+necesitan el texto del nodo, solo se hacen sobre una muestra, y la pasada se
+corta al agotar el presupuesto de tiempo por página.
+
+Los informes se guardan por patrón de URL: las páginas de categoría de un
+mismo sitio comparten plantilla, así que basta con analizar la primera.
+
+El motor (``mercadoscript.engine``) lo ejecuta sobre cada página de listado
+con ``--diagnostics sample|full``; ``analyzer_for`` mantiene un analizador
+por proceso, también en los procesos del pool de parseo.
+
+Uso::
+
+    python Bravo.py --diagnostics full
+    python -m mercadoscript.engine nacional --diagnostics sample --diagnostics-budget 20
+"""
+import re
+import time
+from urllib.parse import urlparse
+
+PRICE_PATTERN = re.compile(r'(RD\$|\$)\s*\d+')
+PRODUCT_PATTERN = re.compile(r'product', re.I)
+PRICE_TAGS = ('span', 'div', 'p')
+DIAGNOSTICS_MODES = ('off', 'sample', 'full')
+
+# Analizador de cada proceso por (modo, presupuesto): la caché por plantilla dura toda la ejecución
+_analyzers = {}
+
+
+def add_diagnostics_arguments(parser, default='off'):
+    """Opciones de línea de comandos del diagnóstico de estructura"""
+    parser.add_argument('--diagnostics', choices=DIAGNOSTICS_MODES, default=default,
+                        help="Diagnóstico de estructura: muestreado y cacheado por plantilla, completo o desactivado")
+    parser.add_argument('--diagnostics-budget', type=float, default=50,
+                        help="Presupuesto de tiempo del diagnóstico por página, en milisegundos")
+
+
+def analyzer_for(mode, budget_ms=50):
+    """``StructureAnalyzer`` del proceso para el modo dado; None con ``off``"""
+    if mode == 'off':
+        return None
+    analyzer = _analyzers.get((mode, budget_ms))
+    if analyzer is None:
+        if mode == 'full':
+            analyzer = StructureAnalyzer(sample_every=1, time_budget=None, cache=False)
+        else:
+            analyzer = StructureAnalyzer(time_budget=budget_ms / 1000)
+        _analyzers[(mode, budget_ms)] = analyzer
+    return analyzer
+
+
+def url_pattern(url):
+    """Patrón de plantilla: host, primer segmento de la ruta, profundidad y claves de la query"""
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split('/') if s]
+    shape = [re.sub(r'\d+', '{n}', segments[0])] if segments else []
+    shape += ['*'] * (len(segments) - 1)
+    keys = sorted({part.split('=', 1)[0] for part in parsed.query.split('&') if part})
+    return f"{parsed.netloc.lower()}/{'/'.join(shape)}" + (f"?{'&'.join(keys)}" if keys else '')
+
+
+class StructureAnalyzer:
+    """Analizador de una pasada con muestreo, presupuesto de tiempo y caché por plantilla.
+
+    ``sample_every`` fija cada cuántos candidatos se mira el texto y
+    ``max_samples`` cuántos ejemplos de cada tipo se guardan. Con
+    ``time_budget`` en segundos la pasada se corta al superarlo (``None``
+    para analizar la página entera).
+    """
+
+    def __init__(self, sample_every=4, max_samples=5, time_budget=0.05, cache=True):
+        self.sample_every = max(1, sample_every)
+        self.max_samples = max_samples
+        self.time_budget = time_budget
+        self.cache = {} if cache else None
+
+    def analyze(self, soup, url):
+        """Informe de estructura de la página; None si su plantilla ya se analizó"""
+        pattern = url_pattern(url)
+        if self.cache is not None and pattern in self.cache:
+            return None
+
+        report = self._single_pass(soup)
+        report['url'] = url
+        report['pattern'] = pattern
+        if self.cache is not None:
+            self.cache[pattern] = report
+        return report
+
+    def _single_pass(self, soup):
+        from bs4 import Tag
+
+        started = time.perf_counter()
+        deadline = started + self.time_budget if self.time_budget else None
+        product_class, product_ids, price_links, price_elements = [], [], [], []
+        counts = {'product_class': 0, 'product_id': 0, 'price_candidates': 0}
+        children = {}
+        visited = 0
+        truncated = False
+
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            visited += 1
+            if deadline and visited % 256 == 0 and time.perf_counter() > deadline:
+                truncated = True
+                break
+
+            parent = tag.parent
+            if parent is not None and parent.name == 'div':
+                entry = children.get(id(parent))
+                children[id(parent)] = (parent, entry[1] + 1 if entry else 1)
+
+            classes = tag.get('class') or []
+            if any(PRODUCT_PATTERN.search(c) for c in classes):
+                counts['product_class'] += 1
+                if len(product_class) < self.max_samples:
+                    text = tag.get_text(' ', strip=True)[:50]
+                    product_class.append((tag.name, classes, len(text), text))
+
+            if PRODUCT_PATTERN.search(tag.get('id') or ''):
+                counts['product_id'] += 1
+                if len(product_ids) < self.max_samples:
+                    product_ids.append((tag.name, tag.get('id')))
+
+            if tag.name == 'a' or tag.name in PRICE_TAGS:
+                counts['price_candidates'] += 1
+                if counts['price_candidates'] % self.sample_every:
+                    continue
+                # Texto directo del nodo: evita recorrer subárboles completos
+                text = tag.string.strip() if tag.string else ''
+                if not text or not PRICE_PATTERN.search(text):
+                    continue
+                if tag.name == 'a' and len(price_links) < self.max_samples:
+                    price_links.append((text[:40], (tag.get('href') or '')[:40]))
+                elif tag.name != 'a' and len(text) < 50 and len(price_elements) < self.max_samples:
+                    price_elements.append((tag.name, classes, text))
+
+        grids = sorted(
+            ((div.get('class') or [], n) for div, n in children.values() if n > 5),
+            key=lambda item: item[1], reverse=True
+        )[:3]
+        return {
+            'nodes': visited,
+            'truncated': truncated,
+            'seconds': time.perf_counter() - started,
+            'counts': counts,
+            'product_class': product_class,
+            'product_ids': product_ids,
+            'grids': grids,
+            'price_links': price_links,
+            'price_elements': price_elements,
+        }
+
+
+def print_report(report):
+    """Mostrar el informe con el mismo formato que el diagnóstico original"""
+    counts = report['counts']
+    estado = ' (parcial: presupuesto agotado)' if report['truncated'] else ''
+    print(f"\n🔍 ESTRUCTURA DE {report['pattern']}: {report['nodes']} nodos en "
+          f"{report['seconds'] * 1000:.1f} ms{estado}")
+
+    if report['product_class']:
+        print(f"📦 Elementos con 'product' en clase ({counts['product_class']}):")
+        for tag, clase, longitud, texto in report['product_class']:
+            print(f"  {tag}.{' '.join(clase)}: {longitud} chars - '{texto}'")
+
+    if report['product_ids']:
+        print(f"🆔 Elementos con 'product' en ID ({counts['product_id']}):")
+        for tag, element_id in report['product_ids'][:3]:
+            print(f"  {tag}#{element_id}")
+
+    if report['grids']:
+        print("📋 Divs con muchos hijos (posibles grids):")
+        for clase, num_hijos in report['grids']:
+            print(f"  div.{' '.join(clase) if clase else 'sin-clase'}: {num_hijos} hijos")
+
+    if report['price_links']:
+        print("💰 Enlaces con precios (muestra):")
+        for texto, href in report['price_links'][:3]:
+            print(f"  '{texto}' -> {href}")
+
+    if report['price_elements']:
+        print("💲 Elementos con precios (muestra):")
+        for tag, clase, texto in report['price_elements']:
+            print(f"  {tag}.{' '.join(clase)}: '{texto}'")
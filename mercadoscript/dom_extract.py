@@ -0,0 +1,184 @@
+"""Extracción de productos dentro del navegador con un solo script.
+
+Tras renderizar, Sirena y Jumbo serializaban el DOM entero con
+``driver.page_source`` y lo reconstruían en BeautifulSoup solo para sacar
+las tarjetas de producto. Con ``--extraction browser`` se inyecta
+``EXTRACT_SCRIPT`` con ``execute_script``: recorre las tarjetas en la propia
+página y devuelve registros JSON compactos (nombre, texto de precio, URL e
+imagen), los enlaces de paginación y el texto del total de resultados. El
+coste por página pasa a ser proporcional a los productos, no a la página.
+
+El script es genérico; lo específico de cada sitio (selectores de tarjeta,
+nombre, precio y paginación) son las reglas de su perfil, las mismas que
+usan las heurísticas de Python (``SiteProfile.dom_rules``). La validación y
+normalización final (nombre válido, formato del precio) sigue en Python
+(``SiteProfile.products_from_records``). Si el script falla o no encuentra
+productos, el motor vuelve a ``page_source`` y a las heurísticas de siempre.
+
+Uso::
+
+    python Sirena.py --extraction browser
+    python Jumbo.py --extraction browser --parse-workers -1
+"""
+import logging
+
+from mercadoscript import metrics
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_MODES = ('html', 'browser')
+
+# arguments[0]: reglas del sitio. Devuelve {products: [[nombre, precio, url, imagen]],
+# links: [[href, texto, de_selector]], total: texto del total de resultados}. Con
+# rules.total el total sale solo de ese elemento (null si la página no lo tiene)
+EXTRACT_SCRIPT = r"""
+const rules = arguments[0];
+const text = el => (el.innerText || el.textContent || '').trim();
+const letter = /[a-zA-ZáéíóúÁÉÍÓÚñÑ]/;
+const ignored = /^(javascript:|mailto:|tel:|#)/i;
+
+const seen = new Set();
+const cards = [];
+for (const selector of rules.cards) {
+  let found;
+  try { found = document.querySelectorAll(selector); } catch (e) { continue; }
+  for (const el of found) {
+    if (!seen.has(el)) { seen.add(el); cards.push(el); }
+  }
+  if (rules.first_match && cards.length) break;
+}
+
+function nameOf(card) {
+  for (const spec of rules.name) {
+    const [selector, attr] = spec.split('@');
+    let el;
+    try { el = card.querySelector(selector); } catch (e) { continue; }
+    if (!el) continue;
+    const value = (attr ? el.getAttribute(attr) || '' : text(el)).trim();
+    if (value.length >= rules.min_name && value.length <= rules.max_name && letter.test(value)) return value;
+  }
+  return '';
+}
+
+function priceOf(card) {
+  for (const selector of rules.price) {
+    let found;
+    try { found = card.querySelectorAll(selector); } catch (e) { continue; }
+    for (const el of found) {
+      const value = text(el);
+      if (/\d/.test(value)) return value.slice(0, 80);
+    }
+  }
+  return text(card).slice(0, rules.price_context);
+}
+
+function linkOf(card) {
+  const links = card.matches('a[href]') ? [card] : card.querySelectorAll('a[href]');
+  for (const a of links) {
+    const href = a.getAttribute('href').trim();
+    if (href && !ignored.test(href) && /^https?:/.test(a.href)) return a.href.split('#')[0];
+  }
+  return '';
+}
+
+function imageOf(card) {
+  const img = card.querySelector('img');
+  return img ? (img.currentSrc || img.getAttribute('src') || img.getAttribute('data-src') || '') : '';
+}
+
+// Las tarjetas se solapan (envoltorios que contienen otras tarjetas): se recorren de la
+// más interna a la más externa y un envoltorio se descarta si ya dio un producto dentro
+const covered = new Set();
+const products = [];
+for (let i = cards.length - 1; i >= 0; i--) {
+  const card = cards[i];
+  if (covered.has(card)) continue;
+  const name = nameOf(card);
+  if (!name) continue;
+  products.push([name, priceOf(card), linkOf(card), imageOf(card)]);
+  for (let parent = card.parentElement; parent; parent = parent.parentElement) covered.add(parent);
+}
+products.reverse();
+
+const links = [];
+const pagination = new Set();
+for (const selector of rules.pagination) {
+  try { document.querySelectorAll(selector).forEach(a => pagination.add(a)); } catch (e) {}
+}
+for (const a of document.querySelectorAll('a[href]')) {
+  const label = text(a);
+  const fromSelector = pagination.has(a);
+  if (fromSelector || /^\d{1,2}$/.test(label)) links.push([a.href, label, fromSelector]);
+}
+
+let total = null;
+if (rules.total.length) {
+  let el = null;
+  try { el = document.querySelector(rules.total.join(', ')); } catch (e) {}
+  total = el ? text(el) : null;
+} else {
+  const body = document.body ? document.body.innerText : '';
+  const match = body.match(/(\d[\d.,]*)\s*[-–a]\s*(\d[\d.,]*)\s+(?:de|of)\s+(\d[\d.,]*)/i)
+    || body.match(/(\d[\d.,]*)\s+(?:productos?|resultados?|art[íi]culos?|items?|results?)\b/i);
+  total = match ? match[0] : '';
+}
+
+return {products: products.slice(0, rules.max_products), links: links, total: total};
+"""
+
+DEFAULT_RULES = {
+    'first_match': False,
+    'min_name': 4,
+    'max_name': 200,
+    'price_context': 300,
+    'max_products': 500,
+    'pagination': [],
+    'total': [],
+}
+
+
+def add_extraction_arguments(parser):
+    """Opciones de línea de comandos de los scrapers con navegador (Sirena y Jumbo)"""
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default='html',
+                        help="browser: extraer los productos en la página con un script y devolver solo JSON; "
+                             "html: page_source y heurísticas de BeautifulSoup")
+
+
+class DomPage:
+    """Productos y paginación extraídos en el navegador; se envía al pool en lugar del HTML"""
+    __slots__ = ('records', 'links', 'total_text')
+
+    def __init__(self, records, links, total_text):
+        self.records = records
+        self.links = links
+        self.total_text = total_text
+
+    def __getstate__(self):
+        return (self.records, self.links, self.total_text)
+
+    def __setstate__(self, state):
+        self.records, self.links, self.total_text = state
+
+    def __len__(self):
+        return len(self.records)
+
+
+def extract_in_browser(driver, rules):
+    """Ejecutar el script de extracción en la página cargada; None si falla o no hay productos"""
+    try:
+        result = driver.execute_script(EXTRACT_SCRIPT, {**DEFAULT_RULES, **rules})
+    except Exception as e:
+        logger.warning(f"⚠️ Extracción en el navegador fallida, se usa page_source: {e}")
+        metrics.increment('dom_extraction_fallbacks')
+        return None
+    products = (result or {}).get('products') or []
+    if not products:
+        metrics.increment('dom_extraction_fallbacks')
+        return None
+    records = [
+        {'nombre': name, 'precio_texto': price, 'url': url or None, 'imagen': image or None}
+        for name, price, url, image in products
+    ]
+    metrics.increment('dom_extraction_pages')
+    metrics.increment('dom_extraction_products', len(records))
+    return DomPage(records, [tuple(link) for link in result.get('links') or ()], result.get('total'))
@@ -0,0 +1,800 @@
+"""Motor de scraping único, guiado por el perfil declarativo de cada sitio.
+
+Recorre cualquier supermercado de ``mercadoscript.profiles`` con el mismo
+pipeline y la infraestructura compartida, así que cada optimización y cada
+corrección del motor se aplica a los cuatro sitios a la vez:
+
+* descubrimiento: caché de categorías, sitemap (hojas o raíces, según el
+  perfil) y, si no hay, los enlaces de la portada en el orden de fuentes del
+  perfil, en forma canónica (``mercadoscript.urls``); las subcategorías salen
+  del árbol del sitemap, de la caché o de la primera página de la categoría;
+* descarga: ``http`` con ``core.obtener_pagina`` o ``browser`` con un Chrome
+  por hilo, las condiciones de página lista y el scroll del perfil; ambas
+  pasan por el cortocircuito por host;
+* paginación: tamaño de página máximo si el sitio lo permite y URLs de todas
+  las páginas predichas desde la primera, descargadas por adelantado
+  (``--prefetch``) hasta la primera página vacía o repetida;
+* extracción: ``parse_listing_page`` con las reglas del perfil, en el pool de
+  procesos (``--parse-workers``), o en el navegador (``--extraction browser``);
+* deduplicación (por nombre en la categoría y, si el perfil lo pide, fusión
+  de similares entre categorías) y CSV con las columnas del perfil.
+
+Los puntos de extensión se conectan al construir ``ScrapingEngine``:
+frontera distribuida (``frontier``), planificador por rendimiento
+(``scheduler``), enriquecimiento con la página de detalle (``enricher``),
+diagnóstico de estructura (``diagnostics``) y extracción en el navegador
+(la del ``fetcher``). ``add_engine_arguments`` y ``engine_from_args`` los
+exponen en la línea de comandos; Sirena.py, Jumbo.py, Nacional.py y
+Bravo.py son envoltorios finos con sus mensajes e informes.
+
+Uso::
+
+    python -m mercadoscript.engine nacional --max-pages 20
+    python -m mercadoscript.engine sirena --max-categories 5 --prefetch 2 --parse-workers -1
+    python -m mercadoscript.engine jumbo --frontier frontera.db --extraction browser
+"""
+import argparse
+import csv
+import logging
+import math
+import time
+from contextlib import closing, contextmanager
+
+from mercadoscript import circuit, diagnostics, dom_extract, memory, metrics, pagination, profiling, sitemap
+from mercadoscript.browser_service import add_browser_service_arguments
+from mercadoscript.category_cache import CategoryCache, add_cache_arguments
+from mercadoscript.core import (HEADERS, generar_hash_producto, lazy_import, normalizar_precio, normalizar_texto,
+                                obtener_pagina, parse_html)
+from mercadoscript.dom_extract import DomPage, add_extraction_arguments
+from mercadoscript.enrichment import add_enrichment_arguments, enricher_from_args
+from mercadoscript.frontier import open_frontier, run_worker
+from mercadoscript.parse_pool import ParsePool, add_parse_pool_arguments, pool_from_args
+from mercadoscript.prefetch import DriverPool, PagePrefetcher, add_prefetch_arguments
+from mercadoscript.profiles import PROFILES, profile
+from mercadoscript.readiness import BROKEN, EMPTY, READY
+from mercadoscript.scheduler import YieldScheduler, scheduler_from_args
+from mercadoscript.urls import SeenURLs, canonical_url
+
+browser = lazy_import('mercadoscript.browser')
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/120.0.0.0 Safari/537.36")
+CHROME_ARGS = ("--no-sandbox", "--disable-dev-shm-usage", "--disable-blink-features=AutomationControlled",
+               "--window-size=1920,1080", "--disable-extensions", "--disable-gpu", f"--user-agent={USER_AGENT}")
+
+
+class HttpFetcher:
+    """Descarga con requests (reintentos, cortocircuito y métricas de ``obtener_pagina``)"""
+
+    def __init__(self, site_profile):
+        fetch = site_profile.fetch
+        self.options = {}
+        if 'verify' in fetch:
+            self.options['verify'] = fetch['verify']
+        if fetch.get('headers'):
+            self.options['headers'] = {**HEADERS, **fetch['headers']}
+
+    def open(self):
+        pass
+
+    def fetch(self, url, page_type='category', extract=True):
+        return obtener_pagina(url, **self.options)
+
+    def close(self):
+        pass
+
+
+class BrowserFetcher:
+    """Descarga con un Chrome por hilo; vuelve en cuanto se cumple la condición de página lista.
+
+    Reintentos, esperas, pausas, scroll y texto mínimo salen del ``fetch`` del
+    perfil. Con ``extraction='browser'`` las páginas de categoría vuelven como
+    ``DomPage`` con los productos ya extraídos en el navegador.
+    """
+
+    def __init__(self, site_profile, headless=True, service_address=None, extraction='html'):
+        self.profile = site_profile
+        self.options = site_profile.fetch
+        self.headless = headless
+        self.service_address = service_address
+        self.extraction = extraction
+        self.drivers = DriverPool(self.create_driver)
+
+    def create_driver(self):
+        options = browser.Options()
+        if self.headless:
+            options.add_argument("--headless")
+        for argument in (*CHROME_ARGS, *self.options.get('chrome_args', ())):
+            options.add_argument(argument)
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        with metrics.span('driver_startup'):
+            driver = browser.create_chrome(options, service_address=self.service_address)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver.implicitly_wait(self.options.get('implicit_wait', 3))
+        return driver
+
+    def open(self):
+        """Arrancar el navegador principal: si Chrome no arranca, fallar antes de recorrer nada"""
+        self.drivers.get()
+        logger.info("✅ Driver configurado correctamente")
+
+    def fetch(self, url, page_type='category', extract=True):
+        """HTML de la página (o ``DomPage``); None si no cargó tras los reintentos"""
+        retries = self.options.get('retries', 2)
+        wait_seconds = self.options.get('wait', {}).get(page_type, 15)
+        driver = self.drivers.get()
+        breaker = circuit.breakers.for_url(url)
+        for attempt in range(retries):
+            retry = attempt < retries - 1
+            if not breaker.allow():
+                logger.warning(f"⛔ Circuito abierto para {breaker.host}: se omite {url}")
+                return None
+            try:
+                with metrics.span('page_load'):
+                    driver.get(url)
+
+                with metrics.span('readiness_wait'):
+                    ready = self.profile.readiness[page_type].wait(driver, wait_seconds)
+                if ready.state in (EMPTY, BROKEN):
+                    # Página rota o vacía: falla al instante, sin page_source ni parseo
+                    breaker.record(False)
+                    metrics.increment('page_errors')
+                    self._pause('retry_pause', retry, breaker)
+                    continue
+
+                # Scroll para activar la carga diferida
+                with metrics.span('scroll'):
+                    self.scroll(driver)
+
+                if extract and self.extraction == 'browser' and page_type == 'category':
+                    with metrics.span('product_extraction'):
+                        page = dom_extract.extract_in_browser(driver, self.profile.dom_rules)
+                    if page:
+                        breaker.record(True)
+                        metrics.increment('pages_loaded')
+                        return page
+
+                # Con la condición cumplida la página vale; si no, el texto visible que
+                # midió el navegador al evaluarla (sin parsear la página para medirlo)
+                loaded = ready.state == READY or ready.text_length > self.options.get('min_text', 300)
+                breaker.record(loaded)  # Casi sin texto: caído o bloqueando
+                if not loaded:
+                    logger.warning(f"⚠️ Página con poco contenido (intento {attempt + 1}): {url}")
+                    self._pause('retry_pause', retry, breaker)
+                    continue
+                with metrics.span('page_source'):
+                    html = driver.page_source
+                metrics.increment('pages_loaded')
+                return html
+
+            except Exception as e:
+                breaker.record(False)
+                metrics.increment('page_errors')
+                logger.warning(f"⚠️ Intento {attempt + 1} fallido en {url}: {e}")
+                self._pause('error_pause', retry, breaker)
+
+        logger.error(f"❌ Falló cargar {url} después de {retries} intentos")
+        return None
+
+    def _pause(self, option, retry, breaker):
+        if retry and not breaker.is_open():
+            time.sleep(self.options.get(option, 2))
+
+    def scroll(self, driver):
+        """Un empujón (``nudge``) o scroll progresivo hasta el final (``progressive``)"""
+        mode = self.options.get('scroll')
+        if mode == 'nudge':
+            driver.execute_script("window.scrollTo(0, 500);")
+            time.sleep(1)
+            driver.execute_script("window.scrollTo(0, 0);")
+        elif mode == 'progressive':
+            try:
+                total_height = driver.execute_script("return document.body.scrollHeight")
+                position = 0
+                while position < total_height:
+                    driver.execute_script(f"window.scrollTo(0, {position});")
+                    time.sleep(0.5)
+                    position += 300
+                    # La altura crece a medida que se cargan productos
+                    total_height = max(total_height, driver.execute_script("return document.body.scrollHeight"))
+                driver.execute_script("window.scrollTo(0, 0);")
+                time.sleep(1)
+            except Exception as e:
+                logger.warning(f"⚠️ Error en scroll progresivo: {e}")
+
+    def close(self):
+        self.drivers.close()
+
+
+def fetcher_for(site_profile, headless=True, service_address=None, extraction='html'):
+    """Descargador del backend que declara el perfil"""
+    if site_profile.backend == 'browser':
+        return BrowserFetcher(site_profile, headless, service_address, extraction)
+    return HttpFetcher(site_profile)
+
+
+def category_label(category):
+    """Nombre de la categoría con el de su principal (``Lácteos > Quesos``)"""
+    if category.get('parent'):
+        return f"{category['parent']} > {category['name']}"
+    return category['name']
+
+
+def as_category(category, url=None):
+    """Categoría como dict (``name``, ``url``, ``parent``, ``level``) desde la caché o la frontera.
+
+    Acepta también ``(url, nombre)`` y el payload ``{'nombre': ...}`` que
+    guardaban las cachés y fronteras de versiones anteriores.
+    """
+    if isinstance(category, (list, tuple)):
+        category = {'url': category[0], 'name': category[1]}
+    elif 'name' not in category and 'nombre' in category:
+        category = {'name': category['nombre']}
+    return {'parent': None, 'level': 'main', **category, 'url': category.get('url') or url}
+
+
+def _diagnose(options, soup, page_url):
+    mode, budget_ms = options
+    analyzer = diagnostics.analyzer_for(mode, budget_ms)
+    with metrics.span('diagnostics'):
+        report = analyzer.analyze(soup, page_url)
+    if report is None:
+        print(f"\n🔍 Estructura de {diagnostics.url_pattern(page_url)} ya analizada")
+    else:
+        diagnostics.print_report(report)
+
+
+def parse_listing_page(page, page_url, site, category, first=False, options=None):
+    """Productos de una página del listado con el perfil de ``site`` (ejecutable en el pool de procesos).
+
+    ``page`` es el HTML o una ``DomPage`` ya extraída en el navegador. En la
+    primera página también devuelve el mayor tamaño de página que ofrece el
+    sitio, las URLs de las páginas siguientes y, si ``options`` lo pide, las
+    subcategorías. Devuelve ``(productos, tamaño, urls, subcategorías)``.
+    """
+    options = options or {}
+    site_profile = profile(site)
+    max_pages = options.get('max_pages', site_profile.max_pages)
+    offered = subcategories = None
+    next_urls = []
+    if isinstance(page, DomPage):
+        products = site_profile.products_from_records(page.records)
+        if first:
+            links = site_profile.pagination_from_records(page.links, page_url)
+            next_urls = site_profile.next_page_urls(page_url, links, page.total_text, len(products), max_pages)
+    else:
+        with metrics.span('parse'):
+            soup = parse_html(page)
+        if options.get('diagnostics'):
+            _diagnose(options['diagnostics'], soup, page_url)
+        with metrics.span('product_extraction'):
+            products = site_profile.extract_products(soup, page_url, options.get('fallback_limit'))
+        if first:
+            offered = site_profile.largest_page_size(soup)
+            links = site_profile.pagination_links(soup, page_url)
+            next_urls = site_profile.next_page_urls(page_url, links, site_profile.total_text(soup), len(products),
+                                                    max_pages)
+            if options.get('subcategories'):
+                with metrics.span('category_discovery'):
+                    subcategories = site_profile.subcategory_links(soup, page_url, category)
+        if options.get('bounded_memory'):
+            memory.dispose(soup)
+        else:
+            soup.decompose()
+
+    label = category_label(category)
+    for product in products:
+        product['categoria'] = label
+        product['url_categoria'] = category['url']
+    return products, offered, next_urls, subcategories
+
+
+class ScrapingEngine:
+    """Pipeline común: descubrimiento → paginación → extracción → deduplicación → CSV.
+
+    Sin ``scheduler`` las categorías se recorren en el orden descubierto y
+    sin topes por nivel; con él, en el orden y con los topes del
+    planificador. Con ``frontier`` las categorías (y las subcategorías que se
+    encuentren) se encolan y se procesan desde la frontera compartida.
+    ``diagnostics`` es ``(modo, presupuesto_ms)`` de ``diagnostics.analyzer_for``.
+    """
+
+    def __init__(self, site, fetcher=None, parse_pool=None, prefetch=None, max_pages=None, max_categories=None,
+                 page_size=None, target=None, discovery='auto', category_cache=None, refresh_categories=False,
+                 frontier=None, scheduler=None, enricher=None, diagnostics=None, bounded_memory=False):
+        self.site = site
+        self.profile = profile(site)
+        self.fetcher = fetcher or fetcher_for(self.profile)
+        self.parse_pool = parse_pool if parse_pool is not None else ParsePool()
+        self.max_pages = max_pages or self.profile.max_pages
+        self.max_categories = max_categories or self.profile.max_categories
+        self.fixed_page_size = page_size
+        self.page_size = None  # Mayor tamaño de página del sitio; se aprende en la primera categoría
+        self.target = target or math.inf
+        self.discovery = discovery
+        self.category_cache = category_cache
+        self.refresh_categories = refresh_categories
+        self.frontier = frontier
+        # Sin planificador, orden de descubrimiento y sin topes por nivel
+        self.caps = scheduler.caps if scheduler is not None else {}
+        if scheduler is None:
+            scheduler = YieldScheduler(site, order='discovery', history_dir=None)
+        self.scheduler = scheduler
+        self.enricher = enricher
+        self.diagnostics = diagnostics
+        self.bounded_memory = bounded_memory
+        prefetch = self.profile.prefetch if prefetch is None else prefetch
+        self.prefetcher = PagePrefetcher(self.fetcher.fetch, lookahead=prefetch,
+                                         min_interval=self.profile.page_interval)
+
+        self.products = []
+        self.results = None  # Productos finales (fusionados y enriquecidos) tras ``finish``
+        self.processed = SeenURLs(site)
+        self.sitemap_tree = None
+        self.cached_subcategories = {}
+        self.found_subcategories = {}  # Subcategorías leídas en la primera página de cada principal
+
+    # Descubrimiento
+
+    def categories(self):
+        """Categorías principales: caché vigente, sitemap o portada (y encoladas si hay frontera)"""
+        categories = None
+        if self.category_cache:
+            cached = self.category_cache.load(self.refresh_categories)
+            if cached:
+                categories = [as_category(category) for category in cached['categories']]
+                self.sitemap_tree = cached.get('sitemap_tree')
+                self.cached_subcategories = cached.get('subcategories') or {}
+                logger.info(f"✓ {len(categories)} categorías desde la caché")
+                self.category_cache.validate_in_background(self.profile.base_url)
+
+        if categories is None:
+            categories = self.discover()
+            if categories and self.category_cache:
+                extra = {'sitemap_tree': self.sitemap_tree, 'subcategories': {}} if self.profile.subcategories else {}
+                self.category_cache.save(categories, base_url=self.profile.base_url, **extra)
+
+        if self.max_categories:
+            categories = categories[:self.max_categories]
+        if categories and self.frontier:
+            self.enqueue(categories)
+        return categories
+
+    def discover(self):
+        """Descubrir las categorías principales: sitemap y, si no hay, la portada"""
+        if self.discovery != 'dom':
+            with metrics.span('category_discovery'):
+                tree = sitemap.discover_categories(self.profile.base_url, category_filter=self.profile.is_category)
+            if tree:
+                if self.profile.sitemap == 'roots':
+                    # Las subcategorías salen después del mismo árbol
+                    self.sitemap_tree = tree
+                    nodes = [node for node in tree if node['parent_url'] is None]
+                else:
+                    nodes = sitemap.leaf_categories(tree)
+                categories = self.profile.unique_categories([
+                    {'name': node['name'], 'url': node['url'], 'parent': None, 'level': 'main', 'source': 'Sitemap'}
+                    for node in nodes
+                ])
+                if categories:
+                    logger.info(f"🗺️  {len(categories)} categorías en el sitemap")
+                    return categories
+
+        html = self.fetcher.fetch(self.profile.base_url, page_type='home')
+        if not html:
+            logger.error("❌ No se pudo obtener la página principal")
+            return []
+        with metrics.span('parse'):
+            soup = parse_html(html)
+        with metrics.span('category_discovery'):
+            categories = self.profile.category_links(soup, self.profile.base_url)
+        self.release(soup)
+        logger.info(f"🔍 {len(categories)} categorías en la página principal")
+        return categories
+
+    def subcategories(self, category):
+        """Subcategorías de una categoría principal: caché, árbol del sitemap o su primera página"""
+        limit = self.caps.get('subcategories', self.profile.subcategory_limit)
+        cached = self.cached_subcategories.get(category['url'])
+        if cached is not None:
+            return [as_category(subcategory) for subcategory in cached][:limit]
+
+        if self.sitemap_tree:
+            parent = canonical_url(category['url'], self.site)
+            subcategories = self.profile.unique_categories([
+                {'name': node['name'], 'url': node['url'], 'parent': category['name'], 'level': 'sub'}
+                for node in self.sitemap_tree
+                if node['parent_url'] and canonical_url(node['parent_url'], self.site) == parent
+                and self.profile.valid_subcategory(node['name'], node['url'])
+            ])
+        else:
+            subcategories = self.found_subcategories.pop(category['url'], None)
+            if subcategories is None:
+                subcategories = self._subcategories_from_page(category)
+        subcategories = subcategories[:limit]
+
+        if self.category_cache:
+            self.cached_subcategories[category['url']] = subcategories
+            self.category_cache.update(subcategories=self.cached_subcategories)
+        return subcategories
+
+    def _subcategories_from_page(self, category):
+        # Sin la primera página parseada (extracción en el navegador o worker): cargar su HTML
+        html = self.fetcher.fetch(category['url'], extract=False)
+        if not html:
+            return []
+        with metrics.span('parse'):
+            soup = parse_html(html)
+        with metrics.span('category_discovery'):
+            subcategories = self.profile.subcategory_links(soup, category['url'], category)
+        self.release(soup)
+        return subcategories
+
+    def _needs_subcategories(self, category):
+        return (self.profile.subcategories and category['level'] == 'main' and not self.sitemap_tree
+                and category['url'] not in self.cached_subcategories)
+
+    # Frontera
+
+    def enqueue(self, categories):
+        """Encolar categorías en la frontera; las ya encoladas (por otro worker) se ignoran"""
+        new = sum(1 for category in categories if self.frontier.enqueue(category['url'], self.site, payload=category))
+        logger.info(f"📥 {new} categorías nuevas encoladas ({len(categories) - new} ya existían)")
+
+    def consume_frontier(self, worker_id=None):
+        """Procesar categorías de la frontera; las principales encolan sus subcategorías"""
+        def handle(task):
+            if self.exhausted():
+                return {'productos': 0, 'omitida': 'objetivo alcanzado'}
+            category = as_category(task['payload'], task['url'])
+            self.processed.add(category['url'])
+            products = self.scrape_category(category)
+            self.products.extend(products)
+            if self.profile.subcategories and category['level'] == 'main':
+                subcategories = self.subcategories(category)
+                if subcategories:
+                    self.enqueue(subcategories)
+            logger.info(f"📊 Productos acumulados: {len(self.products)}")
+            return {'productos': len(products)}
+
+        return run_worker(self.frontier, handle, retailer=self.site, worker_id=worker_id)
+
+    # Categorías y paginación
+
+    def crawl(self, categories):
+        """Recorrer las categorías en el orden del planificador hasta el objetivo o el presupuesto de tiempo"""
+        scheduler = self.scheduler
+        for i, category in enumerate(categories):
+            scheduler.push(category, (i, 0))
+
+        while len(scheduler) and not self.exhausted():
+            (i, _), category = scheduler.pop()
+            if not self.processed.add(category['url']):
+                continue
+            is_main = category['level'] == 'main'
+            if is_main:
+                logger.info(f"\n📦 [{i + 1}/{len(categories)}] {category['name']}")
+                logger.info(f"🔗 URL: {category['url']}")
+            else:
+                logger.info(f"      ↳ {category_label(category)}")
+            try:
+                products = self.scrape_category(category)
+            except Exception as e:
+                logger.error(f"❌ Error procesando {category['name']}: {e}")
+                continue
+            self.products.extend(products)
+            logger.info(f"📊 Productos acumulados: {len(self.products)}")
+
+            if is_main and self.profile.subcategories:
+                subcategories = self.subcategories(category)
+                if subcategories:
+                    logger.info(f"   📁 {len(subcategories)} subcategorías en {category['name']}")
+                for k, subcategory in enumerate(subcategories, 1):
+                    scheduler.push(subcategory, (i, k))
+            if len(scheduler):
+                with metrics.span('politeness'):
+                    time.sleep(self.profile.pause[0 if is_main else 1])
+
+    def scrape_category(self, category):
+        """Productos nuevos de todas las páginas de una categoría, registrados en el planificador"""
+        max_pages = self.scheduler.max_pages(category, self.max_pages)
+        started = time.monotonic()
+        with metrics.category_context(category['name']):
+            products, productive = self._scrape_pages(category, max_pages)
+        new, changed = self.scheduler.record(category, products, time.monotonic() - started, productive)
+        metrics.increment('products', len(products))
+        logger.info(f"✓ {category_label(category)}: {len(products)} productos en {productive} páginas")
+        if self.scheduler.path and products:
+            logger.info(f"   📈 {new} productos nuevos y {changed} con precio cambiado desde la última ejecución")
+        return products
+
+    def _scrape_pages(self, category, max_pages):
+        first_url = category['url']
+        page_size = self.fixed_page_size or self.page_size
+        if self.profile.page_size_param and page_size:
+            # Menos páginas por categoría: menos peticiones por producto
+            first_url = pagination.set_query_param(first_url, self.profile.page_size_param, page_size)
+
+        page = self.fetcher.fetch(first_url)
+        if not page:
+            logger.warning(f"❌ No se pudo obtener {first_url}")
+            return [], 0
+        options = self.parse_options(max_pages)
+        first_options = {**options, 'subcategories': self._needs_subcategories(category)}
+        products, offered, next_urls, subcategories = self.parse_pool.parse(
+            parse_listing_page, page, first_url, self.site, category, True, first_options)
+        if subcategories is not None:
+            self.found_subcategories[category['url']] = subcategories
+        if offered and not self.fixed_page_size and offered != self.page_size:
+            self.page_size = offered
+            logger.info(f"📏 Tamaño de página máximo de {self.profile.label}: {offered} productos")
+
+        seen = set()
+        found = self.keep_new(products, seen)
+        productive = int(bool(found))
+        if next_urls and products:
+            category_cap = self.caps.get('category')
+            with closing(self.parse_pool.ordered(self.prefetcher.pages(next_urls), parse_listing_page, self.site,
+                                                 category, False, options)) as parsed:
+                for number, (_, result) in enumerate(parsed, 2):
+                    if (category_cap and len(found) >= category_cap) or self.scheduler.out_of_time():
+                        break  # Cancela las cargas pendientes
+                    page_products = self.keep_new(result[0], seen) if result else []
+                    if not page_products:
+                        logger.info(f"⏹ Página {number} vacía o repetida: fin del listado")
+                        break
+                    found.extend(page_products)
+                    productive += 1
+                    logger.info(f"   📄 Página {number}: {len(page_products)} productos")
+        return found, productive
+
+    def parse_options(self, max_pages):
+        """Opciones de ``parse_listing_page`` (serializables para el pool de procesos)"""
+        return {
+            'max_pages': max_pages,
+            'fallback_limit': self.caps.get('alternative'),
+            'diagnostics': self.diagnostics,
+            'bounded_memory': self.bounded_memory,
+        }
+
+    def keep_new(self, products, seen):
+        """Productos de la página que la categoría aún no tenía; [] si no trae nada nuevo.
+
+        ``seen`` son las claves ya vistas en la categoría. Si el perfil
+        deduplica se descartan los repetidos y el tope por página del
+        planificador se aplica después, sobre los nuevos: con el tope antes,
+        una página que repite los primeros de la anterior parecería vacía.
+        Sin deduplicación la página entera cuenta si trae algo nuevo.
+        """
+        if not self.profile.dedupe:
+            keys = {self.profile.product_key(product) for product in products}
+            fresh = products if keys - seen else []
+            seen |= keys
+            return fresh
+
+        limit = self.caps.get('page')
+        fresh = []
+        for product in products:
+            if limit and len(fresh) >= limit:
+                break
+            key = self.profile.product_key(product)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(product)
+        return fresh
+
+    def exhausted(self):
+        """¿Se alcanzó el objetivo de productos o el presupuesto de tiempo?"""
+        return self.scheduler.exhausted(len(self.products), self.target)
+
+    # Recorrido completo
+
+    def run(self, worker=False):
+        """Recorrer el sitio (o, con ``worker``, solo consumir la frontera); devuelve los productos finales"""
+        self.fetcher.open()
+        try:
+            if not worker:
+                categories = self.categories()
+                if not categories:
+                    logger.error("❌ No se encontraron categorías")
+                    return []
+                logger.info(f"📋 {len(categories)} categorías:")
+                for i, category in enumerate(categories, 1):
+                    logger.info(f"   {i:2d}. {category['name']} ({category.get('source', 'caché')})")
+            if self.frontier:
+                self.consume_frontier()
+            else:
+                self.crawl(categories)
+        finally:
+            self.scheduler.save()
+            self.prefetcher.close()
+            self.fetcher.close()
+        logger.info(f"🎉 Recorrido completado: {len(self.products)} productos extraídos")
+        return self.finish()
+
+    def finish(self):
+        """Fusionar similares entre categorías (si el perfil lo pide) y completar con la página de detalle"""
+        products = self.products
+        if self.profile.merge == 'similar' and products:
+            with metrics.span('dedupe'):
+                products = merge_similar(products)
+        if self.enricher and products:
+            self.enricher.enrich(products)
+        self.results = products
+        return products
+
+    def save(self, path=None):
+        """Guardar los productos en el CSV del perfil; devuelve la ruta o None si no hay productos"""
+        products = self.results if self.results is not None else self.products
+        if not products:
+            logger.warning("⚠️ No hay productos para guardar")
+            return None
+        path = path or self.profile.output_file.format(timestamp=int(time.time()))
+        columns = self.profile.output_columns(enriched=self.enricher is not None)
+        with metrics.span('output_write'), open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(columns.values()))
+            writer.writeheader()
+            for product in products:
+                row = {}
+                for field, header in columns.items():
+                    value = product.get(field, '')
+                    row[header] = '; '.join(value) if isinstance(value, list) else value
+                writer.writerow(row)
+        print(f"\n✅ {len(products)} productos guardados en {path}")
+        return path
+
+    def close(self):
+        """Cerrar las descargas adelantadas, los navegadores y el pool de parseo"""
+        self.prefetcher.close()
+        self.fetcher.close()
+        self.parse_pool.close()
+
+    def release(self, soup):
+        if self.bounded_memory:
+            memory.dispose(soup)
+        else:
+            soup.decompose()
+
+
+def similar_products(first, second, threshold=0.85):
+    """¿Son el mismo producto? Mismo precio y nombre igual, contenido en el otro o con Jaccard alto"""
+    if generar_hash_producto(first['nombre'], first['precio']) == generar_hash_producto(second['nombre'],
+                                                                                        second['precio']):
+        return True
+    if normalizar_precio(first['precio']) != normalizar_precio(second['precio']):
+        return False
+    name1 = normalizar_texto(first['nombre'])
+    name2 = normalizar_texto(second['nombre'])
+    if name1 in name2 or name2 in name1:
+        return True
+    words1 = set(name1.split())
+    words2 = set(name2.split())
+    if not words1 or not words2:
+        return False
+    return len(words1 & words2) / len(words1 | words2) >= threshold
+
+
+def merge_similar(products):
+    """Un producto por grupo de similares (``similar_products``) con todas sus categorías en ``categorias``"""
+    unique = []
+    by_hash = {}
+    for product in products:
+        key = generar_hash_producto(product['nombre'], product['precio'])
+        match = by_hash.get(key) or next((other for other in unique if similar_products(product, other)), None)
+        if match is None:
+            match = {**product, 'categorias': []}
+            unique.append(match)
+            by_hash[key] = match
+        if product['categoria'] not in match['categorias']:
+            match['categorias'].append(product['categoria'])
+    logger.info(f"🔍 Duplicados: {len(products)} extraídos, {len(unique)} únicos, "
+                f"{len(products) - len(unique)} fusionados")
+    return unique
+
+
+# Línea de comandos
+
+def add_engine_arguments(parser, site):
+    """Opciones comunes de los scrapers: descubrimiento, frontera, paginación e infraestructura compartida"""
+    site_profile = profile(site)
+    parser.add_argument('--frontier', help="Frontera compartida: ruta SQLite o URL del servidor (http://host:puerto)")
+    parser.add_argument('--worker', action='store_true', help="Solo consumir categorías de la frontera")
+    parser.add_argument('--discovery', choices=['auto', 'dom'], default='auto',
+                        help="auto: sitemap.xml y, si no existe, enlaces de la página principal")
+    parser.add_argument('--max-pages', type=int, default=site_profile.max_pages,
+                        help="Máximo de páginas por categoría")
+    parser.add_argument('--max-categories', type=int, default=site_profile.max_categories,
+                        help="Procesar solo las primeras N categorías")
+    if site_profile.page_size_param:
+        parser.add_argument('--page-size', type=int,
+                            help="Productos por página (por defecto, el mayor que ofrezca el sitio)")
+    if site_profile.backend == 'browser':
+        add_browser_service_arguments(parser)
+        add_extraction_arguments(parser)
+    add_cache_arguments(parser)
+    add_prefetch_arguments(parser)
+    parser.set_defaults(prefetch=site_profile.prefetch)
+    add_enrichment_arguments(parser)
+    add_parse_pool_arguments(parser)
+    circuit.add_circuit_arguments(parser)
+    metrics.add_metrics_arguments(parser)
+    profiling.add_profile_arguments(parser)
+    memory.add_memory_arguments(parser)
+
+
+def parse_engine_args(parser, argv=None):
+    """Parsear y validar las opciones de ``add_engine_arguments`` (y configurar el cortocircuito)"""
+    args = parser.parse_args(argv)
+    circuit.configure(args)
+    if args.worker and not args.frontier:
+        parser.error("--worker requiere --frontier")
+    return args
+
+
+def engine_from_args(site, args, headless=True, **kwargs):
+    """``ScrapingEngine`` de ``site`` con los puntos de extensión que activan las opciones.
+
+    El planificador y el diagnóstico solo se conectan si el script añadió
+    sus opciones (``add_scheduler_arguments``, ``add_diagnostics_arguments``).
+    """
+    site_profile = profile(site)
+    fetcher = fetcher_for(site_profile, headless=headless, service_address=getattr(args, 'browser_service', None),
+                          extraction=getattr(args, 'extraction', 'html'))
+    scheduler = scheduler_from_args(args, site) if hasattr(args, 'schedule') else None
+    mode = getattr(args, 'diagnostics', 'off')
+    return ScrapingEngine(
+        site, fetcher=fetcher, parse_pool=pool_from_args(args), prefetch=args.prefetch, max_pages=args.max_pages,
+        max_categories=args.max_categories, page_size=getattr(args, 'page_size', None), discovery=args.discovery,
+        category_cache=CategoryCache(site, args.category_ttl), refresh_categories=args.refresh_categories,
+        frontier=open_frontier(args.frontier) if args.frontier else None, scheduler=scheduler,
+        enricher=enricher_from_args(args, site),
+        diagnostics=(mode, args.diagnostics_budget) if mode != 'off' else None,
+        bounded_memory=args.bounded_memory, **kwargs
+    )
+
+
+@contextmanager
+def instrumented(args, site):
+    """Métricas, perfilado y seguimiento de memoria durante el recorrido de ``site``"""
+    metrics_server = metrics.start(args, site)
+    profiler = profiling.start(args, site)
+    tracker = memory.start(args, site)
+    try:
+        yield
+    finally:
+        memory.finish(tracker)
+        profiling.finish(profiler)
+        metrics.finish(args, metrics_server)
+
+
+def main(argv=None):
+    # Las opciones (y sus valores por defecto) dependen del perfil: leer primero el sitio
+    site_parser = argparse.ArgumentParser(add_help=False)
+    site_parser.add_argument('site', nargs='?', choices=sorted(PROFILES))
+    site = site_parser.parse_known_args(argv)[0].site
+
+    parser = argparse.ArgumentParser(description="Motor de scraping común guiado por el perfil de cada sitio")
+    parser.add_argument('site', choices=sorted(PROFILES), help="Perfil del supermercado")
+    parser.add_argument('--show-browser', action='store_true', help="Abrir el navegador con ventana")
+    parser.add_argument('-o', '--output', help="CSV de salida (por defecto, el del perfil)")
+    if site:
+        add_engine_arguments(parser, site)
+    args = parse_engine_args(parser, argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    site_profile = profile(site)
+    print(f"🚀 {site_profile.label} con el motor común (backend {site_profile.backend})")
+    with instrumented(args, site):
+        engine = engine_from_args(site, args, headless=not args.show_browser)
+        try:
+            engine.run(worker=args.worker)
+            engine.save(args.output)
+        finally:
+            engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Enriquecimiento opcional con las páginas de detalle de cada producto.
+
+Las tarjetas del listado solo dan nombre, precio y categoría. SKU, código
+de barras, tamaño, marca y disponibilidad están en la página de detalle,
+cuya URL se toma del propio contenedor del producto al extraerlo
+(``product_url``).
+
+Las páginas de detalle se descargan con ``PagePrefetcher`` (concurrencia
+acotada y pausa mínima entre peticiones) y se guardan en
+``.cache/detalles/<retailer>.json`` junto con sus validadores HTTP
+(``ETag``/``Last-Modified``):
+
+* un producto enriquecido hace menos de ``ttl_hours`` no se vuelve a pedir;
+* pasado el TTL se pide con ``If-None-Match``/``If-Modified-Since``; un
+  ``304`` renueva la entrada sin descargar ni parsear la página.
+
+Así el coste del enriquecimiento depende de cuántos productos cambian entre
+ejecuciones, no del tamaño del catálogo.
+
+Uso típico::
+
+    enricher = DetailEnricher('nacional', concurrency=8, ttl_hours=24)
+    enricher.enrich(productos, url_key='URL_Producto')
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import closing
+from urllib.parse import urljoin, urlparse
+
+from mercadoscript import core, metrics, units
+from mercadoscript.prefetch import PagePrefetcher
+from mercadoscript.urls import SeenURLs, canonical_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'detalles')
+DEFAULT_TTL_HOURS = 24
+DEFAULT_CONCURRENCY = 4
+
+DETAIL_FIELDS = ('sku', 'codigo_barras', 'tamano', 'marca', 'disponibilidad')
+
+# Enlaces de un contenedor que nunca son la ficha del producto
+_IGNORED_LINKS = re.compile(r'^(?:#|javascript:|mailto:|tel:)|/(?:cart|carrito|checkout|wishlist|login)\b', re.I)
+_LABELLED_PATTERNS = {
+    'sku': re.compile(r'\b(?:sku|c[oó]digo|ref(?:erencia)?)\b\s*[:#]?\s*([A-Z0-9][\w-]{2,30})', re.I),
+    'codigo_barras': re.compile(r'\b(?:ean|upc|gtin|c[oó]digo de barras)\s*[:#]?\s*(\d{8,14})\b', re.I),
+    'marca': re.compile(r'\bmarca\s*:\s*([^\n|]{2,40})', re.I),
+}
+_IN_STOCK = ('instock', 'in stock', 'disponible', 'en existencia', 'agregar al carrito', 'añadir al carrito')
+_OUT_OF_STOCK = ('outofstock', 'out of stock', 'agotado', 'no disponible', 'sin existencia')
+
+
+def add_enrichment_arguments(parser):
+    """Opciones de línea de comandos del enriquecimiento con páginas de detalle"""
+    parser.add_argument('--enrich', action='store_true',
+                        help="Visitar la página de detalle de cada producto (SKU, código de barras, tamaño...)")
+    parser.add_argument('--enrich-concurrency', type=int, default=DEFAULT_CONCURRENCY, metavar='N',
+                        help="Páginas de detalle descargadas en paralelo")
+    parser.add_argument('--enrich-ttl', type=float, default=DEFAULT_TTL_HOURS, metavar='HORAS',
+                        help="No volver a visitar productos enriquecidos hace menos de estas horas")
+
+
+def enricher_from_args(args, retailer):
+    """``DetailEnricher`` según la línea de comandos, o None sin ``--enrich``"""
+    if not args.enrich:
+        return None
+    return DetailEnricher(retailer, concurrency=args.enrich_concurrency, ttl_hours=args.enrich_ttl)
+
+
+def product_url(container, base_url):
+    """URL absoluta de la ficha del producto dentro de su contenedor"""
+    links = container.find_all('a', href=True) if container.name != 'a' else [container]
+    for link in links:
+        href = link['href'].strip()
+        if href and not _IGNORED_LINKS.search(href):
+            url = urljoin(base_url, href)
+            if urlparse(url).scheme in ('http', 'https'):
+                return canonical_url(url)
+    return None
+
+
+def _json_ld_products(soup):
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                kind = node.get('@type')
+                if kind == 'Product' or (isinstance(kind, list) and 'Product' in kind):
+                    yield node
+                stack.extend(node.get('@graph', []))
+
+
+def _text(value):
+    if isinstance(value, dict):
+        value = value.get('name')
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return str(value).strip() if value not in (None, '') else None
+
+
+def _availability(value):
+    value = (value or '').lower()
+    if any(term in value for term in _OUT_OF_STOCK):
+        return 'agotado'
+    if any(term in value for term in _IN_STOCK):
+        return 'disponible'
+    return None
+
+
+def parse_details(soup, name=None):
+    """Campos de detalle de una ficha: JSON-LD, microdatos y, por último, el texto"""
+    details = dict.fromkeys(DETAIL_FIELDS)
+    names = [name]
+
+    for product in _json_ld_products(soup):
+        offers = product.get('offers') or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        details['sku'] = details['sku'] or _text(product.get('sku') or product.get('mpn'))
+        details['codigo_barras'] = details['codigo_barras'] or _text(
+            product.get('gtin13') or product.get('gtin') or product.get('gtin12') or product.get('gtin8'))
+        details['marca'] = details['marca'] or _text(product.get('brand'))
+        details['tamano'] = details['tamano'] or _text(product.get('size') or product.get('weight'))
+        details['disponibilidad'] = details['disponibilidad'] or _availability(_text(offers.get('availability')))
+        names.append(_text(product.get('name')))
+
+    for field, props in (('sku', ('sku', 'productID')), ('codigo_barras', ('gtin13', 'gtin', 'gtin12')),
+                         ('marca', ('brand',)), ('disponibilidad', ('availability',))):
+        if details[field]:
+            continue
+        for prop in props:
+            element = soup.find(attrs={'itemprop': prop})
+            if element:
+                value = element.get('content') or element.get('href') or element.get_text(' ', strip=True)
+                details[field] = _availability(value) if field == 'disponibilidad' else _text(value)
+                break
+
+    if not details['marca']:
+        meta = soup.find('meta', attrs={'property': 'product:brand'})
+        details['marca'] = _text(meta.get('content')) if meta else None
+
+    if any(details[field] is None for field in DETAIL_FIELDS):
+        text = soup.get_text('\n', strip=True)
+        for field, pattern in _LABELLED_PATTERNS.items():
+            if not details[field]:
+                match = pattern.search(text)
+                details[field] = match.group(1).strip() if match else None
+        if not details['disponibilidad']:
+            details['disponibilidad'] = _availability(text)
+        heading = soup.find('h1')
+        names.append(heading.get_text(' ', strip=True) if heading else None)
+        for candidate in filter(None, names):
+            match = details['tamano'] is None and units.SIZE_PATTERN.search(candidate)
+            if match:
+                count = f"{match['count']} x " if match['count'] else ''
+                times = f" x {match['times']}" if match['times'] else ''
+                details['tamano'] = f"{count}{match['qty']} {match['unit'].lower()}{times}"
+
+    return details
+
+
+class DetailStore:
+    """Detalles ya obtenidos por URL, con fecha y validadores HTTP"""
+
+    def __init__(self, retailer, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, f"{retailer}.json")
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def put(self, url, details, etag=None, last_modified=None):
+        with self._lock:
+            self.entries[url] = {
+                'details': details, 'enriched_at': time.time(),
+                'etag': etag, 'last_modified': last_modified,
+            }
+
+    def touch(self, url):
+        with self._lock:
+            self.entries[url]['enriched_at'] = time.time()
+
+    def save(self):
+        # Escritura atómica, como la caché de categorías
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class DetailEnricher:
+    def __init__(self, retailer, concurrency=DEFAULT_CONCURRENCY, ttl_hours=DEFAULT_TTL_HOURS, min_interval=0.25,
+                 store=None, headers=None, verify=True, timeout=20):
+        self.retailer = retailer
+        self.concurrency = max(1, concurrency)
+        self.ttl_seconds = ttl_hours * 3600
+        self.min_interval = min_interval
+        self.store = store or DetailStore(retailer)
+        self.headers = headers or core.HEADERS
+        self.verify = verify
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = core.requests.Session()
+        return session
+
+    def is_fresh(self, url):
+        entry = self.store.get(url)
+        return bool(entry) and time.time() - entry['enriched_at'] < self.ttl_seconds
+
+    def fetch(self, url):
+        """``(status, html, etag, last_modified)``; revalida con los validadores guardados"""
+        headers = dict(self.headers)
+        entry = self.store.get(url)
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            metrics.increment('requests')
+            with metrics.span('fetch'):
+                response = self._session().get(url, headers=headers, timeout=self.timeout, verify=self.verify)
+        except Exception as e:
+            metrics.increment('page_errors')
+            logger.debug(f"Error obteniendo detalle {url}: {e}")
+            return None, None, None, None
+        if response.status_code == 304:
+            return 304, None, None, None
+        if response.status_code >= 400:
+            metrics.increment('page_errors')
+            return response.status_code, None, None, None
+        return (response.status_code, response.text,
+                response.headers.get('ETag'), response.headers.get('Last-Modified'))
+
+    def enrich(self, products, url_key='url', columns=None, name_key='nombre'):
+        """Completar ``products`` en su sitio con los campos de detalle.
+
+        ``columns`` traduce cada campo de ``DETAIL_FIELDS`` al nombre de
+        columna del scraper (por defecto el mismo nombre).
+        """
+        columns = columns or {field: field for field in DETAIL_FIELDS}
+        # Agrupar por URL canónica: variantes de la misma ficha se descargan una vez
+        by_url = {}
+        seen = SeenURLs(self.retailer)
+        for product in products:
+            if product.get(url_key):
+                seen.add(product[url_key])
+                by_url.setdefault(canonical_url(product[url_key], self.retailer), []).append(product)
+
+        stale = [url for url in by_url if not self.is_fresh(url)]
+        stats = {'productos': len(by_url), 'vigentes': len(by_url) - len(stale), 'descargados': 0,
+                 'no_modificados': 0, 'errores': 0}
+        logger.info(f"🔎 Enriqueciendo {len(by_url)} productos: {len(stale)} por visitar, "
+                    f"{stats['vigentes']} vigentes en caché")
+
+        fetcher = PagePrefetcher(self.fetch, lookahead=self.concurrency, min_interval=self.min_interval)
+        try:
+            with metrics.span('enrichment'), closing(fetcher.pages(stale)) as pages:
+                for url, (status, html, etag, last_modified) in pages:
+                    if status == 304:
+                        self.store.touch(url)
+                        stats['no_modificados'] += 1
+                    elif html:
+                        with metrics.span('parse'):
+                            soup = core.parse_html(html)
+                        details = parse_details(soup, by_url[url][0].get(name_key))
+                        soup.decompose()
+                        self.store.put(url, details, etag, last_modified)
+                        stats['descargados'] += 1
+                    else:
+                        stats['errores'] += 1
+        finally:
+            fetcher.close()
+            self.store.save()
+
+        for url, group in by_url.items():
+            entry = self.store.get(url)
+            details = entry['details'] if entry else {}
+            for product in group:
+                for field, column in columns.items():
+                    product[column] = details.get(field) or ''
+
+        metrics.increment('details_fetched', stats['descargados'])
+        metrics.increment('details_not_modified', stats['no_modificados'])
+        metrics.increment('details_skipped', stats['vigentes'])
+        logger.info(f"✅ Detalles: {stats['descargados']} descargados, {stats['no_modificados']} sin cambios (304), "
+                    f"{stats['vigentes']} vigentes, {stats['errores']} errores")
+        return stats
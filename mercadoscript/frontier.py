@@ -0,0 +1,459 @@
+"""Frontera de crawling compartida entre varias máquinas.
+
+La frontera guarda las URLs de categorías pendientes con semántica de
+lease/ack: un worker toma una tarea (lease) durante un tiempo limitado y la
+confirma (ack) al terminar. Si el worker muere, el lease expira y otro worker
+la retoma. Mientras el worker procesa, un hilo renueva el lease cada tercio
+de su duración, así que una categoría lenta no se reparte a un segundo
+worker. Las URLs se deduplican por ejecución (``run_id``) y la cortesía por
+host se aplica sobre el estado compartido, de modo que se respeta aunque haya
+muchos workers.
+
+Backends:
+    * ``SQLiteFrontier``: archivo SQLite local (varios procesos en la misma
+      máquina pueden compartirlo).
+    * ``RemoteFrontier``: cliente HTTP de un ``FrontierServer``. El servidor se
+      levanta con ``python -m mercadoscript.frontier serve`` y puede correr en
+      cualquier máquina (o como proceso local en pruebas).
+
+El servidor escucha por defecto solo en ``127.0.0.1``. Para workers en otras
+máquinas hay que elegir la interfaz (``--host``) y un token compartido
+(``--token`` o la variable ``MERCADOSCRIPT_FRONTIER_TOKEN``): cada petición
+debe llevarlo en ``Authorization: Bearer <token>``, o cualquiera en la red
+podría encolar URLs para los workers o vaciar la cola. Sin token el servidor
+se niega a escuchar fuera de loopback. Los clientes toman el token de la
+misma variable.
+
+Uso::
+
+    MERCADOSCRIPT_FRONTIER_TOKEN=secreto python -m mercadoscript.frontier serve --host 0.0.0.0
+    MERCADOSCRIPT_FRONTIER_TOKEN=secreto python Nacional.py --frontier http://coordinador:8765 --worker
+"""
+import argparse
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from mercadoscript.urls import canonical_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_POLITENESS_SECONDS = 5.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+TOKEN_ENV = 'MERCADOSCRIPT_FRONTIER_TOKEN'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    retailer TEXT NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, url)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (run_id, status, retailer);
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    next_allowed REAL NOT NULL
+);
+"""
+
+
+def default_worker_id():
+    """Identificador de worker único por máquina y proceso"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def default_run_id():
+    """Una ejecución por día: el catálogo completo se recorre diariamente"""
+    return time.strftime('%Y-%m-%d')
+
+
+class SQLiteFrontier:
+    def __init__(self, db_path='frontier.db', run_id=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+                 politeness_seconds=DEFAULT_POLITENESS_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.run_id = run_id or default_run_id()
+        self.lease_seconds = lease_seconds
+        self.politeness_seconds = politeness_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, url, retailer, payload=None):
+        """Encolar una URL (en forma canónica); devuelve False si ya estaba en esta ejecución"""
+        url = canonical_url(url, retailer)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO tasks (run_id, url, host, retailer, payload, enqueued_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, url, urlparse(url).netloc.lower(), retailer,
+                 json.dumps(payload, ensure_ascii=False) if payload is not None else None, now, now)
+            )
+        return cursor.rowcount == 1
+
+    def lease(self, worker_id, retailer=None):
+        """Tomar la siguiente tarea disponible respetando la cortesía por host"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Leases vencidos sin intentos restantes: el worker murió demasiadas veces
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', lease_owner = NULL, updated_at = ? "
+                    "WHERE run_id = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, self.run_id, now, self.max_attempts)
+                )
+                query = (
+                    "SELECT t.* FROM tasks t LEFT JOIN hosts h ON h.host = t.host "
+                    "WHERE t.run_id = ? AND t.attempts < ? "
+                    "AND (t.status = 'pending' OR (t.status = 'leased' AND t.lease_expires < ?)) "
+                    "AND (h.next_allowed IS NULL OR h.next_allowed <= ?)"
+                )
+                params = [self.run_id, self.max_attempts, now, now]
+                if retailer:
+                    query += " AND t.retailer = ?"
+                    params.append(retailer)
+                row = self._conn.execute(query + " ORDER BY t.id LIMIT 1", params).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, row['id'])
+                )
+                self._conn.execute(
+                    "INSERT INTO hosts (host, next_allowed) VALUES (?, ?) "
+                    "ON CONFLICT(host) DO UPDATE SET next_allowed = excluded.next_allowed",
+                    (row['host'], now + self.politeness_seconds)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            'id': row['id'],
+            'url': row['url'],
+            'retailer': row['retailer'],
+            'payload': json.loads(row['payload']) if row['payload'] else None,
+            'attempts': row['attempts'] + 1,
+            'lease_seconds': self.lease_seconds,
+        }
+
+    def extend_lease(self, task_id, worker_id):
+        """Renovar el lease de una tarea larga; False si ya se perdió"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, task_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def ack(self, task_id, worker_id, result=None):
+        """Confirmar una tarea terminada; False si el lease ya no era nuestro"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'done', lease_owner = NULL, lease_expires = NULL, "
+                "result = ?, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 time.time(), task_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def nack(self, task_id, worker_id, error=None):
+        """Devolver una tarea fallida; pasa a 'failed' al agotar los intentos"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, lease_expires = NULL, result = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (self.max_attempts, json.dumps({'error': str(error)}) if error else None,
+                 time.time(), task_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def stats(self, retailer=None):
+        """Conteo de tareas por estado en la ejecución actual.
+
+        ``lease_expires`` es el vencimiento más lejano de los leases vivos
+        (None si no hay ninguno): hasta entonces una tarea en lease puede
+        volver a quedar disponible.
+        """
+        query = "SELECT status, COUNT(*) AS n, MAX(lease_expires) AS expires FROM tasks WHERE run_id = ?"
+        params = [self.run_id]
+        if retailer:
+            query += " AND retailer = ?"
+            params.append(retailer)
+        with self._lock:
+            rows = self._conn.execute(query + " GROUP BY status", params).fetchall()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0, 'lease_expires': None}
+        for row in rows:
+            counts[row['status']] = row['n']
+            if row['status'] == 'leased':
+                counts['lease_expires'] = row['expires']
+        return counts
+
+    def close(self):
+        self._conn.close()
+
+
+class RemoteFrontier:
+    """Cliente HTTP con la misma interfaz que SQLiteFrontier"""
+
+    def __init__(self, base_url, timeout=30, token=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.token = token or os.environ.get(TOKEN_ENV)
+
+    def _call(self, endpoint, **params):
+        data = json.dumps(params).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        request = urllib.request.Request(f"{self.base_url}/{endpoint}", data=data, headers=headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))['result']
+
+    def enqueue(self, url, retailer, payload=None):
+        return self._call('enqueue', url=url, retailer=retailer, payload=payload)
+
+    def lease(self, worker_id, retailer=None):
+        return self._call('lease', worker_id=worker_id, retailer=retailer)
+
+    def extend_lease(self, task_id, worker_id):
+        return self._call('extend_lease', task_id=task_id, worker_id=worker_id)
+
+    def ack(self, task_id, worker_id, result=None):
+        return self._call('ack', task_id=task_id, worker_id=worker_id, result=result)
+
+    def nack(self, task_id, worker_id, error=None):
+        return self._call('nack', task_id=task_id, worker_id=worker_id, error=error)
+
+    def stats(self, retailer=None):
+        return self._call('stats', retailer=retailer)
+
+    def close(self):
+        pass
+
+
+class FrontierServer(ThreadingHTTPServer):
+    """Expone una SQLiteFrontier por HTTP para workers en otras máquinas; ``token`` protege cada petición"""
+
+    daemon_threads = True
+    allowed_methods = {'enqueue', 'lease', 'extend_lease', 'ack', 'nack', 'stats'}
+
+    def __init__(self, frontier, host=DEFAULT_HOST, port=DEFAULT_PORT, token=None):
+        self.frontier = frontier
+        self.token = token or os.environ.get(TOKEN_ENV)
+        if not self.token and not _is_loopback(host):
+            raise ValueError(f"La frontera en {host} sería accesible desde la red: se necesita un token "
+                             f"(--token o {TOKEN_ENV})")
+        super().__init__((host, port), _FrontierRequestHandler)
+
+    def authorized(self, header):
+        if not self.token:
+            return True
+        return hmac.compare_digest((header or '').encode('utf-8'), f"Bearer {self.token}".encode('utf-8'))
+
+
+def _is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _FrontierRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        method = self.path.strip('/')
+        if not self.server.authorized(self.headers.get('Authorization')):
+            self._reply(401, {'error': "Token de la frontera ausente o incorrecto"})
+            return
+        if method not in self.server.allowed_methods:
+            self._reply(404, {'error': f"Método desconocido: {method}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            params = json.loads(self.rfile.read(length) or b'{}')
+            result = getattr(self.server.frontier, method)(**params)
+            self._reply(200, {'result': result})
+        except Exception as e:
+            logger.error(f"❌ Error en frontera ({method}): {e}")
+            self._reply(500, {'error': str(e)})
+
+    def _reply(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def open_frontier(spec, token=None, **kwargs):
+    """Abrir una frontera a partir de una ruta SQLite o una URL http(s)://"""
+    if spec.startswith(('http://', 'https://')):
+        return RemoteFrontier(spec, token=token)
+    if spec.startswith('sqlite:///'):
+        spec = spec[len('sqlite:///'):]
+    return SQLiteFrontier(spec, **kwargs)
+
+
+class LeaseHeartbeat:
+    """Renueva el lease de una tarea desde un hilo mientras se procesa"""
+
+    def __init__(self, frontier, task, worker_id, interval=None):
+        self.frontier = frontier
+        self.task = task
+        self.worker_id = worker_id
+        self.interval = interval or task.get('lease_seconds', DEFAULT_LEASE_SECONDS) / 3
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{task['id']}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.frontier.extend_lease(self.task['id'], self.worker_id):
+                    self.lost = True
+                    logger.warning(f"⚠️ Lease de la tarea {self.task['id']} perdido durante el proceso")
+                    return
+            except Exception as e:
+                # Un fallo puntual de red no pierde el lease: se reintenta en el siguiente latido
+                logger.warning(f"⚠️ No se pudo renovar el lease de la tarea {self.task['id']}: {e}")
+
+
+def run_worker(frontier, handler, retailer=None, worker_id=None, poll_interval=1.0, idle_timeout=60):
+    """Consumir tareas hasta vaciar la frontera.
+
+    ``handler(task)`` procesa una tarea y devuelve un resultado serializable
+    (por ejemplo, el número de productos); mientras tanto ``LeaseHeartbeat``
+    renueva su lease. Si lanza una excepción la tarea se devuelve con nack.
+    Termina cuando no quedan tareas pendientes ni en lease, o tras
+    ``idle_timeout`` segundos sin conseguir ninguna y sin leases vivos: el
+    lease de un worker caído vence antes y su tarea se retoma aquí.
+    """
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    idle_since = None
+
+    while True:
+        task = frontier.lease(worker_id, retailer)
+        if task is None:
+            counts = frontier.stats(retailer)
+            if counts['pending'] == 0 and counts['leased'] == 0:
+                break
+            now = time.time()
+            idle_since = idle_since or now
+            lease_running = counts.get('lease_expires') is not None and counts['lease_expires'] >= now
+            if now - idle_since > idle_timeout and not lease_running:
+                logger.warning(f"⚠️ Worker {worker_id} inactivo {now - idle_since:.0f}s, terminando")
+                break
+            # Esperar cortesía del host o leases de otros workers (que pueden vencer)
+            time.sleep(poll_interval)
+            continue
+
+        idle_since = None
+        logger.info(f"📥 [{worker_id}] Tarea {task['id']} (intento {task['attempts']}): {task['url']}")
+        try:
+            with LeaseHeartbeat(frontier, task, worker_id):
+                result = handler(task)
+        except Exception as e:
+            logger.error(f"❌ Error en tarea {task['id']}: {e}")
+            frontier.nack(task['id'], worker_id, error=str(e))
+            continue
+
+        if not frontier.ack(task['id'], worker_id, result):
+            logger.warning(f"⚠️ Lease de la tarea {task['id']} perdido antes del ack")
+        processed += 1
+
+    logger.info(f"🔚 Worker {worker_id} terminó: {processed} tareas procesadas")
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frontera de crawling compartida")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help="Servir una frontera SQLite por HTTP")
+    serve.add_argument('--db', default='frontier.db')
+    serve.add_argument('--host', default=DEFAULT_HOST,
+                       help="Interfaz de escucha; fuera de loopback exige --token")
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--token', help=f"Token compartido con los workers (por defecto ${TOKEN_ENV})")
+    serve.add_argument('--politeness', type=float, default=DEFAULT_POLITENESS_SECONDS,
+                       help="Segundos mínimos entre peticiones al mismo host")
+    serve.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS)
+
+    stats = subparsers.add_parser('stats', help="Mostrar el estado de una frontera")
+    stats.add_argument('spec', help="Ruta SQLite o URL del servidor")
+    stats.add_argument('--retailer')
+    stats.add_argument('--token', help=f"Token del servidor (por defecto ${TOKEN_ENV})")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'serve':
+        frontier = SQLiteFrontier(args.db, lease_seconds=args.lease, politeness_seconds=args.politeness)
+        try:
+            server = FrontierServer(frontier, args.host, args.port, token=args.token)
+        except ValueError as e:
+            frontier.close()
+            parser.error(str(e))
+        logger.info(f"🚀 Frontera sirviendo {args.db} en http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            frontier.close()
+    else:
+        frontier = open_frontier(args.spec, token=args.token)
+        print(json.dumps(frontier.stats(args.retailer), indent=2))
+
+
+if __name__ == "__main__":
+    main()
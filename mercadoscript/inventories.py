@@ -0,0 +1,75 @@
+"""Localización y carga de los inventarios que escribe cada scraper.
+
+Cada scraper guarda su CSV con su propio nombre y sus propias columnas
+(``nombre``/``Nombre``, ``categoria``/``Categorias``...). Este módulo sabe
+dónde buscar el más reciente de cada retailer y lo carga como registros
+uniformes, con el precio numérico y el precio por unidad ya calculados
+(``mercadoscript.units``), para la búsqueda y la API de consulta.
+"""
+import csv
+import glob
+import os
+
+from mercadoscript import units
+
+# Archivos de cada retailer, del más específico al de respaldo del repositorio
+RETAILER_FILES = {
+    'sirena': ('sirena_productos_exhaustivo.csv', 'sirena_productos_completo.csv', 'Inventario_Sirena.csv'),
+    'jumbo': ('jumbo_productos_completo.csv', 'Inventario_Jumbo.csv'),
+    'nacional': ('inventario_nacional_*.csv',),
+    'bravo': ('debug_superbravo_*.csv', 'Inventario_Bravo.csv'),
+}
+RETAILERS = tuple(RETAILER_FILES)
+
+_COLUMNS = {
+    'nombre': ('nombre',),
+    'precio': ('precio',),
+    'categoria': ('categoria', 'categorias'),
+    'url': ('url_producto', 'url'),
+    'sku': ('sku',),
+}
+
+
+def inventory_files(retailer, directory='.'):
+    """Inventarios de ``retailer`` en ``directory``, del más antiguo al más reciente"""
+    paths = set()
+    for pattern in RETAILER_FILES[retailer]:
+        paths.update(glob.glob(os.path.join(directory, pattern)))
+    return sorted(paths, key=os.path.getmtime)
+
+
+def latest_inventory(retailer, directory='.'):
+    files = inventory_files(retailer, directory)
+    return files[-1] if files else None
+
+
+def signature(path):
+    """Identifica una versión concreta de un archivo: cambia cuando se reescribe"""
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def load_inventory(path, retailer):
+    """Registros uniformes de un CSV de inventario"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        lowered = {field.lower(): field for field in reader.fieldnames or []}
+        columns = {
+            name: next((lowered[c] for c in candidates if c in lowered), None)
+            for name, candidates in _COLUMNS.items()
+        }
+        if not columns['nombre']:
+            raise ValueError(f"{path}: no tiene columna 'nombre'")
+        records = [
+            {name: (row.get(column) or '') if column else '' for name, column in columns.items()}
+            for row in reader
+        ]
+
+    prices = units.unit_prices([r['nombre'] for r in records], [r['precio'] for r in records])
+    for record, (quantity, unit, price, per_unit) in zip(records, prices):
+        record['retailer'] = retailer
+        record['precio_num'] = price
+        record['cantidad_base'] = quantity
+        record['unidad_base'] = unit
+        record['precio_por_unidad'] = per_unit
+    return records
@@ -0,0 +1,278 @@
+"""Diferencias entre dos inventarios (qué cambió de una ejecución a otra).
+
+Compara dos CSV de inventario del mismo retailer y emite, en CSV o JSONL,
+los productos nuevos, los eliminados y los que cambiaron de precio (con la
+diferencia absoluta y porcentual).
+
+Cada producto se identifica por una clave estable: el SKU o la URL del
+producto si la ejecución se enriqueció (``--enrich``) y, si no, el nombre
+normalizado (``normalizar_texto``). La comparación es un hash join: se
+indexa la ejecución anterior por clave y la nueva se recorre en streaming.
+
+Para inventarios que no caben en memoria (1M de filas o más) se hace un
+hash join particionado: ambas ejecuciones se reparten por el hash de la
+clave en ``N`` archivos temporales y se comparan partición a partición, de
+modo que en memoria solo hay un índice de ``--max-rows`` filas como mucho.
+El número de particiones se estima con el tamaño de los archivos.
+
+Uso::
+
+    python -m mercadoscript.inventory_diff Inventario_Jumbo_ayer.csv Inventario_Jumbo.csv -o cambios.csv
+    python -m mercadoscript.inventory_diff anterior.csv nuevo.csv --format jsonl --max-rows 100000
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import ExitStack
+from itertools import islice
+
+from mercadoscript import units
+from mercadoscript.core import normalizar_textos
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ROWS = 200_000
+KEY_COLUMNS = ('sku', 'url_producto', 'url')
+NAME_COLUMNS = ('nombre',)
+PRICE_COLUMNS = ('precio',)
+CATEGORY_COLUMNS = ('categoria', 'categorias')
+
+OUTPUT_FIELDS = ('cambio', 'clave', 'nombre', 'categoria', 'precio_anterior', 'precio_nuevo', 'diferencia',
+                 'diferencia_pct')
+CHANGES = ('nuevo', 'eliminado', 'sube', 'baja', 'modificado')
+
+# Filas por lote al normalizar claves y convertir precios
+BATCH_SIZE = 10_000
+
+
+def _find_column(fieldnames, candidates):
+    lowered = {field.lower(): field for field in fieldnames}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    return None
+
+
+class InventoryReader:
+    """Filas compactas ``(clave, nombre, precio, categoría)`` de un CSV de inventario"""
+
+    def __init__(self, path, key_column=None):
+        self.path = path
+        self.key_column = key_column
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self, size=BATCH_SIZE):
+        """Filas en lotes; las claves por nombre se normalizan lote a lote"""
+        csv.field_size_limit(sys.maxsize)
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            name = _find_column(header, NAME_COLUMNS)
+            if name is None:
+                raise ValueError(f"{self.path}: no tiene columna 'nombre'")
+            price = _find_column(header, PRICE_COLUMNS)
+            category = _find_column(header, CATEGORY_COLUMNS)
+            keys = [self.key_column] if self.key_column else [
+                column for column in (_find_column(header, (c,)) for c in KEY_COLUMNS) if column
+            ]
+            index = {column: i for i, column in enumerate(header)}
+            name_i = index[name]
+            price_i = index[price] if price else None
+            category_i = index[category] if category else None
+            key_is = [index[column] for column in keys if column in index]
+            width = len(header)
+
+            for rows in _batched(reader, size):
+                for row in rows:
+                    if len(row) < width:
+                        row += [''] * (width - len(row))
+                names = normalizar_textos([row[name_i] for row in rows])
+                batch = []
+                for row, normalized in zip(rows, names):
+                    key = next((row[i] for i in key_is if row[i]), None) or normalized
+                    if key:
+                        batch.append((key, row[name_i], row[price_i] if price_i is not None else '',
+                                      row[category_i] if category_i is not None else ''))
+                yield batch
+
+
+def estimate_rows(path, sample_bytes=1 << 16):
+    """Filas aproximadas de un CSV a partir del tamaño medio de línea"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    lines = sample.count(b'\n')
+    if not lines:
+        return 1
+    return int(size / (len(sample) / lines))
+
+
+def _partition_of(key, partitions):
+    return zlib.crc32(key.encode('utf-8')) % partitions
+
+
+def partition(batches, directory, prefix, partitions):
+    """Repartir los lotes de filas en ``partitions`` archivos por el hash de la clave"""
+    paths = [os.path.join(directory, f'{prefix}_{i:04d}.csv') for i in range(partitions)]
+    with ExitStack() as stack:
+        writers = [
+            csv.writer(stack.enter_context(open(path, 'w', newline='', encoding='utf-8')))
+            for path in paths
+        ]
+        for batch in batches:
+            buckets = [[] for _ in range(partitions)]
+            for row in batch:
+                buckets[_partition_of(row[0], partitions)].append(row)
+            for writer, bucket in zip(writers, buckets):
+                writer.writerows(bucket)
+    return paths
+
+
+def _read_partition(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        yield from (tuple(row) for row in csv.reader(f))
+
+
+def _batched(rows, size):
+    rows = iter(rows)
+    return iter(lambda: list(islice(rows, size)), [])
+
+
+def _with_prices(rows):
+    """Filas con su precio numérico, convertido por lotes"""
+    for batch in _batched(rows, BATCH_SIZE):
+        yield from zip(batch, units.parse_prices(row[2] for row in batch))
+
+
+def _record(change, row, old_price=None, new_price=None, old_text='', new_text=''):
+    delta = pct = ''
+    if old_price is not None and new_price is not None:
+        delta = round(new_price - old_price, 2)
+        pct = round(delta / old_price * 100, 2) if old_price else ''
+    return {
+        'cambio': change, 'clave': row[0], 'nombre': row[1], 'categoria': row[3],
+        'precio_anterior': old_text, 'precio_nuevo': new_text, 'diferencia': delta, 'diferencia_pct': pct,
+    }
+
+
+def diff_partition(old_rows, new_rows):
+    """Hash join de una partición: índice de la anterior, recorrido de la nueva"""
+    index = {}
+    for row, price in _with_prices(old_rows):
+        index.setdefault(row[0], (row, price))  # con claves repetidas manda la primera fila
+
+    seen = set()
+    for row, price in _with_prices(new_rows):
+        key = row[0]
+        if key in seen:
+            continue
+        seen.add(key)
+        previous = index.pop(key, None)
+        if previous is None:
+            yield _record('nuevo', row, new_price=price, new_text=row[2])
+            continue
+        old_row, old_price = previous
+        if old_price is not None and price is not None:
+            if price == old_price:
+                continue
+            change = 'sube' if price > old_price else 'baja'
+        elif old_row[2] == row[2]:
+            continue
+        else:
+            change = 'modificado'  # el precio aparece o desaparece ("Precio no disponible")
+        yield _record(change, row, old_price, price, old_row[2], row[2])
+
+    for old_row, old_price in index.values():
+        yield _record('eliminado', old_row, old_price=old_price, old_text=old_row[2])
+
+
+def diff_inventories(old_path, new_path, max_rows=DEFAULT_MAX_ROWS, key_column=None, partitions=None,
+                     workdir=None):
+    """Generador de cambios entre dos inventarios, con memoria acotada a ``max_rows``"""
+    old_rows = InventoryReader(old_path, key_column)
+    new_rows = InventoryReader(new_path, key_column)
+    rows = max(estimate_rows(old_path), estimate_rows(new_path))
+    partitions = partitions or max(1, math.ceil(rows / max_rows))
+    if partitions == 1:
+        yield from diff_partition(old_rows, new_rows)
+        return
+
+    logger.info(f"🧩 Hash join particionado en {partitions} particiones")
+    directory = tempfile.mkdtemp(prefix='inventory_diff_', dir=workdir)
+    try:
+        old_parts = partition(old_rows.batches(), directory, 'anterior', partitions)
+        new_parts = partition(new_rows.batches(), directory, 'nuevo', partitions)
+        for old_part, new_part in zip(old_parts, new_parts):
+            yield from diff_partition(_read_partition(old_part), _read_partition(new_part))
+            os.remove(old_part)
+            os.remove(new_part)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class DiffWriter:
+    """Salida en CSV o JSONL, con recuento por tipo de cambio"""
+
+    def __init__(self, stream, fmt='csv'):
+        self.stream = stream
+        self.fmt = fmt
+        self.counts = dict.fromkeys(CHANGES, 0)
+        self._writer = None
+        if fmt == 'csv':
+            self._writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS)
+            self._writer.writeheader()
+
+    def write(self, record):
+        self.counts[record['cambio']] += 1
+        if self._writer:
+            self._writer.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cambios entre dos inventarios: nuevos, eliminados y precios")
+    parser.add_argument('anterior', help="CSV de la ejecución anterior")
+    parser.add_argument('nuevo', help="CSV de la ejecución nueva")
+    parser.add_argument('-o', '--output', help="Archivo de salida (por defecto la salida estándar)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'],
+                        help="Formato de salida (por defecto según la extensión de --output, o csv)")
+    parser.add_argument('--key', help="Columna con la clave estable (por defecto SKU, URL o nombre normalizado)")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help="Filas indexadas en memoria a la vez; por encima se particiona")
+    parser.add_argument('--partitions', type=int, help="Forzar el número de particiones")
+    parser.add_argument('--workdir', help="Directorio para las particiones temporales")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    fmt = args.format or ('jsonl' if args.output and args.output.endswith(('.jsonl', '.json')) else 'csv')
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        stream = (stack.enter_context(open(args.output, 'w', newline='', encoding='utf-8'))
+                  if args.output else sys.stdout)
+        writer = DiffWriter(stream, fmt)
+        for record in diff_inventories(args.anterior, args.nuevo, args.max_rows, args.key, args.partitions,
+                                       args.workdir):
+            writer.write(record)
+
+    summary = ', '.join(f"{count} {change}" for change, count in writer.counts.items())
+    print(f"📊 {summary} ({time.perf_counter() - started:.1f} s)", file=sys.stderr)
+    if args.output:
+        print(f"💾 Guardado en {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Modo de memoria acotada y reporte de memoria por fases.
+
+Un árbol de BeautifulSoup es un grafo de referencias circulares (cada
+``Tag`` apunta a su padre y a sus hijos), así que no se libera al salir de
+ámbito: espera al recolector cíclico, que en ejecuciones largas pasa poco y
+tarde. Con ``--bounded-memory`` los scrapers llaman a ``dispose`` sobre el
+árbol de cada página en cuanto extrajeron sus productos; ``decompose()``
+rompe los ciclos y la memoria vuelve de inmediato. De la página solo
+sobreviven los registros planos (``str``).
+
+``--memory-report`` activa ``tracemalloc`` y mide cada span de
+``mercadoscript.metrics``: memoria retenida al terminar la fase y pico
+alcanzado dentro de ella, más el pico de la ejecución y las líneas que más
+memoria asignan. Es caro (las asignaciones se vuelven ~2x más lentas), así
+que sin la opción no se registra nada. Con varios hilos (``--prefetch``) los
+picos por fase son aproximados: ``tracemalloc`` mide el proceso entero.
+
+Uso::
+
+    python Sirena.py --bounded-memory --memory-report
+    python Jumbo.py --bounded-memory --memory-report --memory-output memoria_jumbo
+"""
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+
+from mercadoscript import metrics
+
+logger = logging.getLogger(__name__)
+
+TOP_ALLOCATIONS = 10
+
+
+def add_memory_arguments(parser):
+    """Opciones de línea de comandos de los scrapers con navegador (Sirena y Jumbo)"""
+    parser.add_argument('--bounded-memory', action='store_true',
+                        help="Destruir el árbol HTML de cada página en cuanto se extraen sus productos")
+    parser.add_argument('--memory-report', action='store_true',
+                        help="Medir con tracemalloc la memoria pico y por fase")
+    parser.add_argument('--memory-output', help="Prefijo del reporte JSON de memoria")
+
+
+def dispose(tree):
+    """Destruir un árbol de BeautifulSoup (o un ``Tag``) y romper sus ciclos"""
+    if tree is None:
+        return
+    try:
+        # En la raíz (BeautifulSoup) ``next_element`` es None y ``decompose()`` no
+        # recorre el documento: hay que destruir sus hijos de primer nivel
+        for child in list(getattr(tree, 'contents', ())):
+            child.decompose()
+        tree.decompose()
+    except Exception as e:
+        logger.debug(f"No se pudo destruir el árbol: {e}")
+        return
+    metrics.increment('trees_disposed')
+
+
+class _PhaseMemory:
+    __slots__ = ('count', 'retained', 'peak')
+
+    def __init__(self):
+        self.count = 0
+        self.retained = 0
+        self.peak = 0
+
+    def to_dict(self):
+        return {'count': self.count, 'retained_bytes': self.retained, 'peak_bytes': self.peak}
+
+
+class MemoryTracker:
+    """Memoria retenida y pico de cada fase, a partir de los spans de ``metrics``"""
+
+    def __init__(self, top=TOP_ALLOCATIONS):
+        self.top = top
+        self.phases = {}
+        self.peak = 0
+        self.started_tracing = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        metrics.registry.span_listeners.append(self)
+
+    def __call__(self, phase, event):
+        stack = self._local.__dict__.setdefault('stack', [])
+        current, peak = tracemalloc.get_traced_memory()
+        if event == 'start':
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            stack.append([current, current])
+            tracemalloc.reset_peak()
+            return
+        if not stack:
+            return
+        start, running_peak = stack.pop()
+        span_peak = max(running_peak, peak)
+        if stack:
+            # El pico de la fase anidada también es pico de la que la contiene
+            stack[-1][1] = max(stack[-1][1], span_peak)
+        with self._lock:
+            stat = self.phases.setdefault(phase, _PhaseMemory())
+            stat.count += 1
+            stat.retained += current - start
+            stat.peak = max(stat.peak, span_peak - start)
+            self.peak = max(self.peak, span_peak)
+
+    def stop(self):
+        if self in metrics.registry.span_listeners:
+            metrics.registry.span_listeners.remove(self)
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        self.current = current
+        snapshot = tracemalloc.take_snapshot()
+        self.allocations = [
+            {'location': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:self.top]
+        ]
+        if self.started_tracing:
+            tracemalloc.stop()
+
+    def to_dict(self):
+        return {
+            'peak_bytes': self.peak,
+            'current_bytes': self.current,
+            'max_rss_bytes': max_rss(),
+            'trees_disposed': metrics.registry.counter_value('trees_disposed'),
+            'phases': {phase: stat.to_dict() for phase, stat in sorted(self.phases.items())},
+            'top_allocations': self.allocations,
+        }
+
+    def print_summary(self):
+        print(f"\n🧠 MEMORIA (tracemalloc):")
+        print(f"   Pico: {_mb(self.peak)} | Al terminar: {_mb(self.current)}"
+              + (f" | RSS máximo: {_mb(max_rss())}" if max_rss() else ''))
+        for phase, stat in sorted(self.phases.items(), key=lambda item: -item[1].peak):
+            print(f"   {phase:<20} pico {_mb(stat.peak):>10}  retenida {_mb(stat.retained):>10}  ({stat.count} spans)")
+
+
+def _mb(size):
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def max_rss():
+    """RSS máximo del proceso en bytes (0 si la plataforma no lo expone)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024  # macOS informa bytes; Linux, KiB
+
+
+def start(args, retailer):
+    """Iniciar el reporte de memoria según las opciones; None si está desactivado"""
+    if not getattr(args, 'memory_report', False):
+        return None
+    tracker = MemoryTracker()
+    tracker.prefix = args.memory_output or f"memoria_{retailer}_{int(time.time())}"
+    tracker.start()
+    logger.info("🧠 Reporte de memoria activo (tracemalloc)")
+    return tracker
+
+
+def finish(tracker):
+    """Detener el reporte de memoria, imprimir el resumen y guardar el JSON"""
+    if tracker is None:
+        return
+    tracker.stop()
+    tracker.print_summary()
+    path = f"{tracker.prefix}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(tracker.to_dict(), f, ensure_ascii=False, indent=2)
+    print(f"🧠 Reporte de memoria guardado en: {path}")
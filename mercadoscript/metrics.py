@@ -0,0 +1,318 @@
+"""Instrumentación por fases y exportación de métricas.
+
+Cada fase del scraping (arranque del driver, ``driver.get``, espera de
+carga, scroll, ``page_source``, parseo, descubrimiento de categorías,
+extracción, deduplicación y escritura) se envuelve en un ``span``. Los
+tiempos se agregan por retailer y fase, y por retailer, categoría y fase.
+Al terminar se exportan a JSON y en formato de texto de Prometheus; con
+``--metrics-port`` también se sirven en vivo.
+
+Uso típico::
+
+    from mercadoscript import metrics
+
+    metrics.registry.start_run('sirena')
+    with metrics.category_context('Lácteos'):
+        with metrics.span('page_load'):
+            driver.get(url)
+
+Los spans pueden anidarse; el resumen reporta cada fase como porcentaje del
+tiempo total de la ejecución.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PHASES = (
+    'driver_startup', 'page_load', 'readiness_wait', 'scroll', 'page_source',
+    'fetch', 'parse', 'category_discovery', 'product_extraction', 'dedupe', 'output_write',
+    'politeness', 'diagnostics', 'enrichment', 'parse_wait',
+)
+
+
+class _Stat:
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_seconds': round(self.total, 6),
+            'min_seconds': round(self.min or 0.0, 6),
+            'max_seconds': round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.retailer = None
+            self.run_started = None
+            self.run_finished = None
+            self.by_phase = {}       # (retailer, fase) -> _Stat
+            self.by_category = {}    # (retailer, categoría, fase) -> _Stat
+            self.counters = {}       # (nombre, etiquetas ordenadas) -> valor
+            self.span_listeners = []
+
+    def start_run(self, retailer):
+        """Comenzar a medir una ejecución de un retailer"""
+        self.retailer = retailer
+        self.run_started = time.time()
+        self.run_finished = None
+
+    def finish_run(self):
+        self.run_finished = time.time()
+
+    def run_seconds(self):
+        if self.run_started is None:
+            return 0.0
+        return (self.run_finished or time.time()) - self.run_started
+
+    @property
+    def current_category(self):
+        return getattr(self._local, 'category', None)
+
+    @contextmanager
+    def category_context(self, category):
+        """Atribuir a ``category`` los spans abiertos dentro del bloque"""
+        previous = self.current_category
+        self._local.category = category
+        try:
+            yield
+        finally:
+            self._local.category = previous
+
+    @contextmanager
+    def span(self, phase, category=None):
+        """Medir la duración de una fase"""
+        category = category or self.current_category
+        for listener in self.span_listeners:
+            listener(phase, 'start')
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started, category)
+            for listener in self.span_listeners:
+                listener(phase, 'end')
+
+    def record(self, phase, seconds, category=None):
+        retailer = self.retailer or 'desconocido'
+        with self._lock:
+            self.by_phase.setdefault((retailer, phase), _Stat()).add(seconds)
+            if category:
+                self.by_category.setdefault((retailer, category, phase), _Stat()).add(seconds)
+
+    def increment(self, name, value=1, **labels):
+        """Incrementar un contador (páginas, productos, errores...)"""
+        labels.setdefault('retailer', self.retailer or 'desconocido')
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter_value(self, name, **labels):
+        """Suma de un contador sobre todas las etiquetas que coinciden con ``labels``"""
+        with self._lock:
+            return sum(
+                value for (counter, counter_labels), value in self.counters.items()
+                if counter == name and all(dict(counter_labels).get(k) == v for k, v in labels.items())
+            )
+
+    def snapshot(self):
+        """Estado agregado como diccionario serializable"""
+        with self._lock:
+            run_seconds = self.run_seconds()
+            phases = []
+            for (retailer, phase), stat in sorted(self.by_phase.items()):
+                entry = {'retailer': retailer, 'phase': phase, **stat.to_dict()}
+                if run_seconds:
+                    entry['share_of_run'] = round(stat.total / run_seconds, 4)
+                phases.append(entry)
+            categories = [
+                {'retailer': retailer, 'category': category, 'phase': phase, **stat.to_dict()}
+                for (retailer, category, phase), stat in sorted(self.by_category.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+        return {
+            'retailer': self.retailer,
+            'run_started': self.run_started,
+            'run_seconds': round(run_seconds, 3),
+            'phases': phases,
+            'categories': categories,
+            'counters': counters,
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Formato de exposición de texto de Prometheus"""
+        data = self.snapshot()
+        lines = [
+            '# HELP mercadoscript_run_seconds Duración de la ejecución',
+            '# TYPE mercadoscript_run_seconds gauge',
+            f'mercadoscript_run_seconds{{retailer="{_escape(data["retailer"] or "")}"}} {data["run_seconds"]}',
+            '# HELP mercadoscript_phase_seconds Tiempo acumulado por fase',
+            '# TYPE mercadoscript_phase_seconds summary',
+        ]
+        for entry in data['phases']:
+            labels = f'retailer="{_escape(entry["retailer"])}",phase="{_escape(entry["phase"])}"'
+            lines.append(f'mercadoscript_phase_seconds_sum{{{labels}}} {entry["total_seconds"]}')
+            lines.append(f'mercadoscript_phase_seconds_count{{{labels}}} {entry["count"]}')
+
+        lines += [
+            '# HELP mercadoscript_category_phase_seconds Tiempo acumulado por categoría y fase',
+            '# TYPE mercadoscript_category_phase_seconds summary',
+        ]
+        for entry in data['categories']:
+            labels = (f'retailer="{_escape(entry["retailer"])}",category="{_escape(entry["category"])}",'
+                      f'phase="{_escape(entry["phase"])}"')
+            lines.append(f'mercadoscript_category_phase_seconds_sum{{{labels}}} {entry["total_seconds"]}')
+            lines.append(f'mercadoscript_category_phase_seconds_count{{{labels}}} {entry["count"]}')
+
+        declared = set()
+        for entry in data['counters']:
+            metric = f'mercadoscript_{entry["name"]}_total'
+            if metric not in declared:
+                lines.append(f'# TYPE {metric} counter')
+                declared.add(metric)
+            labels = ','.join(f'{k}="{_escape(str(v))}"' for k, v in entry['labels'].items())
+            lines.append(f'{metric}{{{labels}}} {entry["value"]}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, json_path=None, prometheus_path=None):
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_json())
+            logger.info(f"📈 Métricas JSON guardadas en: {json_path}")
+        if prometheus_path:
+            with open(prometheus_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            logger.info(f"📈 Métricas Prometheus guardadas en: {prometheus_path}")
+
+    def print_summary(self, top=12):
+        """Mostrar en qué fases se fue el tiempo"""
+        data = self.snapshot()
+        if not data['phases']:
+            return
+        print(f"\n⏱️  TIEMPO POR FASE ({data['run_seconds']:.1f} s en total):")
+        print("-" * 60)
+        for entry in sorted(data['phases'], key=lambda e: e['total_seconds'], reverse=True)[:top]:
+            share = entry.get('share_of_run', 0) * 100
+            print(f"   {entry['phase']:<20} {entry['total_seconds']:>9.1f} s  {share:5.1f}%  ({entry['count']} veces)")
+        avoided = self.counter_value('fetches_avoided')
+        if avoided:
+            print(f"   🔗 Descargas evitadas por URLs equivalentes: {avoided}")
+        self.print_circuit_summary()
+
+    def print_circuit_summary(self):
+        """Cambios de estado del cortocircuito por host (``mercadoscript.circuit``)"""
+        hosts = sorted({dict(labels)['host'] for (name, labels) in self.counters
+                        if name in ('circuit_transitions', 'circuit_rejected')})
+        for host in hosts:
+            opened = self.counter_value('circuit_transitions', host=host, state='open')
+            closed = self.counter_value('circuit_transitions', host=host, state='closed')
+            rejected = self.counter_value('circuit_rejected', host=host)
+            print(f"   ⚡ Circuito de {host}: abierto {opened} veces, recuperado {closed}, "
+                  f"{rejected} descargas rechazadas al instante")
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Servidor local: /metrics (Prometheus) y /metrics.json"""
+
+    daemon_threads = True
+
+    def __init__(self, registry, host='127.0.0.1', port=9108):
+        self.registry = registry
+        super().__init__((host, port), _MetricsRequestHandler)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/metrics':
+            body, content_type = self.server.registry.to_prometheus(), 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body, content_type = self.server.registry.to_json(), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve(port, host='127.0.0.1', metrics_registry=None):
+    """Servir las métricas en vivo en un hilo de fondo"""
+    server = MetricsServer(metrics_registry or registry, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"📈 Métricas en vivo en http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def add_metrics_arguments(parser):
+    """Opciones de línea de comandos comunes a todos los scrapers"""
+    parser.add_argument('--metrics-json', help="Archivo JSON de métricas (por defecto metricas_<retailer>.json)")
+    parser.add_argument('--metrics-prom', help="Archivo Prometheus (por defecto metricas_<retailer>.prom)")
+    parser.add_argument('--metrics-port', type=int, help="Servir métricas en vivo en este puerto local")
+
+
+def start(args, retailer):
+    """Iniciar la medición de una ejecución según las opciones de línea de comandos"""
+    registry.start_run(retailer)
+    if getattr(args, 'metrics_port', None):
+        return serve(args.metrics_port)
+    return None
+
+
+def finish(args, server=None):
+    """Cerrar la ejecución: resumen en consola y exportación"""
+    registry.finish_run()
+    retailer = registry.retailer or 'run'
+    registry.print_summary()
+    registry.export(
+        getattr(args, 'metrics_json', None) or f'metricas_{retailer}.json',
+        getattr(args, 'metrics_prom', None) or f'metricas_{retailer}.prom',
+    )
+    if server:
+        server.shutdown()
+
+
+# Registro global del proceso
+registry = MetricsRegistry()
+span = registry.span
+category_context = registry.category_context
+increment = registry.increment
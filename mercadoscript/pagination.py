@@ -0,0 +1,133 @@
+"""Generación predictiva de las URLs de paginación.
+
+Los enlaces de paginación visibles en la primera página suelen cubrir solo
+las páginas 2 y 3. Este módulo reconoce el esquema de paginación a partir de
+esos enlaces (``?p=N`` de Magento, ``?page=N`` de VTEX/Shopify, ``/page/N/``
+de WordPress o parámetros de desplazamiento como ``?offset=24``) y lee el
+texto de total de resultados ("Mostrando 1-24 de 356 productos") para
+generar de una vez las URLs de todas las páginas de la categoría, que así
+pueden cargarse en paralelo.
+
+Si el texto no trae total, se generan páginas hasta el máximo permitido y el
+llamador corta en la primera que llegue vacía o repetida (los sitios que
+devuelven la última página para números fuera de rango). Si el listado no
+tiene elemento de total (``page_text=None``), solo se usan los enlaces
+visibles.
+"""
+import math
+import re
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from mercadoscript.urls import unique_urls
+
+PAGE_PARAMS = ('p', 'page', 'pagina', 'pg', 'paged')
+OFFSET_PARAMS = ('offset', 'start', 'from', '_from', 'desde')
+PATH_PAGE_PATTERN = re.compile(r'/(page|pagina)/(\d+)/?$', re.I)
+
+# "Mostrando 1-24 de 356", "Artículos 1 - 12 de 150", "Showing 1–24 of 356 results"
+RANGE_TOTAL_PATTERN = re.compile(
+    r'(\d[\d.,]*)\s*[-–a]\s*(\d[\d.,]*)\s+(?:de|of)\s+(\d[\d.,]*)', re.I
+)
+# "356 productos", "356 resultados", "356 artículos encontrados"
+COUNT_TOTAL_PATTERN = re.compile(
+    r'(\d[\d.,]*)\s+(?:productos?|resultados?|art[íi]culos?|items?|results?)\b', re.I
+)
+
+
+def _to_int(text):
+    return int(re.sub(r'[.,]', '', text))
+
+
+def set_query_param(url, key, value):
+    """Devolver ``url`` con el parámetro ``key`` fijado a ``value``"""
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k != key]
+    query.append((key, str(value)))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+class PaginationScheme:
+    """Cómo se construye la URL de la página N de una categoría"""
+
+    def __init__(self, kind, param=None, step=1):
+        self.kind = kind      # 'page', 'offset' o 'path'
+        self.param = param
+        self.step = step      # productos por página en los esquemas de desplazamiento
+
+    def url_for(self, base_url, page):
+        parsed = urlparse(base_url)
+        if self.kind == 'path':
+            path = PATH_PAGE_PATTERN.sub('', parsed.path).rstrip('/')
+            return urlunparse(parsed._replace(path=f"{path}/{self.param}/{page}/"))
+
+        value = page if self.kind == 'page' else (page - 1) * self.step
+        return set_query_param(base_url, self.param, value)
+
+    def __repr__(self):
+        return f"PaginationScheme({self.kind!r}, {self.param!r}, step={self.step})"
+
+
+def detect_scheme(link_urls):
+    """Reconocer el esquema de paginación a partir de los enlaces visibles"""
+    offsets = {}
+    for url in link_urls:
+        parsed = urlparse(url)
+        match = PATH_PAGE_PATTERN.search(parsed.path)
+        if match:
+            return PaginationScheme('path', match.group(1))
+        for key, value in parse_qsl(parsed.query):
+            if not value.isdigit():
+                continue
+            if key.lower() in PAGE_PARAMS:
+                return PaginationScheme('page', key)
+            if key.lower() in OFFSET_PARAMS and int(value) > 0:
+                offsets.setdefault(key, []).append(int(value))
+
+    for key, values in offsets.items():
+        # El paso es el menor desplazamiento visible (el de la página 2)
+        return PaginationScheme('offset', key, step=min(values))
+    return None
+
+
+def total_results(text):
+    """Total de resultados y tamaño de página anunciados en el texto, si aparecen"""
+    match = RANGE_TOTAL_PATTERN.search(text)
+    if match:
+        first, last, total = (_to_int(g) for g in match.groups())
+        if 0 < first <= last <= total:
+            return total, last - first + 1
+    match = COUNT_TOTAL_PATTERN.search(text)
+    if match:
+        return _to_int(match.group(1)), None
+    return None, None
+
+
+def predict_page_urls(current_url, link_urls, page_text='', per_page=None, max_pages=50):
+    """URLs de las páginas 2..N de una categoría.
+
+    ``link_urls`` son los enlaces de paginación visibles en la página 1,
+    ``page_text`` el texto del elemento con el total de resultados (``None``
+    si la página no lo tiene) y ``per_page`` el número de productos extraídos
+    de ella (se usa si el texto no anuncia el tamaño de página). Sin esquema
+    reconocible o sin elemento de total se devuelven los enlaces visibles tal
+    cual.
+    """
+    link_urls = unique_urls([urljoin(current_url, url) for url in link_urls], exclude=[current_url])
+    scheme = detect_scheme(link_urls)
+    if scheme is None or page_text is None:
+        return link_urls[:max_pages - 1]
+
+    total, announced_per_page = total_results(page_text)
+    if scheme.kind == 'offset':
+        scheme.step = announced_per_page or scheme.step
+        per_page = scheme.step
+    else:
+        per_page = announced_per_page or per_page
+
+    # Un total menor que la propia página 1 es otro número ("1 producto en el carrito")
+    if total and per_page and total >= per_page:
+        pages = min(max_pages, math.ceil(total / per_page))
+    else:
+        # Sin total: generar hasta el máximo; el llamador para en la primera página vacía
+        pages = max_pages
+    return [scheme.url_for(current_url, page) for page in range(2, pages + 1)]
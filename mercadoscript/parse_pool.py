@@ -0,0 +1,209 @@
+"""Etapa de parseo en un pool de procesos, desacoplada de la descarga.
+
+El parseo del HTML y las heurísticas de extracción son Python puro y
+ligado a CPU; en el hilo que maneja Chrome o espera a la red no se solapan
+con la descarga y usan un solo núcleo. ``ParsePool`` recibe el HTML crudo
+de los descargadores y ejecuta la función de extracción de cada scraper en
+un pool de procesos; los resultados vuelven en el orden de las páginas.
+
+Las funciones de extracción son funciones de módulo (``picklables``) con la
+firma ``funcion(html, clave, *args)`` y devuelven solo datos planos
+(diccionarios de ``str``). Las páginas grandes (``--shm-threshold``) se
+entregan por memoria compartida: el proceso principal copia los bytes una
+vez a un segmento y el trabajador lo lee sin pasar el HTML por la tubería
+del pool. El segmento se libera al completarse (o cancelarse) la página.
+
+Los spans y contadores de ``mercadoscript.metrics`` que se registran en el
+trabajador se devuelven con el resultado y se suman al registro del proceso
+principal, así que el resumen de fases sigue completo.
+
+Con ``--parse-workers 0`` (por defecto) todo se ejecuta en el hilo que
+llama, igual que antes; ``--parse-workers -1`` usa un proceso por núcleo.
+Las páginas que ya llegan extraídas (``dom_extract.DomPage``, no HTML) se
+procesan siempre en línea: no hay nada que parsear.
+
+Uso típico::
+
+    with closing(self.parse_pool.ordered(self.prefetcher.pages(urls), parse_listing_page, site, category)) as pages:
+        for url, result in pages:
+            ...
+"""
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from mercadoscript import metrics
+
+logger = logging.getLogger(__name__)
+
+SHM_THRESHOLD = 64 * 1024
+
+
+def add_parse_pool_arguments(parser):
+    """Opciones de línea de comandos comunes a todos los scrapers"""
+    parser.add_argument('--parse-workers', type=int, default=0, metavar='N',
+                        help="Procesos que parsean y extraen en paralelo (0 = en el hilo del scraper, "
+                             "-1 = uno por núcleo)")
+    parser.add_argument('--shm-threshold', type=int, default=SHM_THRESHOLD // 1024, metavar='KB',
+                        help="Páginas a partir de este tamaño se entregan por memoria compartida")
+
+
+def pool_from_args(args):
+    """``ParsePool`` según las opciones de línea de comandos"""
+    return ParsePool(getattr(args, 'parse_workers', 0),
+                     getattr(args, 'shm_threshold', SHM_THRESHOLD // 1024) * 1024)
+
+
+class _SharedPage:
+    """Referencia a un HTML en memoria compartida (lo único que viaja por la tubería)"""
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __getstate__(self):
+        return (self.name, self.size)
+
+    def __setstate__(self, state):
+        self.name, self.size = state
+
+
+def _read_page(page):
+    if not isinstance(page, _SharedPage):
+        return page
+    segment = shared_memory.SharedMemory(name=page.name)
+    try:
+        view = segment.buf[:page.size]
+        try:
+            return str(view, 'utf-8')
+        finally:
+            view.release()
+    finally:
+        segment.close()
+
+
+def _run_job(function, page, key, args, retailer, category):
+    """Ejecutar una extracción en el trabajador, con sus métricas aparte"""
+    metrics.registry.reset()
+    metrics.registry.retailer = retailer
+    with metrics.category_context(category):
+        result = function(_read_page(page), key, *args)
+    registry = metrics.registry
+    phases = [(phase, stat.total, stat.count) for (_, phase), stat in registry.by_phase.items()]
+    counters = [(name, labels, value) for (name, labels), value in registry.counters.items()]
+    return result, phases, counters
+
+
+class ParsePool:
+    """Pool de procesos para parsear y extraer; ``workers=0`` ejecuta en línea"""
+
+    def __init__(self, workers=0, shm_threshold=SHM_THRESHOLD, window=None):
+        if workers < 0:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.shm_threshold = shm_threshold
+        # Páginas en vuelo en ``ordered``: suficientes para ocupar todos los procesos
+        self.window = window or max(1, 2 * workers)
+        self._executor = None
+        if workers:
+            # spawn: los scrapers tienen hilos (prefetch, métricas, Selenium) y fork no es seguro
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f"🧵 Parseo en {workers} procesos (memoria compartida desde {shm_threshold // 1024} KB)")
+
+    def submit(self, function, html, key, *args):
+        """Enviar una página al pool; devuelve un ``Future`` de ``(resultado, fases, contadores)``"""
+        if not isinstance(html, (str, bytes)):
+            future = Future()
+            future.set_result((function(html, key, *args), (), ()))
+            return future
+        page, segment = html, None
+        data = html.encode('utf-8') if isinstance(html, str) else html
+        if len(data) >= self.shm_threshold:
+            segment = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+            segment.buf[:len(data)] = data
+            page = _SharedPage(segment.name, len(data))
+            metrics.increment('shm_pages')
+        elif not isinstance(html, str):
+            page = data.decode('utf-8')
+        future = self._executor.submit(_run_job, function, page, key, args, metrics.registry.retailer,
+                                       metrics.registry.current_category)
+        if segment is not None:
+            future.add_done_callback(lambda _, segment=segment: _release(segment))
+        return future
+
+    def _collect(self, future):
+        with metrics.span('parse_wait'):
+            result, phases, counters = future.result()
+        category = metrics.registry.current_category
+        for phase, total, count in phases:
+            for _ in range(count):
+                metrics.registry.record(phase, total / count, category)
+        for name, labels, value in counters:
+            metrics.increment(name, value, **dict(labels))
+        return result
+
+    def parse(self, function, html, key, *args):
+        """Extraer una sola página y esperar el resultado"""
+        if not self._executor or not isinstance(html, (str, bytes)):
+            return function(html, key, *args)
+        return self._collect(self.submit(function, html, key, *args))
+
+    def ordered(self, pages, function, *args):
+        """Generador de ``(clave, resultado)`` para ``(clave, html)``, en el orden de ``pages``.
+
+        Mientras se consume una página ya se están descargando las siguientes
+        y parseando hasta ``window`` en el pool. Las páginas sin HTML dan
+        ``None``. Al cerrar el generador se cancelan las pendientes.
+        """
+        pages = iter(pages)
+        if not self._executor:
+            try:
+                for key, html in pages:
+                    yield key, (function(html, key, *args) if html else None)
+            finally:
+                _close(pages)
+            return
+
+        pending = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.window:
+                    item = next(pages, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    key, html = item
+                    pending.append((key, self.submit(function, html, key, *args) if html else None))
+                if not pending:
+                    return
+                key, future = pending.popleft()
+                yield key, (self._collect(future) if future else None)
+        finally:
+            for _, future in pending:
+                if future:
+                    future.cancel()
+            _close(pages)
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _release(segment):
+    try:
+        segment.close()
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _close(iterator):
+    close = getattr(iterator, 'close', None)
+    if close:
+        close()
@@ -0,0 +1,149 @@
+"""Prefetch en tubería de las páginas de paginación de una categoría.
+
+Cuando ya se conocen los enlaces de paginación, las páginas 2..N se cargan
+en hilos aparte, cada uno con su propio navegador, mientras el hilo
+principal extrae los productos de las páginas anteriores. La ventana de
+anticipación está acotada (``lookahead``): nunca hay más de ese número de
+páginas cargadas o en vuelo esperando a ser extraídas.
+
+Las páginas se entregan en orden. Si una página no da productos, el
+llamador corta el bucle y las cargas pendientes se cancelan: las que aún no
+empezaron no llegan a ejecutarse y las que están en curso se descartan.
+
+Uso típico::
+
+    with closing(self.prefetcher.pages(urls)) as pages:
+        for url, soup in pages:
+            products = extract(soup)
+            if not products:
+                break
+
+Con ``lookahead=0`` las páginas se cargan una a una en el hilo que llama,
+igual que el recorrido secuencial de siempre.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from mercadoscript import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def add_prefetch_arguments(parser):
+    """Opciones de línea de comandos comunes a los scrapers con paginación"""
+    parser.add_argument('--prefetch', type=int, default=0, metavar='N',
+                        help="Páginas a cargar por adelantado en navegadores paralelos (0 = secuencial)")
+
+
+class DriverPool:
+    """Un navegador por hilo, creado bajo demanda con ``factory``"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            with metrics.span('driver_startup'):
+                driver = self.factory()
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error cerrando navegador de prefetch: {e}")
+
+
+class PagePrefetcher:
+    """Carga anticipada y acotada de páginas, entregadas en orden.
+
+    ``fetch(url)`` carga una página en el hilo principal (modo secuencial);
+    ``parallel_fetch(url)`` la carga desde un hilo de la tubería y debe usar
+    un navegador propio de ese hilo. ``min_interval`` es la pausa mínima
+    entre el inicio de dos cargas (cortesía con el servidor).
+    """
+
+    def __init__(self, fetch, parallel_fetch=None, lookahead=0, min_interval=0.0):
+        self.fetch = fetch
+        self.parallel_fetch = parallel_fetch or fetch
+        self.lookahead = max(0, lookahead)
+        self.min_interval = min_interval
+        self._executor = None
+        if self.lookahead:
+            self._executor = ThreadPoolExecutor(max_workers=self.lookahead, thread_name_prefix='prefetch')
+        self._rate_lock = threading.Lock()
+        self._next_start = 0.0
+
+    def pages(self, urls):
+        """Generador de ``(url, resultado)`` en el orden de ``urls``"""
+        if not self._executor:
+            yield from self._sequential(urls)
+            return
+
+        cancelled = threading.Event()
+        category = metrics.registry.current_category
+        pending = deque()
+        remaining = iter(urls)
+
+        def submit_next():
+            url = next(remaining, None)
+            if url is not None:
+                pending.append((url, self._executor.submit(self._run, url, category, cancelled)))
+
+        try:
+            for _ in range(self.lookahead):
+                submit_next()
+            while pending:
+                url, future = pending.popleft()
+                result = future.result()
+                submit_next()
+                yield url, result
+        finally:
+            cancelled.set()
+            dropped = sum(1 for _, future in pending if future.cancel() or future.running())
+            if dropped:
+                metrics.increment('prefetch_cancelled', dropped)
+                logger.info(f"   ⏹️  {dropped} páginas anticipadas canceladas")
+
+    def _sequential(self, urls):
+        for i, url in enumerate(urls):
+            if i and self.min_interval:
+                with metrics.span('politeness'):
+                    time.sleep(self.min_interval)
+            yield url, self.fetch(url)
+
+    def _run(self, url, category, cancelled):
+        if cancelled.is_set():
+            return None
+        self._wait_turn()
+        if cancelled.is_set():
+            return None
+        metrics.increment('prefetched_pages')
+        with metrics.category_context(category):
+            return self.parallel_fetch(url)
+
+    def _wait_turn(self):
+        with self._rate_lock:
+            delay = self._next_start - time.time()
+            self._next_start = max(self._next_start, time.time()) + self.min_interval
+        if delay > 0:
+            with metrics.span('politeness'):
+                time.sleep(delay)
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,189 @@
+"""Comprobación previa del entorno del navegador, con caché.
+
+Localiza Chrome y chromedriver (rutas y versiones) y guarda el resultado en
+``.cache/preflight.json``. Las siguientes ejecuciones reutilizan la caché
+mientras el PATH, la versión de Selenium y los binarios detectados (ruta y
+fecha de modificación) no cambien, así que ni se lanza ``--version`` ni se
+ejecuta Selenium Manager en cada arranque.
+
+Con la ruta de chromedriver ya conocida, ``mercadoscript.browser`` crea el
+``Service`` directamente y Selenium no vuelve a resolver el driver.
+"""
+import glob
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join('.cache', 'preflight.json')
+DEFAULT_TTL_HOURS = 24
+
+CHROME_COMMANDS = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+CHROME_PATHS = (
+    r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+    r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    os.path.expandvars(r'%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe'),
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+# Drivers que Selenium Manager ya descargó en ejecuciones anteriores
+SELENIUM_CACHE_GLOB = os.path.join(os.path.expanduser('~'), '.cache', 'selenium', 'chromedriver', '*', '*',
+                                   'chromedriver*')
+
+VERSION_PATTERN = re.compile(r'(\d+(?:\.\d+){1,3})')
+
+
+def selenium_version():
+    try:
+        return metadata.version('selenium')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def find_chrome():
+    for command in CHROME_COMMANDS:
+        path = shutil.which(command)
+        if path:
+            return path
+    for path in CHROME_PATHS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def find_chromedriver():
+    path = shutil.which('chromedriver')
+    if path:
+        return path
+    cached = sorted(glob.glob(SELENIUM_CACHE_GLOB), key=os.path.getmtime, reverse=True)
+    return cached[0] if cached else None
+
+
+def binary_version(path, timeout=10):
+    """Versión de un binario a partir de ``--version``"""
+    if not path:
+        return None
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"No se pudo obtener la versión de {path}: {e}")
+        return None
+    match = VERSION_PATTERN.search(result.stdout or result.stderr or '')
+    return match.group(1) if match else None
+
+
+def resolve_with_selenium_manager():
+    """Resolver el driver con Selenium Manager (descarga si hace falta)"""
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        paths = SeleniumManager().binary_paths(['--browser', 'chrome'])
+    except Exception as e:
+        logger.warning(f"⚠️ Selenium Manager no pudo resolver chromedriver: {e}")
+        return None, None
+    return paths.get('driver_path') or None, paths.get('browser_path') or None
+
+
+def _fingerprint():
+    return {'path': os.environ.get('PATH', ''), 'selenium': selenium_version(), 'python': sys.version.split()[0]}
+
+
+def _binaries_unchanged(info):
+    for key in ('chrome_path', 'driver_path'):
+        path = info.get(key)
+        if not path:
+            continue
+        try:
+            if os.path.getmtime(path) != info['mtimes'].get(key):
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def detect(use_selenium_manager=True):
+    """Detectar Chrome y chromedriver sin caché"""
+    chrome_path = find_chrome()
+    driver_path = find_chromedriver()
+    if not driver_path and use_selenium_manager and selenium_version():
+        driver_path, browser_path = resolve_with_selenium_manager()
+        chrome_path = chrome_path or browser_path
+
+    info = {
+        'platform': platform.platform(),
+        'fingerprint': _fingerprint(),
+        'chrome_path': chrome_path,
+        'chrome_version': binary_version(chrome_path),
+        'driver_path': driver_path,
+        'driver_version': binary_version(driver_path),
+        'detected_at': time.time(),
+        'mtimes': {},
+    }
+    for key in ('chrome_path', 'driver_path'):
+        if info[key]:
+            info['mtimes'][key] = os.path.getmtime(info[key])
+    return info
+
+
+def load_cached(cache_path=CACHE_PATH, ttl_hours=DEFAULT_TTL_HOURS):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - info.get('detected_at', 0) > ttl_hours * 3600:
+        return None
+    if not info.get('driver_path'):
+        # Detección incompleta: repetirla por si ya se instaló Chrome o el driver
+        return None
+    if info.get('fingerprint') != _fingerprint() or not _binaries_unchanged(info):
+        return None
+    return info
+
+
+def save(info, cache_path=CACHE_PATH):
+    directory = os.path.dirname(cache_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+def preflight(refresh=False, cache_path=CACHE_PATH, ttl_hours=DEFAULT_TTL_HOURS):
+    """Información del entorno, desde la caché si sigue siendo válida"""
+    if not refresh:
+        info = load_cached(cache_path, ttl_hours)
+        if info:
+            info['cached'] = True
+            return info
+    info = detect()
+    save(info, cache_path)
+    info['cached'] = False
+    return info
+
+
+def major(version):
+    return version.split('.', 1)[0] if version else None
+
+
+def problems(info):
+    """Problemas detectados, como mensajes legibles"""
+    found = []
+    if not info.get('fingerprint', {}).get('selenium'):
+        found.append("Selenium no está instalado")
+    if not info.get('chrome_path'):
+        found.append("Chrome no está instalado o no está en el PATH")
+    if not info.get('driver_path'):
+        found.append("chromedriver no encontrado (Selenium Manager intentará descargarlo)")
+    chrome_major, driver_major = major(info.get('chrome_version')), major(info.get('driver_version'))
+    if chrome_major and driver_major and chrome_major != driver_major:
+        found.append(f"Versiones incompatibles: Chrome {chrome_major} y chromedriver {driver_major}")
+    return found
@@ -0,0 +1,984 @@
+"""Perfiles declarativos de cada supermercado, compilados al arrancar.
+
+Las reglas de cada sitio estaban repartidas en funciones de los scripts:
+``es_categoria_valida`` de Nacional y Bravo, ``is_potential_category`` de
+Jumbo, ``is_valid_category_url`` de Sirena, y las listas de selectores de
+tarjeta, nombre, precio y paginación de cada extractor. Cada script
+repetía además el mismo recorrido con pequeñas divergencias (el tope de
+precio de Jumbo aplicado a todos, la comprobación de contenedor de Sirena
+olvidada en otro). Ahora el recorrido es uno (``mercadoscript.engine``) y
+lo que distingue a un sitio es solo su perfil.
+
+``PROFILES`` declara por sitio:
+
+* ``fetch``: backend (``http`` o ``browser``) y cómo cargar una página
+  (reintentos, esperas, pausas, scroll, texto mínimo, opciones de Chrome);
+* ``categories``: filtros de enlaces de categoría (términos excluidos en el
+  texto o la URL, textos exactos excluidos, longitud, términos de
+  supermercado, pistas en la URL, prefijo o host obligatorio) y, en Jumbo,
+  los departamentos con sus palabras clave;
+* ``discovery``: qué parte del sitemap usar y las fuentes de enlaces de la
+  portada en orden de prioridad (selectores, términos en el texto o la
+  URL, departamentos), y las subcategorías de las páginas de categoría;
+* ``cards``, ``card_strategy``, ``containers``, ``card_fallback``: selectores
+  de tarjeta, cómo combinarlos y, si el sitio lo necesita, la heurística de
+  contenedores o el barrido alternativo;
+* ``name``, ``price`` y sus reglas: selectores de nombre
+  (``selector@atributo`` para leer un atributo) y precio, validación del
+  nombre, patrones de precio, rango razonable y formato; también son las
+  reglas de la extracción en el navegador (``dom_extract``);
+* ``pagination``: selectores de paginación y del total de resultados,
+  filtros de texto, páginas numeradas o adivinadas y tamaño de página;
+* ``crawl``: páginas y categorías máximas, descarga adelantada, pausas y
+  deduplicación;
+* ``output``: CSV de salida y sus columnas;
+* ``readiness`` y ``dom``: condiciones de página lista y reglas adicionales
+  de ``dom_extract``.
+
+``profile(site)`` compila una vez cada perfil en un ``SiteProfile``: cada
+lista de términos pasa a una sola expresión regular (alternación escapada,
+misma semántica que ``in``) y cada lista de patrones a su regex.
+
+Uso::
+
+    from mercadoscript.profiles import profile
+
+    nacional = profile('nacional')
+    nacional.is_category('https://supermercadosnacional.com/lacteos', 'Lácteos')
+    nacional.extract_products(soup, 'https://supermercadosnacional.com/lacteos.html')
+"""
+import re
+from functools import lru_cache
+from urllib.parse import urljoin
+
+from mercadoscript import pagination
+from mercadoscript.enrichment import DETAIL_FIELDS, product_url
+from mercadoscript.readiness import Readiness, grid, present
+from mercadoscript.urls import canonical_url
+
+BACKENDS = ('http', 'browser')
+# most: el selector con más tarjetas; first: el primero que da productos; all: la unión de todos
+CARD_STRATEGIES = ('most', 'first', 'all')
+
+# Términos de supermercado comunes a Nacional y Bravo
+GROCERY_TERMS = (
+    'carne', 'res', 'pollo', 'cerdo', 'pescado', 'mariscos', 'embutidos',
+    'leche', 'queso', 'yogurt', 'lácteos', 'huevos',
+    'fruta', 'vegetal', 'verdura', 'hortalizas', 'vegetales', 'frutas',
+    'pan', 'panadería', 'cereales', 'arroz', 'pasta', 'granos',
+    'bebida', 'agua', 'jugo', 'café', 'té', 'vino', 'cerveza', 'licores',
+    'limpieza', 'detergente', 'jabón', 'hogar', 'aseo',
+    'shampoo', 'cuidado personal', 'higiene', 'pañal',
+    'sal', 'azúcar', 'aceite', 'condimento', 'especias', 'salsa',
+    'conserva', 'enlatado', 'mermelada', 'congelado', 'helado',
+    'mascota', 'gato', 'perro', 'despensa', 'abarrotes', 'snacks', 'dulces',
+)
+ACCOUNT_TERMS = (
+    'mi cuenta', 'mi carrito', 'mis listas', 'mis ordenes', 'cerrar sesión', 'iniciar sesión', 'crear cuenta',
+    'nuestras tiendas', 'políticas', 'retiro en tienda', 'ayuda', 'contacto', 'inicio', 'soporte',
+    'trabaja con nosotros', 'javascript:', '#', 'mailto:', 'tel:',
+)
+PRICE_TEXT = r'(RD)?\$\s*\d'
+
+# Elementos habituales con el total de resultados del listado (Magento, WooCommerce, VTEX)
+RESULT_COUNT = [
+    '.toolbar-amount', '.woocommerce-result-count', '[class*="result-count"]', '[class*="results-count"]',
+    '[class*="total-results"]', '[class*="product-count"]', '[class*="products-count"]',
+]
+
+# Departamentos de Jumbo: palabras clave -> nombre normalizado de la categoría
+JUMBO_DEPARTMENTS = {
+    "Supermercado": ["supermercado", "mercado", "alimentos", "comida", "groceries", "abarrotes", "food"],
+    "Belleza y Salud": ["belleza", "salud", "cuidado personal", "higiene", "beauty", "health", "cosmetic"],
+    "Hogar": ["hogar", "cocina", "limpieza", "muebles", "home", "casa", "furniture"],
+    "Electrodomésticos": ["electrodomésticos", "electrodomestico", "electro", "appliances", "electronics"],
+    "Ferretería": ["ferretería", "ferreteria", "herramientas", "tools", "hardware", "construccion"],
+    "Deportes": ["deportes", "fitness", "ejercicio", "sports", "deporte"],
+    "Bebés": ["bebés", "bebes", "niños", "niñas", "baby", "kids", "infantil"],
+    "Oficina": ["oficina", "útiles", "escolares", "office", "school", "papeleria"],
+    "Juguetería": ["juguetes", "juegos", "toys", "games", "jugueteria"],
+    "Tecnología": ["tecnologia", "tech", "computacion", "celulares", "phones"],
+    "Ropa": ["ropa", "vestir", "clothing", "fashion", "textil"],
+    "Automóvil": ["auto", "carro", "vehiculo", "automotive", "car"]
+}
+
+# Secciones y marcas de Sirena (tienda de electrodomésticos y hogar)
+SIRENA_KEYWORDS = [
+    'electrodomésticos', 'electrodomestico', 'electrónicos', 'electronico',
+    'hogar', 'cocina', 'refrigeración', 'refrigeracion', 'lavado',
+    'climatización', 'climatizacion', 'audio', 'video', 'televisores',
+    'televisor', 'tv', 'celulares', 'celular', 'móviles', 'moviles',
+    'computadoras', 'computadora', 'laptop', 'tablets', 'tablet',
+    'gaming', 'juegos', 'muebles', 'decoración', 'decoracion',
+    'jardín', 'jardin', 'herramientas', 'ferretería', 'ferreteria',
+    'deportes', 'fitness', 'salud', 'belleza', 'cuidado personal',
+    'línea blanca', 'linea blanca', 'pequeños electrodomésticos',
+    'neveras', 'refrigeradores', 'lavadoras', 'secadoras', 'estufas',
+    'hornos', 'microondas', 'aires acondicionados', 'ventiladores',
+    'samsung', 'lg', 'whirlpool', 'mabe', 'frigidaire', 'electrolux',
+]
+SIRENA_BRANDS = ['samsung', 'lg', 'whirlpool', 'mabe', 'frigidaire', 'electrolux', 'haier']
+
+PROFILES = {
+    'sirena': {
+        'label': 'Sirena',
+        'base_url': 'https://www.sirena.do/',
+        'fetch': {
+            'backend': 'browser',
+            'retries': 3,
+            'wait': {'home': 30, 'category': 15},
+            'retry_pause': 3,
+            'error_pause': 5,
+            'scroll': 'progressive',
+            # Texto visible mínimo de una página útil si la condición de página lista no se cumplió
+            'min_text': 1000,
+            'implicit_wait': 10,
+            'chrome_args': ['--disable-images', '--disable-javascript-harmony-shipping'],
+        },
+        'categories': {
+            'url_prefix': 'https://www.sirena.do/',
+            'exclude_url': [
+                'javascript:', 'mailto:', 'tel:', '#', '/account', '/login', '/register', '/cart', '/checkout',
+                '/contact', '/about', '/help', '/support', '/terms', '/privacy', '/return', '/shipping', '/faq',
+            ],
+            'exclude_text': [
+                'inicio', 'home', 'contacto', 'ayuda', 'cuenta', 'carrito', 'login', 'registrar', 'buscar',
+                'search', 'ver todo', 'más',
+            ],
+            'length': (3, 80),
+        },
+        'discovery': {
+            # Las hojas cubren el catálogo; los padres solo repetirían productos
+            'sitemap': 'leaves',
+            'sources': [
+                {'source': 'Navegación', 'links': [
+                    f'{container} a[href]' for container in (
+                        'nav', 'header nav', '.navigation', '.nav', '.menu', '[class*="nav"]', '[class*="menu"]',
+                        '[id*="nav"]', '[id*="menu"]', '.header', '.top-menu', '.main-menu', '.primary-nav',
+                    )
+                ]},
+                {'source': 'Sidebar', 'links': [
+                    f'{container} a[href]' for container in (
+                        '.sidebar', '.side-nav', '.left-nav', '.category-menu', '[class*="sidebar"]',
+                        '[class*="category"]', '.filters', '.facets', '.refinements',
+                    )
+                ]},
+                {'source': 'Lista', 'links': [
+                    'ul li a[href]', 'ol li a[href]', '.category-list a[href]', '.product-categories a[href]',
+                    '[class*="category"] a[href]', '[class*="department"] a[href]',
+                ]},
+                {'source': 'Keyword Match', 'text': SIRENA_KEYWORDS},
+                {'source': 'URL Match', 'url': SIRENA_KEYWORDS},
+                {'source': 'Pattern Match', 'url': [
+                    '/categoria/', '/category/', '/departamento/', '/department/', '/seccion/', '/section/',
+                    '/productos/', '/products/', '/electrodomesticos', '/electronicos', '/hogar', '/cocina',
+                ]},
+                {'source': 'Breadcrumb', 'links': [
+                    '.breadcrumb a[href]', '.breadcrumbs a[href]', '[class*="breadcrumb"] a[href]',
+                    '.nav-path a[href]', '.page-path a[href]',
+                ]},
+            ],
+            'unique_names': True,
+        },
+        'cards': [
+            '.product', '.product-item', '.item', '.product-card', '[data-product]', '[data-item]',
+            '[class*="product"]', '.card', '.tile', '.box', '[class*="item"]', 'li[class*="product"]', 'article',
+            '.listing-item', '.grid-item', '.col', '[class*="col-"]',
+        ],
+        'card_strategy': 'all',
+        # Divs sin clase de tarjeta que aun así parecen un producto
+        'containers': {
+            'text_length': (5, 1000),
+            'image_text': 10,
+            'price': r'(?:rd\$|precio|\$)\s*[\d,]+',
+            'terms': ['samsung', 'lg', 'whirlpool', 'mabe', 'frigidaire'],
+            'markup': ['product', 'item', 'card'],
+            'exclude_markup': ['navigation', 'menu'],
+            'exclude_text': ['copyright', 'todos los derechos', 'política'],
+        },
+        'name': [
+            'h1', 'h2', 'h3', 'h4', 'a[title]@title', '[class*="product-name"]', '[class*="product-title"]',
+            '[class*="name"]', '[class*="title"]', 'img[alt]@alt',
+        ],
+        'name_length': (8, 200),
+        'name_exclude': [
+            'ver más', 'click here', 'loading', 'cargando', 'buscar', 'filtrar', 'ordenar', 'página', 'siguiente',
+            'anterior',
+        ],
+        # Solo números, comandos de la interfaz, números de página y navegación
+        'name_reject': [r'\d+$', r'(ver|click|buscar|filtrar)', r'(página|page)\s+\d+',
+                        r'(siguiente|next|anterior|prev)$'],
+        # Último recurso: una línea del texto de la tarjeta con una marca conocida
+        'name_lines': {'terms': SIRENA_BRANDS, 'length': (11, 149)},
+        'price': [],  # El precio se busca sobre el texto de la tarjeta
+        'price_patterns': [
+            r'RD\$\s*[\d,]+(?:\.\d{2})?',
+            r'\$\s*[\d,]+(?:\.\d{2})?',
+            r'Precio:\s*RD?\$?\s*[\d,]+(?:\.\d{2})?',
+            r'(?:^|\s)([\d,]{4,}(?:\.\d{2})?)(?:\s*(?:RD|pesos?)|$)',
+        ],
+        # Rango amplio: electrodomésticos de hasta dos millones de pesos
+        'price_range': (500, 2000000),
+        'no_price': 'Precio no disponible',
+        'pagination': {
+            'links': [
+                '.pagination a', '.pager a', '.page-numbers a', '[class*="pagination"] a', '[class*="pager"] a',
+                '.next', '.siguiente', '[rel="next"]',
+            ],
+            'numbered': r'\b[2-9]\b|\b1[0-9]\b',  # Páginas 2-19 en cualquier enlace
+            'total': RESULT_COUNT,
+        },
+        'crawl': {'max_pages': 2, 'page_interval': 3, 'pause': 5, 'dedupe': 'name'},
+        'output': {'file': 'sirena_productos_exhaustivo.csv', 'columns': ['nombre', 'precio', 'categoria'],
+                   'enriched': ['url', *DETAIL_FIELDS]},
+        # Menú de categorías en la portada y al menos una tarjeta de producto con precio
+        'readiness': {
+            'home': Readiness([present('nav a[href]', 'header a[href]', '.menu a[href]')], settle=3),
+            'category': Readiness([
+                grid(['.product', '.product-item', '.product-card', '[data-product]', 'li[class*="product"]',
+                      '[class*="product"]'], PRICE_TEXT),
+            ], settle=3),
+        },
+    },
+    'jumbo': {
+        'label': 'Jumbo',
+        'base_url': 'https://jumbo.com.do/',
+        'fetch': {
+            'backend': 'browser',
+            'retries': 2,
+            'wait': {'home': 12, 'category': 12},
+            'retry_pause': 2,
+            'error_pause': 2,
+            'scroll': 'nudge',
+            'min_text': 300,
+            'implicit_wait': 3,
+            'chrome_args': ['--disable-logging', '--disable-dev-tools'],
+        },
+        'categories': {
+            'exclude_text_terms': [
+                'login', 'cuenta', 'carrito', 'buscar', 'ayuda', 'contacto', 'facebook', 'twitter', 'instagram',
+                'newsletter', 'whatsapp',
+            ],
+            'include': [keyword for keywords in JUMBO_DEPARTMENTS.values() for keyword in keywords],
+            'include_url': ['categoria', 'category', 'departamento', 'department', 'seccion', 'section', '/c/',
+                            '/cat/'],
+            'departments': JUMBO_DEPARTMENTS,
+        },
+        'discovery': {
+            # Los departamentos son las raíces; sus hijas se recorren como subcategorías
+            'sitemap': 'roots',
+            'sources': [
+                {'source': 'Navegación', 'links': [
+                    'nav a', 'header nav a', '.navbar a', '.nav a', '.navigation a', '.main-menu a',
+                    '.primary-menu a', '.menu-principal a', '.header-menu a', '.top-menu a', '.main-nav a',
+                ]},
+                # Si el menú da pocas categorías, cualquier enlace con el nombre de un departamento
+                {'source': 'Departamento', 'departments': (4, 49), 'below': 8},
+            ],
+            'unique_names': True,
+            'department_names': True,
+            'subcategories': {
+                'links': [
+                    '.sidebar a', '.filters a', '.categories a', '.menu-lateral a', '.category-nav a',
+                    '.subcategory a', '[class*="filter"] a', '[class*="category"] a', '[class*="submenu"] a',
+                    '[class*="subcategory"] a',
+                    *(f'{tag}[class*="{keyword}"] a[href]' for tag in ('div', 'section')
+                      for keyword in ('category', 'filter', 'menu', 'nav')),
+                ],
+                'exclude': [
+                    'ver todo', 'ver más', 'mostrar todo', 'volver', 'home', 'página', 'siguiente', 'anterior',
+                    'filtro', 'casa cuesta',
+                ],
+                'length': (3, 80),
+                'limit': 15,
+            },
+        },
+        'cards': [
+            '[class*="product-item"]', '[class*="product-card"]', '[class*="item-product"]', '[class*="product"]',
+            '[data-product]', '[data-item]', '.card', '.tile', '[class*="card"]',
+        ],
+        'card_strategy': 'first',
+        # Sin tarjetas reconocibles: los primeros divs con imagen y título
+        'card_fallback': {'scan': 200, 'limit': 30, 'title': ['h1', 'h2', 'h3', 'h4', 'h5', 'span', 'a']},
+        'name': [
+            'h1', 'h2', 'h3', 'h4', 'h5', '[class*="name"]', '[class*="title"]', '[class*="product-name"]',
+            '[class*="item-name"]', '[data-name]', 'a[title]@title', 'img[alt]@alt', 'img[title]@title',
+        ],
+        'name_length': (4, 120),
+        'name_exclude': ['ver más', 'comprar', 'añadir', 'carrito', 'login', 'página', 'siguiente', 'filtro',
+                         'ordenar'],
+        'price': [
+            '[class*="price"]', '[class*="precio"]', '[class*="cost"]', '[data-price]', '.currency',
+            '[class*="amount"]',
+        ],
+        # El importe se normaliza a ``RD$1,234.00``; fuera del rango es otro número de la tarjeta
+        'price_format': 'amount',
+        'price_range': (1, 500000),
+        'no_price': 'Precio no disponible',
+        'pagination': {
+            'links': [
+                '.pagination a', '.pager a', '.page-nav a', '[class*="page"] a', '[class*="next"] a',
+                '.paginacion a', '.paginas a',
+            ],
+            'link_text': r'^\d+$|next|siguiente|más',
+            # Con parámetros en la URL, las páginas 2-5 aunque no haya enlaces
+            'guess': ('page', 5),
+            'total': RESULT_COUNT,
+        },
+        'crawl': {'max_pages': 5, 'page_interval': 1, 'pause': (2, 1), 'dedupe': 'name'},
+        'output': {'file': 'jumbo_productos_completo.csv', 'columns': ['nombre', 'precio', 'categoria'],
+                   'enriched': ['url', *DETAIL_FIELDS]},
+        'readiness': {
+            'home': Readiness([present('nav a[href]', 'header a[href]', '[class*="menu"] a[href]')]),
+            'category': Readiness([
+                grid(['[class*="product-item"]', '[class*="product-card"]', '[class*="item-product"]',
+                      '[class*="product"]'], PRICE_TEXT),
+            ]),
+        },
+        'dom': {'first_match': True},
+    },
+    'nacional': {
+        'label': 'Supermercados Nacional',
+        'base_url': 'https://supermercadosnacional.com/',
+        'fetch': {'backend': 'http'},
+        'categories': {
+            'exclude': [
+                'ver todo', 'ver todover todo', *ACCOUNT_TERMS, 'cuesta libros', 'juguetón', 'bebemundo',
+                'casa cuesta', 'jumbo', 'bonos ccn', 'entrenamiento', 'ofertas de la semana', 'exclusivo online',
+            ],
+            'length': (3, 50),
+            'include': GROCERY_TERMS,
+        },
+        'discovery': {
+            'sitemap': 'leaves',
+            'sources': [
+                {'source': 'Navegación', 'links': [
+                    '.nav a[href]', '.navigation a[href]', '.menu a[href]', 'nav a[href]', 'header a[href]',
+                    '.header a[href]', 'ul li a[href]', 'a[href]',
+                ]},
+            ],
+        },
+        'cards': [
+            '.product-item', '.product', '.item-product', '.producto', 'div[class*="product"]',
+            'li[class*="product"]', '.grid-item', '.product-card', '.item', '.card', 'article', '.catalog-item',
+        ],
+        'card_strategy': 'most',
+        'name': [
+            'a.product-item-link', '.product-name a', '.product-title', 'h1', 'h2', 'h3', 'h4', '.name', '.title',
+            'a[title]',
+        ],
+        'name_attrs': ['title', 'alt', 'data-name'],
+        'name_length': (3, 99),
+        'price': ['.price', '.precio', 'span[class*="price"]', '.cost', '.amount'],
+        'price_text': r'[$₡]|\d+[.,]\d+',
+        'price_patterns': [r'\$\s*\d+[.,]?\d*', r'₡\s*\d+[.,]?\d*', r'\d+[.,]\d+\s*[₡$]', r'\d{1,6}[.,]\d{2}'],
+        'no_price': 'Sin precio',
+        # Magento: el total está en la barra del listado (``Artículos 1-36 de 120``) y el
+        # tamaño de página se elige con ``product_list_limit``
+        'pagination': {
+            'links': ['.pages a[href]', '.pagination a[href]', 'a.next[href]'],
+            'total': ['.toolbar-amount'],
+            'page_size_param': 'product_list_limit',
+            'page_sizes': ['select.limiter-options option', '.limiter option'],
+        },
+        'crawl': {'max_pages': 50, 'prefetch': 4, 'page_interval': 0.5, 'pause': 1, 'merge': 'similar'},
+        'output': {
+            'file': 'inventario_nacional_{timestamp}.csv',
+            'columns': {'nombre': 'Nombre', 'precio': 'Precio', 'categorias': 'Categorias',
+                        'url_categoria': 'URL_Categoria'},
+            'enriched': {'url': 'URL_Producto', 'sku': 'SKU', 'codigo_barras': 'Codigo_Barras', 'tamano': 'Tamano',
+                         'marca': 'Marca', 'disponibilidad': 'Disponibilidad'},
+        },
+    },
+    'bravo': {
+        'label': 'Super Bravo',
+        'base_url': 'https://www.superbravo.com.do/',
+        # Super Bravo sirve un certificado que requests no valida
+        'fetch': {'backend': 'http', 'verify': False, 'headers': {'Accept-Encoding': 'gzip, deflate, br'}},
+        'categories': {
+            'host': 'superbravo.com.do',
+            'exclude': [
+                'ver todo', 'ver mas', *ACCOUNT_TERMS, 'sucursales', 'home', 'login', 'register', 'cart',
+                'checkout', 'search', 'buscar', 'facebook', 'instagram', 'twitter',
+            ],
+            'length': (2, 80),
+            'include': [
+                *GROCERY_TERMS, 'mantequilla', 'lavandería', 'farmacia', 'alimento', 'comida para mascota',
+                'chocolate', 'categoria', 'category', 'departamento', 'seccion', 'productos',
+            ],
+        },
+        'discovery': {
+            'sitemap': 'leaves',
+            'sources': [
+                {'source': 'Navegación', 'links': [
+                    '.main-menu a[href]', '.navbar a[href]', '.nav-menu a[href]', '.category-menu a[href]',
+                    '.categories a[href]', 'nav a[href]', 'header a[href]', '.navigation a[href]', '.menu a[href]',
+                    'ul li a[href]', '.dropdown-menu a[href]', '.submenu a[href]', 'a[href*="categoria"]',
+                    'a[href*="category"]', 'a[href*="productos"]', 'a[href]',
+                ]},
+            ],
+        },
+        'cards': [
+            'div[class*="product"]', 'li[class*="product"]', 'article[class*="product"]', 'div[class*="item"]',
+            'li[class*="item"]', 'div[class*="card"]', '.grid-item', '.list-item', '.catalog-item', '.shop-item',
+            '.product-item', '.product-card', '.product-box', '.item-box', '.item', '.card', '.box', 'article',
+            '.entry', 'div[data-product]', 'div[data-item]', 'li[data-product]', 'a[href*="product"]',
+            'a[href*="item"]', 'a[href*="articulo"]',
+        ],
+        'card_strategy': 'most',
+        'name': [
+            'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'a[title]', 'a.product-link', 'a.item-link', 'a[href*="product"]',
+            '.product-name', '.item-name', '.product-title', '.item-title', '.name', '.title', '.product-info',
+            '.item-info', 'span', 'div', 'p', 'a',
+        ],
+        'name_attrs': ['title', 'alt', 'data-name', 'data-title'],
+        'name_length': (5, 200),
+        'name_lines': {'first': True},
+        'price': [
+            '.price', '.precio', '.cost', '.amount', '.money', 'span[class*="price"]', 'div[class*="price"]',
+            'p[class*="price"]', '.product-price', '.item-price', '.price-current', '.price-now', '.sale-price',
+            '.regular-price', '.precio-actual', 'span[class*="pesos"]', 'span[class*="rd"]', '.currency',
+        ],
+        'price_text': r'(RD\$|\$|₱)\s*\d+',
+        'price_patterns': [
+            r'RD\$\s*[\d,]+\.?\d*', r'\$\s*[\d,]+\.?\d*', r'₱\s*[\d,]+\.?\d*', r'[\d,]+\.?\d*\s*(?:RD\$|\$|₱)',
+            r'\b\d{1,6}[.,]\d{2}\b',
+        ],
+        'no_price': 'No disponible',
+        # El listado de Super Bravo no se pagina; se revisan solo las primeras categorías
+        'crawl': {'max_pages': 1, 'max_categories': 3, 'page_interval': 0.5, 'pause': 3},
+        'output': {
+            'file': 'debug_superbravo_{timestamp}.csv',
+            'columns': {'nombre': 'Nombre', 'precio': 'Precio', 'categoria': 'Categoria',
+                        'url_categoria': 'URL_Categoria'},
+        },
+    },
+}
+
+_LETTER = re.compile(r'[a-zA-ZáéíóúÁÉÍÓÚñÑ]')
+_SPACES = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_AMOUNT = re.compile(r'\d+(?:[,.]\d{3})*(?:[.,]\d{1,2})?')
+
+
+def _terms(terms):
+    """Una sola regex para una lista de términos; ``search`` equivale a ``any(t in texto)``"""
+    if not terms:
+        return None
+    # Los más largos primero: la alternación no cambia el resultado, solo evita retrocesos
+    return re.compile('|'.join(re.escape(term.lower()) for term in sorted(set(terms), key=len, reverse=True)))
+
+
+def _patterns(patterns):
+    """Una sola regex para una lista de patrones; ``match`` equivale a ``any(re.match(p, texto))``"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+def _selector(selectors):
+    """Lista de selectores CSS a un solo selector (una pasada por el árbol en lugar de una por selector)"""
+    return ', '.join(selectors) if selectors else None
+
+
+def _columns(columns):
+    """Columnas del CSV como ``{campo del producto: cabecera}``; una lista usa el campo como cabecera"""
+    if isinstance(columns, dict):
+        return dict(columns)
+    return {column: column for column in columns or ()}
+
+
+def parse_amount(text):
+    """Importe de un texto de precio (``RD$ 1,250.00``, ``1.250,00``, ``1500.00``); None si no hay número"""
+    match = _AMOUNT.search(re.sub(r'[^\d.,]', '', text or ''))
+    if not match:
+        return None
+    number = match.group()
+    if ',' in number and '.' in number:
+        # El último separador es el decimal
+        if number.rindex(',') > number.rindex('.'):
+            number = number.replace('.', '').replace(',', '.')
+        else:
+            number = number.replace(',', '')
+    elif number.count(',') == 1 and len(number.split(',')[1]) <= 2:
+        number = number.replace(',', '.')
+    elif ',' in number:
+        number = number.replace(',', '')
+    elif number.count('.') > 1:
+        number = number.replace('.', '')
+    return float(number)
+
+
+class SiteProfile:
+    """Perfil de un sitio con sus listas ya compiladas en matchers"""
+
+    def __init__(self, site, spec):
+        self.site = site
+        self.spec = spec
+        self.label = spec['label']
+        self.base_url = spec['base_url']
+
+        self.fetch = spec.get('fetch', {})
+        self.backend = self.fetch.get('backend', 'http')
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido en el perfil {site}: {self.backend}")
+
+        categories = spec.get('categories', {})
+        self.url_prefix = categories.get('url_prefix')
+        self.host = categories.get('host')
+        self._exclude = _terms(categories.get('exclude'))
+        self._exclude_text_terms = _terms(categories.get('exclude_text_terms'))
+        self._exclude_url = _terms(categories.get('exclude_url'))
+        self._exclude_text = frozenset(text.lower() for text in categories.get('exclude_text', ()))
+        self.min_length, self.max_length = categories.get('length', (1, 10 ** 6))
+        self._include = _terms(categories.get('include'))
+        self._include_url = _terms(categories.get('include_url'))
+        self._departments = [(name, _terms(keywords)) for name, keywords in categories.get('departments', {}).items()]
+
+        discovery = spec.get('discovery', {})
+        self.sitemap = discovery.get('sitemap', 'leaves')
+        self._sources = [
+            {**source, 'links': _selector(source.get('links')), 'text': _terms(source.get('text')),
+             'url': _terms(source.get('url'))}
+            for source in discovery.get('sources', [{'source': 'Enlaces', 'links': ['a[href]']}])
+        ]
+        self.unique_names = discovery.get('unique_names', False)
+        self.department_names = discovery.get('department_names', False)
+        subcategories = discovery.get('subcategories', {})
+        self.subcategories = bool(subcategories)
+        self.subcategory_selector = _selector(subcategories.get('links'))
+        self._subcategory_exclude = _terms(subcategories.get('exclude'))
+        self.subcategory_length = subcategories.get('length', (1, 10 ** 6))
+        self.subcategory_limit = subcategories.get('limit')
+
+        self.card_selectors = spec.get('cards', [])
+        self.card_strategy = spec.get('card_strategy', 'most')
+        if self.card_strategy not in CARD_STRATEGIES:
+            raise ValueError(f"Estrategia de tarjetas desconocida en el perfil {site}: {self.card_strategy}")
+        self.containers = spec.get('containers')
+        if self.containers:
+            self._container_price = re.compile(self.containers['price'])
+            self._container_terms = _terms(self.containers['terms'])
+            self._container_markup = _terms(self.containers['markup'])
+            self._container_exclude_markup = _terms(self.containers['exclude_markup'])
+            self._container_exclude_text = _terms(self.containers['exclude_text'])
+        self.card_fallback = spec.get('card_fallback')
+
+        self._names = [tuple(selector.split('@', 1)) if '@' in selector else (selector, None)
+                       for selector in spec.get('name', [])]
+        self.name_attrs = spec.get('name_attrs', [])
+        self.min_name, self.max_name = spec.get('name_length', (3, 200))
+        self._name_exclude = _terms(spec.get('name_exclude'))
+        self._name_reject = _patterns(spec.get('name_reject'))
+        self.name_lines = spec.get('name_lines')
+        if self.name_lines:
+            self._name_line_terms = _terms(self.name_lines.get('terms'))
+
+        self.price_selectors = spec.get('price', [])
+        self._price_text = re.compile(spec['price_text']) if spec.get('price_text') else None
+        self._price_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in spec.get('price_patterns', [])]
+        self.price_format = spec.get('price_format', 'text')
+        self.price_range = spec.get('price_range')
+        self.no_price = spec.get('no_price', 'Sin precio')
+
+        paging = spec.get('pagination', {})
+        self.pagination_selector = _selector(paging.get('links'))
+        self.total_selector = _selector(paging.get('total'))
+        self._link_text = re.compile(paging['link_text']) if paging.get('link_text') else None
+        self._numbered = re.compile(paging['numbered']) if paging.get('numbered') else None
+        self.guess_pages = paging.get('guess')
+        self.page_size_param = paging.get('page_size_param')
+        self.page_size_selector = _selector(paging.get('page_sizes'))
+
+        crawl = spec.get('crawl', {})
+        self.max_pages = crawl.get('max_pages', 50)
+        self.max_categories = crawl.get('max_categories')
+        self.prefetch = crawl.get('prefetch', 0)
+        self.page_interval = crawl.get('page_interval', 0.5)
+        pause = crawl.get('pause', 1)
+        # Pausa tras una categoría principal y tras una subcategoría
+        self.pause = pause if isinstance(pause, tuple) else (pause, pause)
+        self.dedupe = crawl.get('dedupe')
+        self.merge = crawl.get('merge')
+
+        output = spec.get('output', {})
+        self.output_file = output.get('file', f'inventario_{site}_{{timestamp}}.csv')
+        self._output_columns = _columns(output.get('columns', ['nombre', 'precio', 'categoria']))
+        self._enriched_columns = _columns(output.get('enriched'))
+
+        self.readiness = spec.get('readiness', {})
+
+    def __repr__(self):
+        return f"SiteProfile({self.site!r})"
+
+    @property
+    def dom_rules(self):
+        """Reglas de ``dom_extract``: selectores de tarjeta, nombre, precio y paginación del perfil"""
+        return {
+            'cards': self.spec.get('cards', []),
+            'name': self.spec.get('name', []),
+            'price': self.spec.get('price', []),
+            'pagination': self.spec.get('pagination', {}).get('links', []),
+            'total': self.spec.get('pagination', {}).get('total', []),
+            'min_name': self.min_name,
+            'max_name': self.max_name,
+            **self.spec.get('dom', {}),
+        }
+
+    def output_columns(self, enriched=False):
+        """``{campo: cabecera}`` del CSV; con ``enriched`` también la URL y los campos de detalle"""
+        if enriched:
+            return {**self._output_columns, **self._enriched_columns}
+        return dict(self._output_columns)
+
+    # Categorías
+
+    def is_category(self, url, text):
+        """¿Es el enlace (``url``, ``text``) una categoría del sitio según el perfil?"""
+        if not url or not text:
+            return False
+        text_lower = text.lower().strip()
+        url_lower = url.lower()
+        if self.url_prefix and not url.startswith(self.url_prefix):
+            return False
+        if self.host and self.host not in url_lower:
+            return False
+        if self._exclude and (self._exclude.search(text_lower) or self._exclude.search(url_lower)):
+            return False
+        if self._exclude_text_terms and self._exclude_text_terms.search(text_lower):
+            return False
+        if self._exclude_url and self._exclude_url.search(url_lower):
+            return False
+        if text_lower in self._exclude_text:
+            return False
+        if not self.min_length <= len(text.strip()) <= self.max_length:
+            return False
+        if self._include or self._include_url:
+            return bool((self._include and self._include.search(text_lower))
+                        or (self._include_url and self._include_url.search(url_lower)))
+        return True
+
+    def department(self, name):
+        """Departamento del perfil cuyas palabras clave aparecen en ``name``, o None"""
+        name_lower = (name or '').lower()
+        for department, keywords in self._departments:
+            if keywords.search(name_lower):
+                return department
+        return None
+
+    def category_name(self, text):
+        """Nombre de la categoría de un enlace: el departamento normalizado si el perfil los usa"""
+        if self.department_names:
+            return self.department(text) or text.strip().title()
+        return text.strip()
+
+    def category_links(self, soup, base_url):
+        """Categorías de la portada según las fuentes del perfil, en orden de prioridad y sin repetir"""
+        found = []
+        for source in self._sources:
+            if source.get('below') and len(found) >= source['below']:
+                continue
+            links = soup.select(source['links']) if source['links'] else soup.find_all('a', href=True)
+            for link in links:
+                href = (link.get('href') or '').strip()
+                text = link.get_text(' ', strip=True)
+                if not href or not text:
+                    continue
+                if source['text'] and not source['text'].search(text.lower()):
+                    continue
+                if source['url'] and not source['url'].search(href.lower()):
+                    continue
+                url = urljoin(base_url, href)
+                if source.get('departments'):
+                    low, high = source['departments']
+                    if self.department(text) is None or not low <= len(text) <= high:
+                        continue
+                elif not self.is_category(url, text):
+                    continue
+                found.append({'name': self.category_name(text), 'url': url, 'parent': None, 'level': 'main',
+                              'source': source['source']})
+        return self.unique_categories(found)
+
+    def unique_categories(self, categories):
+        """Sin URLs repetidas (en forma canónica) y, si el perfil lo pide, sin nombres repetidos"""
+        unique = []
+        seen_urls = set()
+        seen_names = set()
+        for category in categories:
+            url = canonical_url(category['url'], self.site)
+            name = category['name'].lower().strip()
+            if url in seen_urls or (self.unique_names and name in seen_names):
+                continue
+            seen_urls.add(url)
+            seen_names.add(name)
+            unique.append({**category, 'url': url})
+        return unique
+
+    def valid_subcategory(self, text, href):
+        """¿Es el enlace una subcategoría y no un control del listado (ver todo, página, filtro)?"""
+        low, high = self.subcategory_length
+        if not text or not href or not low <= len(text) <= high:
+            return False
+        return not (self._subcategory_exclude and self._subcategory_exclude.search(text.lower()))
+
+    def subcategory_links(self, soup, page_url, parent):
+        """Subcategorías de la página de ``parent`` (menús laterales, filtros y secciones de categoría)"""
+        if not self.subcategory_selector:
+            return []
+        subcategories = []
+        for link in soup.select(self.subcategory_selector):
+            text = link.get_text(' ', strip=True)
+            href = (link.get('href') or '').strip()
+            if self.valid_subcategory(text, href):
+                subcategories.append({'name': text, 'url': urljoin(page_url, href), 'parent': parent['name'],
+                                      'level': 'sub'})
+        return self.unique_categories(subcategories)
+
+    # Productos
+
+    def cards(self, soup):
+        """Tarjetas de producto de la página según la estrategia del perfil"""
+        if self.card_strategy == 'most':
+            return max((soup.select(selector) for selector in self.card_selectors), key=len, default=[])
+        cards = []
+        seen = set()  # Los selectores se solapan: cada Tag se analiza una sola vez
+        for selector in self.card_selectors:
+            for card in soup.select(selector):
+                if id(card) not in seen:
+                    seen.add(id(card))
+                    cards.append(card)
+        if self.containers:
+            cards.extend(div for div in soup.find_all('div') if id(div) not in seen and self.looks_like_product(div))
+        return cards
+
+    def looks_like_product(self, element):
+        """¿Parece el elemento un producto aunque no tenga clase de tarjeta? (heurística ``containers``)"""
+        rules = self.containers
+        text = element.get_text().lower()
+        text_length = len(text.strip())
+        low, high = rules['text_length']
+        # Lo barato primero: longitud y textos legales descartan la mayoría de los divs
+        if not low <= text_length <= high:
+            return False
+        if self._container_exclude_text.search(text):
+            return False
+        markup = ' '.join(
+            f"{tag.name} {' '.join(' '.join(v) if isinstance(v, list) else str(v) for v in tag.attrs.values())}"
+            for tag in (element, *element.find_all(True))
+        ).lower()
+        if self._container_exclude_markup.search(markup):
+            return False
+        return bool(
+            (element.find('img') is not None and text_length > rules['image_text'])
+            or self._container_price.search(text)
+            or self._container_terms.search(text)
+            or self._container_markup.search(markup)
+        )
+
+    def extract_products(self, soup, page_url, fallback_limit=None):
+        """Productos (``nombre``, ``precio``, ``url``) de una página de listado ya parseada"""
+        if self.card_strategy == 'first':
+            products = []
+            for selector in self.card_selectors:
+                products = self._products(soup.select(selector), page_url)
+                if products:  # Si el selector dio productos, no probar más
+                    break
+        else:
+            products = self._products(self.cards(soup), page_url)
+
+        if not products and self.card_fallback:
+            fallback = self.card_fallback
+            divs = (div for div in soup.find_all('div', limit=fallback['scan'])
+                    if div.find('img') and div.find(fallback['title']))
+            products = self._products(divs, page_url, limit=fallback_limit or fallback['limit'])
+        return self.unique_products(products)
+
+    def _products(self, cards, page_url, limit=None):
+        products = []
+        for card in cards:
+            name = self.product_name(card)
+            if not name:
+                continue
+            products.append({'nombre': name, 'precio': self.product_price(card) or self.no_price,
+                             'url': product_url(card, page_url)})
+            if limit and len(products) >= limit:
+                break
+        return products
+
+    def products_from_records(self, records):
+        """Productos de los registros extraídos en el navegador, con la misma validación"""
+        products = []
+        for record in records:
+            name = (record['nombre'] or '').strip()
+            if not self.valid_name(name):
+                continue
+            products.append({'nombre': name, 'precio': self.price_from_text(record['precio_texto']) or self.no_price,
+                             'url': record['url'], 'imagen': record['imagen']})
+        return self.unique_products(products)
+
+    def unique_products(self, products):
+        """Sin productos repetidos en la página si el perfil deduplica por nombre"""
+        if not self.dedupe:
+            return products
+        unique = []
+        seen = set()
+        for product in products:
+            key = self.product_key(product)
+            if key not in seen:
+                seen.add(key)
+                unique.append(product)
+        return unique
+
+    def product_key(self, product):
+        """Clave de un producto: nombre normalizado sin puntuación, o nombre y precio"""
+        if self.dedupe == 'name':
+            return _PUNCTUATION.sub('', _SPACES.sub(' ', product['nombre'].lower().strip()))
+        return product['nombre'], product['precio']
+
+    def product_name(self, card):
+        """Primer nombre válido de la tarjeta según los selectores del perfil, en orden"""
+        for selector, attribute in self._names:
+            for element in card.select(selector):
+                if attribute:
+                    candidates = (element.get(attribute),)
+                else:
+                    candidates = (element.get_text(' ', strip=True), *(element.get(name) for name in self.name_attrs))
+                for candidate in candidates:
+                    candidate = (candidate or '').strip()
+                    if self.valid_name(candidate):
+                        return candidate
+        if self.name_lines:
+            return self._name_from_lines(card)
+        return None
+
+    def _name_from_lines(self, card):
+        """Nombre tomado de una línea del texto de la tarjeta (la primera o una con términos del perfil)"""
+        low, high = self.name_lines.get('length', (self.min_name, self.max_name))
+        for line in card.get_text().split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            if self.name_lines.get('first'):
+                return line if self.valid_name(line) else None
+            if low <= len(line) <= high and self._name_line_terms.search(line.lower()) and self.valid_name(line):
+                return line
+        return None
+
+    def valid_name(self, name):
+        """¿Es ``name`` un nombre de producto y no un texto de la interfaz?"""
+        if not name or not self.min_name <= len(name) <= self.max_name:
+            return False
+        if not _LETTER.search(name):
+            return False
+        name_lower = name.lower()
+        if self._name_exclude and self._name_exclude.search(name_lower):
+            return False
+        return not (self._name_reject and self._name_reject.match(name_lower))
+
+    def product_price(self, card):
+        """Precio de la tarjeta: primero los elementos de precio, luego los patrones sobre su texto"""
+        for selector in self.price_selectors:
+            for element in card.select(selector):
+                price = self._element_price(element.get_text(' ', strip=True))
+                if price:
+                    return price
+        return self._price_match(card.get_text())
+
+    def price_from_text(self, text):
+        """Precio dentro de un texto suelto (el texto de precio de ``dom_extract``)"""
+        if not text:
+            return None
+        if self.price_format == 'amount':
+            return self._element_price(text)
+        return self._price_match(text) or self._element_price(text)
+
+    def _element_price(self, text):
+        if not text or (self._price_text and not self._price_text.search(text)):
+            return None
+        if self.price_format == 'amount':
+            value = parse_amount(text)
+            return self.format_price(value) if self._in_range(value) else None
+        if self.price_range and not self._in_range(parse_amount(text)):
+            return None
+        return text
+
+    def _price_match(self, text):
+        for pattern in self._price_patterns:
+            for match in pattern.finditer(text):
+                price = match.group(1 if pattern.groups else 0).strip()
+                if not self.price_range or self._in_range(parse_amount(price)):
+                    return price
+        return None
+
+    def _in_range(self, value):
+        if value is None:
+            return False
+        if not self.price_range:
+            return True
+        low, high = self.price_range
+        return low <= value <= high
+
+    def format_price(self, value):
+        """Importe con el formato de precio del perfil (``RD$1,234.50``)"""
+        return f"RD${value:,.2f}"
+
+    # Paginación
+
+    def total_text(self, soup):
+        """Texto del elemento con el total de resultados; None si el listado no lo muestra"""
+        total = soup.select_one(self.total_selector) if self.total_selector else None
+        return total.get_text(' ', strip=True) if total else None
+
+    def pagination_links(self, soup, page_url):
+        """URLs de paginación de la página: enlaces del perfil, numerados y adivinadas"""
+        links = []
+        if self.pagination_selector:
+            links = [(link.get('href'), link.get_text(' ', strip=True), True)
+                     for link in soup.select(self.pagination_selector)]
+        if self._numbered:
+            links += [(link.get('href'), link.get_text(' ', strip=True), False) for link in soup.select('a[href]')]
+        return self.pagination_from_records(links, page_url)
+
+    def pagination_from_records(self, links, page_url):
+        """URLs de paginación a partir de ``(href, texto, de_selector)`` (también de ``dom_extract``)"""
+        urls = []
+        for href, text, from_selector in links:
+            if not href:
+                continue
+            if from_selector:
+                if self._link_text and not self._link_text.search(text.lower()):
+                    continue
+            elif not (self._numbered and self._numbered.match(text)):
+                continue
+            urls.append(urljoin(page_url, href))
+        if self.guess_pages and '?' in page_url:
+            param, last = self.guess_pages
+            base = page_url.split('?')[0]
+            urls += [f"{base}?{param}={number}" for number in range(2, last + 1)]
+        return urls
+
+    def next_page_urls(self, page_url, links, total_text, per_page, max_pages):
+        """Páginas 2..N según los enlaces y el total del listado (``pagination.predict_page_urls``)"""
+        # Sin el elemento del total (None) se predice con los enlaces, nunca con el texto de toda la página
+        return pagination.predict_page_urls(page_url, links, total_text, per_page=per_page, max_pages=max_pages)
+
+    def largest_page_size(self, soup):
+        """Mayor tamaño de página numérico del selector del listado, si el perfil lo declara y existe"""
+        if not self.page_size_selector:
+            return None
+        sizes = [
+            int(option.get('value') or option.get_text(strip=True))
+            for option in soup.select(self.page_size_selector)
+            if (option.get('value') or option.get_text(strip=True)).isdigit()
+        ]
+        return max(sizes) if sizes else None
+
+
+@lru_cache(maxsize=None)
+def profile(site):
+    """``SiteProfile`` compilado de ``site`` (una sola vez por proceso)"""
+    try:
+        spec = PROFILES[site]
+    except KeyError:
+        raise ValueError(f"Perfil desconocido: {site} (disponibles: {', '.join(PROFILES)})") from None
+    return SiteProfile(site, spec)
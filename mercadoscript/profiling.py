@@ -0,0 +1,206 @@
+"""Perfilado opcional de una ejecución completa o de fases concretas.
+
+``--profile cprofile`` usa cProfile (determinista) y guarda un ``.prof``
+compatible con snakeviz/flameprof. ``--profile sample`` usa un muestreador
+de pilas en un hilo aparte (bajo overhead) y guarda pilas colapsadas
+``.folded``, el formato de entrada de flamegraph.pl y speedscope. En ambos
+casos se escribe un resumen ``_hotspots.txt`` con las N funciones más
+costosas junto al CSV.
+
+Con ``--profile-phases product_extraction,parse`` solo se perfila dentro de
+los spans de ``mercadoscript.metrics`` con esos nombres. Sin ``--profile``
+no se registra nada: el coste es cero.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from mercadoscript import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def add_profile_arguments(parser):
+    """Opciones de línea de comandos comunes a todos los scrapers"""
+    parser.add_argument('--profile', choices=['cprofile', 'sample'],
+                        help="Perfilar la ejecución con cProfile o con un muestreador de pilas")
+    parser.add_argument('--profile-phases',
+                        help="Perfilar solo estas fases, separadas por comas (ej. product_extraction,parse)")
+    parser.add_argument('--profile-output', help="Prefijo de los archivos de perfil")
+    parser.add_argument('--profile-top', type=int, default=25, help="Funciones en el resumen de hotspots")
+    parser.add_argument('--profile-interval', type=float, default=0.005,
+                        help="Intervalo de muestreo en segundos (modo sample)")
+
+
+class _PhaseGate:
+    """Activa el perfilador solo mientras algún hilo está dentro de una fase elegida"""
+
+    def __init__(self, phases, on_enter, on_exit):
+        self.phases = set(phases)
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self._depth = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, phase, event):
+        if phase not in self.phases:
+            return
+        thread_id = threading.get_ident()
+        with self._lock:
+            depth = self._depth.get(thread_id, 0)
+            depth = depth + 1 if event == 'start' else depth - 1
+            self._depth[thread_id] = depth
+        # Solo el span más externo activa o desactiva (los spans pueden anidarse)
+        if event == 'start' and depth == 1:
+            self.on_enter(thread_id)
+        elif event == 'end' and depth == 0:
+            self.on_exit(thread_id)
+
+
+class CProfileProfiler:
+    def __init__(self, phases=None):
+        self.phases = phases
+        self._profiles = {}
+        self._gate = None
+
+    def start(self):
+        if self.phases:
+            self._gate = _PhaseGate(self.phases, self._enable, self._disable)
+            metrics.registry.span_listeners.append(self._gate)
+        else:
+            self._enable(threading.get_ident())
+
+    def _enable(self, thread_id):
+        # cProfile mide el hilo que llama a enable(): un perfil por hilo
+        profile = self._profiles.setdefault(thread_id, cProfile.Profile())
+        profile.enable()
+
+    def _disable(self, thread_id):
+        self._profiles[thread_id].disable()
+
+    def stop(self):
+        if self._gate:
+            metrics.registry.span_listeners.remove(self._gate)
+        else:
+            self._disable(threading.get_ident())
+
+    def write(self, prefix, top):
+        if not self._profiles:
+            logger.warning("⚠️ El perfil está vacío (¿ninguna fase coincidió?)")
+            return []
+        profiles = list(self._profiles.values())
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(f"{prefix}.prof")
+
+        buffer = io.StringIO()
+        pstats.Stats(f"{prefix}.prof", stream=buffer).sort_stats('cumulative').print_stats(top)
+        with open(f"{prefix}_hotspots.txt", 'w', encoding='utf-8') as f:
+            f.write(buffer.getvalue())
+        return [f"{prefix}.prof", f"{prefix}_hotspots.txt"]
+
+
+class SamplingProfiler:
+    """Muestreador de pilas: cada ``interval`` segundos registra la pila de cada hilo"""
+
+    def __init__(self, phases=None, interval=0.005):
+        self.phases = phases
+        self.interval = interval
+        self.stacks = Counter()
+        self.self_samples = Counter()
+        self._active_threads = set()
+        self._gate = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.phases:
+            self._gate = _PhaseGate(self.phases, self._active_threads.add, self._active_threads.discard)
+            metrics.registry.span_listeners.append(self._gate)
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.phases and thread_id not in self._active_threads:
+                    continue
+                self._record(frame)
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        if stack:
+            self.self_samples[stack[0]] += 1
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._gate:
+            metrics.registry.span_listeners.remove(self._gate)
+
+    def write(self, prefix, top):
+        if not self.stacks:
+            logger.warning("⚠️ El perfil está vacío (¿ninguna fase coincidió?)")
+            return []
+        with open(f"{prefix}.folded", 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        total = sum(self.self_samples.values())
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            for function in set(stack.split(';')):
+                inclusive[function] += count
+
+        with open(f"{prefix}_hotspots.txt", 'w', encoding='utf-8') as f:
+            f.write(f"Muestras: {total} (intervalo {self.interval * 1000:.1f} ms)\n\n")
+            f.write("TIEMPO PROPIO:\n")
+            for function, count in self.self_samples.most_common(top):
+                f.write(f"  {count / total * 100:6.2f}%  {function}\n")
+            f.write("\nTIEMPO ACUMULADO:\n")
+            for function, count in inclusive.most_common(top):
+                f.write(f"  {count / total * 100:6.2f}%  {function}\n")
+        return [f"{prefix}.folded", f"{prefix}_hotspots.txt"]
+
+
+def start(args, retailer):
+    """Iniciar el perfilador según las opciones; None si está desactivado"""
+    if not getattr(args, 'profile', None):
+        return None
+
+    phases = [p.strip() for p in args.profile_phases.split(',')] if args.profile_phases else None
+    if args.profile == 'cprofile':
+        profiler = CProfileProfiler(phases)
+    else:
+        profiler = SamplingProfiler(phases, args.profile_interval)
+
+    profiler.prefix = args.profile_output or f"perfil_{retailer}_{int(time.time())}"
+    profiler.top = args.profile_top
+    profiler.start()
+    logger.info(f"🔬 Perfilado {args.profile} activo ({', '.join(phases) if phases else 'ejecución completa'})")
+    return profiler
+
+
+def finish(profiler):
+    """Detener el perfilador y escribir el perfil y el resumen de hotspots"""
+    if profiler is None:
+        return
+    profiler.stop()
+    for path in profiler.write(profiler.prefix, profiler.top):
+        print(f"🔬 Perfil guardado en: {path}")
@@ -0,0 +1,168 @@
+"""Condiciones de página lista, declaradas por sitio y tipo de página.
+
+``get_page_with_retry`` dormía siempre 5 s tras ``driver.get``, esperaba
+``readyState`` y juzgaba el resultado por ``len(html) > 5000``; Jumbo
+esperaba el ``body`` más 2 s fijos y medía ``get_text()`` sobre el árbol
+entero ya parseado. Las páginas rápidas pagaban la espera completa y las
+rotas (bloqueo, error del servidor) pasaban por toda la escalera.
+
+El perfil de cada sitio declara en ``readiness`` una ``Readiness`` por tipo
+de página ('home', 'category') con condiciones como "la grilla tiene al menos una
+tarjeta con precio" (``grid``) o "hay paginación" (``present``). Las
+condiciones se compilan una vez en reglas JSON y ``READY_SCRIPT`` las evalúa
+en el navegador; ``WebDriverWait`` lo sondea cada ``POLL_SECONDS``:
+
+* ``ready``: se cumple una condición; la página vuelve en ese momento;
+* ``settled``: el documento está completo, tiene texto, pero ninguna
+  condición se cumplió en ``settle`` segundos (p. ej. categoría vacía); la
+  página se acepta y deciden las heurísticas de siempre;
+* ``empty``: documento completo y casi sin texto durante ``settle`` s;
+* ``broken``: el texto es el de una página de error o de bloqueo;
+* ``timeout``: nada de lo anterior en el tiempo máximo.
+
+``empty`` y ``broken`` fallan al instante, sin ``page_source`` ni parseo.
+
+Uso::
+
+    READINESS = {'category': Readiness([grid(CARD_SELECTORS, PRICE_PATTERN), present(PAGINATION)])}
+    result = READINESS['category'].wait(driver, timeout=15)
+    if not result.usable:
+        ...
+"""
+import logging
+import time
+
+from mercadoscript import metrics
+from mercadoscript.core import lazy_import
+
+browser = lazy_import('mercadoscript.browser')
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 0.25
+DEFAULT_SETTLE = 2.0
+
+READY, SETTLED, EMPTY, BROKEN, TIMEOUT = 'ready', 'settled', 'empty', 'broken', 'timeout'
+USABLE = (READY, SETTLED)
+
+# Textos de páginas de error o bloqueo (solo se buscan en páginas cortas)
+BROKEN_PATTERNS = (
+    r'access denied', r'403 forbidden', r'attention required', r'verify you are human', r'are you a robot',
+    r'bad gateway', r'service unavailable', r'gateway time-?out', r'internal server error',
+    r'too many requests',
+)
+BROKEN_MAX_TEXT = 3000
+
+# Evaluación de las reglas en el navegador: [estado, detalle, longitud del texto, documento completo]
+READY_SCRIPT = r"""
+const r = arguments[0];
+const body = document.body;
+const text = body ? (body.innerText || '') : '';
+const complete = document.readyState === 'complete';
+if (text.length < r.broken_max_text) {
+  for (const pattern of r.broken) {
+    if (new RegExp(pattern, 'i').test(text)) return ['broken', pattern, text.length, complete];
+  }
+}
+if (!body || document.readyState === 'loading') return ['pending', 'loading', text.length, complete];
+for (const c of r.ready) {
+  if (c.kind === 'present') {
+    for (const selector of c.selectors) {
+      try { if (document.querySelector(selector)) return ['ready', selector, text.length, complete]; } catch (e) {}
+    }
+  } else if (c.kind === 'grid') {
+    const price = new RegExp(c.price, 'i');
+    for (const selector of c.cards) {
+      let found;
+      try { found = document.querySelectorAll(selector); } catch (e) { continue; }
+      let cards = 0;
+      for (let i = 0; i < found.length && i < c.scan; i++) {
+        if (price.test(found[i].textContent || '') && ++cards >= c.min) {
+          return ['ready', selector, text.length, complete];
+        }
+      }
+    }
+  } else if (c.kind === 'text' && text.length >= c.min) {
+    return ['ready', 'text', text.length, complete];
+  }
+}
+return ['pending', 'waiting', text.length, complete];
+"""
+
+
+def grid(cards, price, minimum=1, scan=200):
+    """Al menos ``minimum`` tarjetas (selectores ``cards``) cuyo texto contiene un precio (regex ``price``)"""
+    return {'kind': 'grid', 'cards': list(cards), 'price': price, 'min': minimum, 'scan': scan}
+
+
+def present(*selectors):
+    """Algún elemento que coincida con uno de los selectores"""
+    return {'kind': 'present', 'selectors': list(selectors)}
+
+
+def text(minimum):
+    """El texto visible de la página tiene al menos ``minimum`` caracteres"""
+    return {'kind': 'text', 'min': minimum}
+
+
+class ReadinessResult:
+    __slots__ = ('state', 'detail', 'text_length', 'seconds')
+
+    def __init__(self, state, detail, text_length, seconds):
+        self.state = state
+        self.detail = detail
+        self.text_length = text_length
+        self.seconds = seconds
+
+    @property
+    def usable(self):
+        return self.state in USABLE
+
+    def __repr__(self):
+        return f"ReadinessResult({self.state!r}, {self.detail!r}, {self.text_length}, {self.seconds:.2f})"
+
+
+class Readiness:
+    """Condiciones de página lista de un tipo de página, compiladas para ``READY_SCRIPT``"""
+
+    def __init__(self, ready, min_text=300, settle=DEFAULT_SETTLE, broken=BROKEN_PATTERNS):
+        self.min_text = min_text
+        self.settle = settle
+        self.rules = {'ready': list(ready), 'broken': list(broken), 'broken_max_text': BROKEN_MAX_TEXT}
+
+    def check(self, driver):
+        """Una evaluación: ``(estado, detalle, longitud del texto, documento completo)``"""
+        return driver.execute_script(READY_SCRIPT, self.rules)
+
+    def wait(self, driver, timeout=15):
+        """Sondear las condiciones hasta que la página esté lista, rota o se agote ``timeout``"""
+        started = time.monotonic()
+        last = ['pending', 'waiting', 0, False]
+        completed_at = None
+
+        def decided(driver):
+            nonlocal last, completed_at
+            state, detail, text_length, complete = last = self.check(driver)
+            if state != 'pending':
+                return state, detail, text_length
+            if not complete:
+                return False
+            now = time.monotonic()
+            completed_at = completed_at or now
+            if now - completed_at < self.settle:
+                return False
+            if text_length >= self.min_text:
+                return SETTLED, 'sin condición cumplida', text_length
+            return EMPTY, f"{text_length} caracteres", text_length
+
+        try:
+            state, detail, text_length = browser.WebDriverWait(driver, timeout, poll_frequency=POLL_SECONDS).until(
+                decided
+            )
+        except browser.TimeoutException:
+            state, detail, text_length = TIMEOUT, last[1], last[2]
+        result = ReadinessResult(state, detail, text_length, time.monotonic() - started)
+        metrics.increment('readiness', state=state)
+        if not result.usable:
+            logger.warning(f"⚠️ Página no lista ({state}: {detail}) tras {result.seconds:.1f} s")
+        return result
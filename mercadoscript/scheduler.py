@@ -0,0 +1,201 @@
+"""Planificador de categorías según su rendimiento histórico.
+
+``JumboCompleteScraper`` recorría las categorías principales en el orden en
+que las descubría hasta llegar a ``target_products``: una categoría que
+casi no aporta consumía el presupuesto igual que una productiva, y los
+límites por nivel (50 productos por categoría, 40 por página, 30 en la
+extracción alternativa, 15 subcategorías) estaban fijos en el código.
+
+``YieldScheduler`` guarda por categoría, entre ejecuciones, cuántos
+productos nuevos o con precio cambiado aportó por segundo de trabajo (media
+móvil), cuántas páginas tuvieron productos y cuándo se visitó por última
+vez (``.cache/rendimiento/<retailer>.json``). Con esos datos:
+
+* ordena el trabajo con una cola de prioridad: primero lo que más productos
+  nuevos o cambiados promete por segundo. Una categoría visitada hace poco
+  promete menos (``frescura``): sus precios apenas han tenido tiempo de
+  cambiar. Las categorías sin historial usan la media de las conocidas, y
+  a igual prioridad se respeta el orden de descubrimiento (cada principal
+  seguida de sus subcategorías);
+* acota las páginas de cada categoría a las que dieron productos la última
+  vez más una;
+* corta la ejecución al llegar al objetivo de productos o al presupuesto de
+  tiempo (``--time-budget``).
+
+Los límites por nivel son configurables (``--max-per-category``,
+``--max-per-page``, ``--max-alternative``, ``--max-subcategories``). Con
+``--schedule discovery`` el orden es el de siempre y el historial solo se
+registra.
+
+Uso::
+
+    python Jumbo.py --target 3000 --time-budget 1800
+    python Jumbo.py --max-per-category 80 --max-subcategories 25 --schedule discovery
+"""
+import heapq
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DIR = os.path.join('.cache', 'rendimiento')
+SCHEDULE_ORDERS = ('yield', 'discovery')
+
+# Límites por nivel: productos por categoría, por página, en la extracción
+# alternativa y subcategorías por categoría principal
+DEFAULT_CAPS = {'category': 50, 'page': 40, 'alternative': 30, 'subcategories': 15}
+
+# Peso de la última visita en la media móvil del rendimiento
+SMOOTHING = 0.5
+# Horas tras las que una categoría se considera completamente "vieja" y su
+# rendimiento vuelve a contar entero; recién visitada cuenta FRESHNESS_FLOOR
+FRESHNESS_HOURS = 24
+FRESHNESS_FLOOR = 0.1
+
+
+def add_scheduler_arguments(parser):
+    """Opciones de línea de comandos del planificador de categorías"""
+    parser.add_argument('--schedule', choices=SCHEDULE_ORDERS, default='yield',
+                        help="yield: primero las categorías con más productos nuevos o cambiados por segundo; "
+                             "discovery: orden de descubrimiento")
+    parser.add_argument('--time-budget', type=float, metavar='SEGUNDOS',
+                        help="Detener la extracción al agotar este tiempo")
+    parser.add_argument('--max-per-category', type=int, default=DEFAULT_CAPS['category'], metavar='N',
+                        help="Productos como máximo por categoría")
+    parser.add_argument('--max-per-page', type=int, default=DEFAULT_CAPS['page'], metavar='N',
+                        help="Productos como máximo por página")
+    parser.add_argument('--max-alternative', type=int, default=DEFAULT_CAPS['alternative'], metavar='N',
+                        help="Productos como máximo con la extracción alternativa")
+    parser.add_argument('--max-subcategories', type=int, default=DEFAULT_CAPS['subcategories'], metavar='N',
+                        help="Subcategorías como máximo por categoría principal")
+
+
+def scheduler_from_args(args, retailer):
+    """``YieldScheduler`` según las opciones de línea de comandos"""
+    caps = {
+        'category': args.max_per_category,
+        'page': args.max_per_page,
+        'alternative': args.max_alternative,
+        'subcategories': args.max_subcategories,
+    }
+    return YieldScheduler(retailer, caps=caps, time_budget=args.time_budget, order=args.schedule)
+
+
+class YieldScheduler:
+    """Cola de categorías ordenada por rendimiento histórico; ``history_dir=None`` no persiste nada"""
+
+    def __init__(self, retailer, caps=None, time_budget=None, order='yield', history_dir=DEFAULT_HISTORY_DIR):
+        self.retailer = retailer
+        self.caps = {**DEFAULT_CAPS, **(caps or {})}
+        self.time_budget = time_budget
+        self.order = order
+        self.path = os.path.join(history_dir, f"{retailer}.json") if history_dir else None
+        self.history = self._read()
+        known = [entry['rate'] for entry in self.history.values()]
+        self.prior = sum(known) / len(known) if known else 0.0
+        self.started = time.monotonic()
+        self._queue = []
+        self.visited = 0
+        self.new_products = 0
+        self.changed_products = 0
+        self.seconds = 0.0
+
+    def _read(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f).get('categories', {})
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Guardar el historial (escritura atómica, como la caché de categorías)"""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'retailer': self.retailer, 'saved_at': time.time(), 'categories': self.history},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.info(f"📈 Historial de rendimiento guardado en {self.path}")
+
+    def expected_rate(self, category):
+        """Productos nuevos o cambiados por segundo que se esperan de la categoría"""
+        entry = self.history.get(category['url'])
+        if entry is None:
+            return self.prior
+        age_hours = (time.time() - entry['last_visit']) / 3600
+        freshness = min(1.0, FRESHNESS_FLOOR + age_hours / FRESHNESS_HOURS)
+        return entry['rate'] * freshness
+
+    def push(self, category, position):
+        """Encolar una categoría; ``position`` (tupla) desempata en orden de descubrimiento"""
+        priority = -self.expected_rate(category) if self.order == 'yield' else 0.0
+        heapq.heappush(self._queue, (priority, position, category['url'], category))
+
+    def pop(self):
+        """Siguiente ``(posición, categoría)``, o None si la cola está vacía"""
+        if not self._queue:
+            return None
+        _, position, _, category = heapq.heappop(self._queue)
+        return position, category
+
+    def __len__(self):
+        return len(self._queue)
+
+    def out_of_time(self):
+        return self.time_budget is not None and time.monotonic() - self.started >= self.time_budget
+
+    def exhausted(self, collected, target):
+        """¿Se alcanzó el objetivo de productos o el presupuesto de tiempo?"""
+        if collected >= target:
+            logger.info(f"🎯 Objetivo de {target} productos alcanzado")
+            return True
+        if self.out_of_time():
+            logger.info(f"⏱️  Presupuesto de {self.time_budget:.0f} s agotado")
+            return True
+        return False
+
+    def max_pages(self, category, default):
+        """Páginas a recorrer: las que dieron productos la última vez más una"""
+        entry = self.history.get(category['url'])
+        if self.order != 'yield' or entry is None:
+            return default
+        return max(1, min(default, entry['pages'] + 1))
+
+    def record(self, category, products, seconds, pages):
+        """Registrar una visita: productos extraídos, segundos dedicados y páginas con productos"""
+        entry = self.history.get(category['url']) or {'rate': None, 'visits': 0, 'prices': {}}
+        previous = entry['prices']
+        prices = {product['nombre'].lower(): product['precio'] for product in products}
+        new = sum(1 for name in prices if name not in previous)
+        changed = sum(1 for name, price in prices.items() if name in previous and previous[name] != price)
+        rate = (new + changed) / max(seconds, 0.001)
+        entry.update({
+            'name': category['name'],
+            'visits': entry['visits'] + 1,
+            'rate': rate if entry['rate'] is None else SMOOTHING * rate + (1 - SMOOTHING) * entry['rate'],
+            'pages': pages,
+            'products': len(products),
+            'last_visit': time.time(),
+            'prices': prices,
+        })
+        self.history[category['url']] = entry
+        self.visited += 1
+        self.new_products += new
+        self.changed_products += changed
+        self.seconds += seconds
+        return new, changed
+
+    def print_summary(self):
+        if not self.visited:
+            return
+        value = self.new_products + self.changed_products
+        print(f"\n📈 PLANIFICADOR ({self.order}): {self.visited} categorías, {self.new_products} productos nuevos, "
+              f"{self.changed_products} con precio cambiado ({value / max(self.seconds, 0.001):.2f}/s de extracción)")
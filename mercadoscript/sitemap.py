@@ -0,0 +1,254 @@
+"""Descubrimiento de categorías a partir de robots.txt y sitemap.xml.
+
+Lee las directivas ``Sitemap:`` de robots.txt (o prueba las rutas habituales),
+recorre los índices de sitemaps recursivamente y parsea cada XML en
+streaming con ``iterparse``, liberando los nodos a medida que se leen, así
+que la memoria no crece con el tamaño del sitemap. Las URLs se clasifican en
+categorías y productos y con las categorías se construye el árbol por
+prefijos de ruta.
+
+Si el sitio no publica sitemap, ``discover_categories`` devuelve ``None`` y
+el scraper vuelve a la heurística sobre el DOM de la página principal.
+"""
+import gzip
+import logging
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse, unquote
+
+from mercadoscript.core import lazy_import
+from mercadoscript.urls import unique_urls
+
+requests = lazy_import('requests')
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/xml,text/xml,text/plain;q=0.9,*/*;q=0.8',
+}
+
+DEFAULT_SITEMAP_PATHS = ['sitemap.xml', 'sitemap_index.xml', 'sitemap/sitemap.xml']
+
+# Pistas en el nombre del sitemap hijo (Magento, WooCommerce/Yoast, VTEX...)
+CATEGORY_SITEMAP_HINTS = ('categor', 'product_cat', 'taxonom', 'department', 'departamento', 'collection')
+PRODUCT_SITEMAP_HINTS = ('product', 'producto', 'sku', 'item')
+NON_CATALOG_SITEMAP_HINTS = ('post', 'page', 'blog', 'author', 'tag', 'store', 'tienda', 'brand', 'marca')
+
+# Rutas de listados de categorías (WooCommerce, Magento, VTEX, Shopify...): evidencia
+# positiva de categoría en un sitemap genérico
+CATEGORY_URL_PATTERN = re.compile(
+    r'/(categor(?:y|ies|ia|ias)|product-category|product_cat|departamentos?|departments?|secci(?:on|ones)'
+    r'|colecciones|collections|catalog/category|c|cat)/',
+    re.I
+)
+PRODUCT_URL_PATTERN = re.compile(r'(\.html?$|/p$|/producto?/|/product/|/item/|-\d{4,}$)', re.I)
+EXCLUDED_PATH_PATTERN = re.compile(
+    r'/(customer|account|cuenta|checkout|cart|carrito|login|search|buscar|blog|contact|contacto|ayuda|help)(/|$)',
+    re.I
+)
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _open_stream(url, session, timeout):
+    response = session.get(url, headers=HEADERS, timeout=timeout, stream=True)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    stream = response.raw
+    # .xml.gz servido como archivo (no como Content-Encoding): descomprimir aquí
+    if url.endswith('.gz') or 'gzip' in response.headers.get('Content-Type', ''):
+        return response, gzip.GzipFile(fileobj=stream)
+    return response, stream
+
+
+def robots_sitemaps(base_url, session=None, timeout=15):
+    """Sitemaps declarados en robots.txt"""
+    session = session or requests.Session()
+    try:
+        response = session.get(urljoin(base_url, '/robots.txt'), headers=HEADERS, timeout=timeout)
+        if response.status_code != 200:
+            return []
+    except requests.RequestException as e:
+        logger.debug(f"robots.txt no disponible: {e}")
+        return []
+
+    sitemaps = []
+    for line in response.text.splitlines():
+        key, _, value = line.partition(':')
+        if key.strip().lower() == 'sitemap' and value.strip():
+            sitemaps.append(urljoin(base_url, value.strip()))
+    return sitemaps
+
+
+def iter_sitemap(url, session=None, timeout=30, max_sitemaps=200, _seen=None):
+    """Recorrer un sitemap o índice en streaming.
+
+    Produce tuplas ``(url, lastmod, sitemap_de_origen)``. Los índices se
+    siguen recursivamente hasta ``max_sitemaps`` archivos.
+    """
+    session = session or requests.Session()
+    seen = _seen if _seen is not None else set()
+    if url in seen or len(seen) >= max_sitemaps:
+        return
+    seen.add(url)
+
+    try:
+        response, stream = _open_stream(url, session, timeout)
+    except requests.RequestException as e:
+        logger.warning(f"⚠️ No se pudo leer el sitemap {url}: {e}")
+        return
+
+    child_sitemaps = []
+    try:
+        loc = lastmod = None
+        for event, element in ET.iterparse(stream, events=('end',)):
+            name = _local_name(element.tag)
+            if name == 'loc':
+                loc = (element.text or '').strip()
+            elif name == 'lastmod':
+                lastmod = (element.text or '').strip()
+            elif name == 'sitemap':
+                if loc:
+                    child_sitemaps.append(loc)
+                loc = lastmod = None
+                element.clear()
+            elif name == 'url':
+                if loc:
+                    yield loc, lastmod, url
+                loc = lastmod = None
+                element.clear()
+    except ET.ParseError as e:
+        logger.warning(f"⚠️ Sitemap mal formado {url}: {e}")
+    finally:
+        response.close()
+
+    for child in child_sitemaps:
+        yield from iter_sitemap(child, session, timeout, max_sitemaps, seen)
+
+
+def classify_url(url, sitemap_url, base_url, category_filter=None):
+    """Clasificar una URL del sitemap como 'category', 'product' o None.
+
+    En un sitemap genérico (sin pista en su nombre) una URL solo es categoría
+    con evidencia positiva: ruta de listado (``CATEGORY_URL_PATTERN``) o el
+    filtro de categorías del sitio, ``category_filter(url, nombre)``, sobre
+    el nombre derivado de la ruta. Una ruta corta sin más (``/contacto``,
+    ``/politicas-de-privacidad``) no lo es.
+    """
+    if not url.startswith(base_url.rstrip('/')):
+        parsed, base = urlparse(url), urlparse(base_url)
+        if parsed.netloc.lower().replace('www.', '') != base.netloc.lower().replace('www.', ''):
+            return None
+
+    path = urlparse(url).path
+    if not path.strip('/') or EXCLUDED_PATH_PATTERN.search(path):
+        return None
+
+    # Sin la palabra 'sitemap', que contiene 'item' y pasaría por sitemap de productos
+    source = sitemap_url.lower().rsplit('/', 1)[-1].replace('sitemap', '')
+    if any(hint in source for hint in CATEGORY_SITEMAP_HINTS):
+        return 'category'
+    if any(hint in source for hint in PRODUCT_SITEMAP_HINTS):
+        return 'product'
+    if any(hint in source for hint in NON_CATALOG_SITEMAP_HINTS):
+        return None
+
+    # Sitemap genérico: decidir por la forma de la URL
+    if PRODUCT_URL_PATTERN.search(path.rstrip('/')):
+        return 'product'
+    if CATEGORY_URL_PATTERN.search(path.rstrip('/') + '/'):
+        return 'category'
+    shallow = len([segment for segment in path.split('/') if segment]) <= 4
+    if shallow and category_filter and category_filter(url, category_name_from_url(url)):
+        return 'category'
+    return None
+
+
+def category_name_from_url(url):
+    """Nombre legible a partir del último segmento de la ruta"""
+    segment = unquote(urlparse(url).path.rstrip('/').rsplit('/', 1)[-1])
+    segment = re.sub(r'\.\w+$', '', segment)
+    return re.sub(r'[-_]+', ' ', segment).strip().title()
+
+
+def build_category_tree(category_urls):
+    """Construir el árbol de categorías por prefijos de ruta.
+
+    Devuelve una lista de nodos ``{'name', 'url', 'parent_url', 'depth'}``
+    ordenada de modo que cada padre aparece antes que sus hijos.
+    """
+    by_path = {}
+    for url in category_urls:
+        path = urlparse(url).path.rstrip('/')
+        by_path.setdefault(path, url)
+
+    nodes = []
+    for path in sorted(by_path, key=lambda p: (p.count('/'), p)):
+        segments = [s for s in path.split('/') if s]
+        parent_url = None
+        for i in range(len(segments) - 1, 0, -1):
+            ancestor = '/' + '/'.join(segments[:i])
+            if ancestor in by_path:
+                parent_url = by_path[ancestor]
+                break
+        nodes.append({
+            'name': category_name_from_url(by_path[path]),
+            'url': by_path[path],
+            'parent_url': parent_url,
+            'depth': len(segments),
+        })
+    return nodes
+
+
+def leaf_categories(tree):
+    """Categorías sin hijas: recorrerlas cubre el catálogo sin repetir productos"""
+    parents = {node['parent_url'] for node in tree if node['parent_url']}
+    return [node for node in tree if node['url'] not in parents]
+
+
+def discover_categories(base_url, classify=None, session=None, max_urls=500000, category_filter=None):
+    """Descubrir el árbol de categorías desde los sitemaps del sitio.
+
+    ``classify(url, sitemap_url)`` permite reglas propias por sitio; por
+    defecto se usa ``classify_url`` con ``category_filter`` (el filtro de
+    categorías del perfil del sitio). Se leen como mucho ``max_urls`` URLs
+    en total. Devuelve ``None`` si no hay sitemap o si el sitemap no
+    contiene categorías reconocibles.
+    """
+    session = session or requests.Session()
+    classify = classify or (
+        lambda url, sitemap_url: classify_url(url, sitemap_url, base_url, category_filter)
+    )
+
+    sitemaps = robots_sitemaps(base_url, session) or [urljoin(base_url, p) for p in DEFAULT_SITEMAP_PATHS]
+    logger.info(f"🗺️  Sitemaps candidatos: {len(sitemaps)}")
+
+    category_urls = []
+    product_count = 0
+    total = 0
+    seen_sitemaps = set()
+    for sitemap_url in sitemaps:
+        for url, _, source in iter_sitemap(sitemap_url, session, _seen=seen_sitemaps):
+            total += 1
+            kind = classify(url, source)
+            if kind == 'category':
+                category_urls.append(url)
+            elif kind == 'product':
+                product_count += 1
+            if total >= max_urls:
+                break
+        if total >= max_urls:
+            # Límite global: no abrir más sitemaps
+            logger.info(f"🗺️  Límite de {max_urls} URLs alcanzado")
+            break
+
+    if not category_urls:
+        logger.info("🗺️  Sin categorías en sitemaps; se usará la heurística del DOM")
+        return None
+
+    tree = build_category_tree(unique_urls(category_urls))
+    logger.info(f"🗺️  Sitemap: {total} URLs, {len(tree)} categorías, {product_count} productos")
+    return tree
@@ -0,0 +1,218 @@
+"""Tamaño y precio por unidad a partir del nombre del producto.
+
+Los nombres ya traen el tamaño ("390 Ml", "75 Cl", "3/4 lB", "6 x 355 ml",
+"12 Oz x 6", "8 Und/Paq"). Este módulo lo convierte a una unidad base (kg, L o unidad) y
+calcula el precio por unidad base para comparar entre retailers.
+
+Todo el procesamiento es por lotes: los nombres de un inventario completo
+se unen en un único texto y un patrón precompilado lo recorre una sola vez
+(``findall``), así el bucle de búsqueda corre dentro del motor de
+expresiones regulares y no hay una llamada ``re`` por fila. El patrón
+empieza por una clase de caracteres literal (``[0-9\n]``) para que el motor
+salte directamente de un número o salto de línea al siguiente; cada salto
+de línea marca el paso a la fila siguiente. La unidad se resuelve con una
+búsqueda en diccionario. Para los precios basta el primer número de cada
+fila, así que su patrón da exactamente una coincidencia por fila. 100.000
+nombres tardan una fracción de segundo (``benchmarks/units_bench.py``).
+
+Uso::
+
+    python -m mercadoscript.units Inventario_Jumbo.csv -o jumbo_por_unidad.csv
+
+"Oz"/"Onz" se interpreta como onza de peso salvo que diga "fl oz": los
+nombres no distinguen la onza líquida de la de peso. Una coma seguida de
+exactamente tres cifras es separador de miles ("1,000 g"), igual que en los
+precios; con una o dos cifras es decimal ("1,5 kg"). El multiplicador puede
+ir antes ("6 x 355 ml") o después del tamaño ("12 Oz x 6"); detrás solo
+cuenta si le sigue nada o una unidad ("x 6 Und"), no otra palabra ("x 2
+capas").
+"""
+import argparse
+import csv
+import re
+import time
+from fractions import Fraction
+
+BASE_UNITS = ('kg', 'l', 'un')
+
+# Unidad escrita -> (unidad base, factor de conversión)
+UNITS = {
+    'kg': ('kg', 1.0), 'kgs': ('kg', 1.0), 'kilo': ('kg', 1.0), 'kilos': ('kg', 1.0), 'k': ('kg', 1.0),
+    'g': ('kg', 0.001), 'gr': ('kg', 0.001), 'grs': ('kg', 0.001), 'gramo': ('kg', 0.001),
+    'gramos': ('kg', 0.001), 'mg': ('kg', 0.000001),
+    'lb': ('kg', 0.45359237), 'lbs': ('kg', 0.45359237), 'libra': ('kg', 0.45359237),
+    'libras': ('kg', 0.45359237),
+    'oz': ('kg', 0.028349523), 'onz': ('kg', 0.028349523), 'onza': ('kg', 0.028349523),
+    'onzas': ('kg', 0.028349523),
+    'fl oz': ('l', 0.029573530), 'fl onz': ('l', 0.029573530),
+    'l': ('l', 1.0), 'lt': ('l', 1.0), 'lts': ('l', 1.0), 'litro': ('l', 1.0), 'litros': ('l', 1.0),
+    'ml': ('l', 0.001), 'cc': ('l', 0.001), 'cl': ('l', 0.01), 'dl': ('l', 0.1),
+    'gl': ('l', 3.785411784), 'gal': ('l', 3.785411784), 'galon': ('l', 3.785411784),
+    'galón': ('l', 3.785411784), 'galones': ('l', 3.785411784),
+    'un': ('un', 1.0), 'und': ('un', 1.0), 'unds': ('un', 1.0), 'ud': ('un', 1.0), 'uds': ('un', 1.0),
+    'unidad': ('un', 1.0), 'unidades': ('un', 1.0), 'pk': ('un', 1.0), 'pack': ('un', 1.0),
+    'pzs': ('un', 1.0), 'pzas': ('un', 1.0), 'piezas': ('un', 1.0), 'ct': ('un', 1.0),
+    'rollos': ('un', 1.0), 'sobres': ('un', 1.0),
+}
+
+_LOOKUP = {unit.replace(' ', ''): conversion for unit, conversion in UNITS.items()}
+_LOOKUP['fl'] = UNITS['fl oz']  # El lote solo ve la palabra que sigue al número
+_UNIT_ALTERNATIVES = '|'.join(sorted((re.escape(u).replace(r'\ ', r'\s*') for u in UNITS), key=len, reverse=True))
+
+# Un tamaño en un texto suelto: "6 x 355 ml", "1.5LTS", "3/4 lB", "12 Oz x 6"
+SIZE_PATTERN = re.compile(
+    r'(?<![\w.,/])(?:(?P<count>\d+)\s*[x×]\s*)?(?P<qty>\d+(?:[.,]\d+)?(?:/\d+)?)\s*'
+    rf'(?P<unit>{_UNIT_ALTERNATIVES})(?![^\W\d_])(?:\s*[x×]\s*(?P<times>\d+)(?![\d.,]))?',
+    re.IGNORECASE
+)
+# Para el lote: número (o salto de línea), la palabra que le sigue y un
+# multiplicador detrás ("x 6") con la palabra que le sigue a él
+_BATCH_SIZE_PATTERN = re.compile(r'([0-9\n][0-9.,/]*) *([^\W\d_]*|×)(?: *[x×] *([0-9]+) *([^\W\d_]*))?')
+# "1,000" o "12,500.5": comas de miles
+_THOUSANDS_PATTERN = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d*)?')
+# Primer número de cada fila; una coincidencia por fila, aunque no lo haya
+_BATCH_PRICE_PATTERN = re.compile(r'^[^0-9\n]*([0-9][0-9.,]*)?', re.MULTILINE)
+_MULTIPLIERS = ('x', 'X', '×')
+
+
+def _quantity(text):
+    try:
+        if '/' in text:
+            numerator, denominator = text.split('/', 1)
+            return float(Fraction(int(numerator), int(denominator)))
+        if _THOUSANDS_PATTERN.fullmatch(text):
+            return float(text.replace(',', ''))
+        return float(text.replace(',', '.'))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _join(values):
+    try:
+        text = '\n'.join(values)
+    except TypeError:  # valores vacíos (None)
+        text = None
+    if text is None or text.count('\n') != len(values) - 1:
+        # Un salto de línea dentro de un valor lo partiría en dos filas
+        text = '\n'.join((value or '').replace('\n', ' ') for value in values)
+    return text
+
+
+def parse_sizes(names):
+    """``(cantidad, unidad_base)`` por nombre, o None si no trae tamaño.
+
+    Si un nombre trae varios tamaños se queda con el primero de peso o
+    volumen; las unidades solo cuentan si no hay otro.
+    """
+    names = list(names)
+    sizes = [None] * len(names)
+    lookup = _LOOKUP.get
+    row = 0
+    count = None  # "6 x": multiplicador del tamaño siguiente
+    for number, word, times, times_word in _BATCH_SIZE_PATTERN.findall(_join(names)):
+        if number == '\n':
+            row += 1
+            count = None
+            continue
+        if number[0] == '\n':
+            row += 1
+            count = None
+            number = number[1:]
+        conversion = lookup(word.lower()) if word else None
+        if conversion is None:
+            count = number if word in _MULTIPLIERS and number.isdigit() else None
+            continue
+        multiplier, count = int(count) if count else 1, None
+        if times and (not times_word or lookup(times_word.lower(), ('',))[0] == 'un'):
+            multiplier *= int(times)
+        base, factor = conversion
+        current = sizes[row]
+        if current and (current[1] != 'un' or base == 'un'):
+            continue
+        amount = _quantity(number)
+        if amount:
+            sizes[row] = (amount * factor * multiplier, base)
+    return sizes
+
+
+def _price(text):
+    if ',' in text and '.' in text:
+        if text.rindex(',') > text.rindex('.'):
+            text = text.replace('.', '').replace(',', '.')
+        else:
+            text = text.replace(',', '')
+    elif text.count(',') == 1 and len(text.rsplit(',', 1)[1]) == 2:
+        text = text.replace(',', '.')
+    else:
+        text = text.replace(',', '')
+    try:
+        return float(text.rstrip('.'))
+    except ValueError:
+        return None
+
+
+def parse_prices(prices):
+    """Precio numérico por fila ("RD$1,219.96" -> 1219.96), o None"""
+    numbers = _BATCH_PRICE_PATTERN.findall(_join(list(prices)))
+    # Los precios se repiten mucho: cada texto distinto se convierte una vez
+    converted = {number: _price(number) for number in set(numbers) if number}
+    return [converted.get(number) for number in numbers]
+
+
+def unit_prices(names, prices):
+    """``(cantidad, unidad_base, precio, precio_por_unidad)`` por fila"""
+    return [
+        (size[0], size[1], price, round(price / size[0], 4) if price else None) if size
+        else (None, None, price, None)
+        for size, price in zip(parse_sizes(names), parse_prices(prices))
+    ]
+
+
+def annotate(products, name_key='nombre', price_key='precio'):
+    """Añadir a cada producto su tamaño normalizado y precio por unidad"""
+    results = unit_prices([p.get(name_key) for p in products], [p.get(price_key) for p in products])
+    for product, (quantity, unit, price, per_unit) in zip(products, results):
+        product['cantidad_base'] = round(quantity, 6) if quantity else ''
+        product['unidad_base'] = unit or ''
+        product['precio_numerico'] = price if price is not None else ''
+        product['precio_por_unidad'] = per_unit if per_unit is not None else ''
+    return products
+
+
+def _column(fieldnames, name):
+    for field in fieldnames:
+        if field.lower() == name:
+            return field
+    raise SystemExit(f"❌ El CSV no tiene columna '{name}'")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tamaño normalizado y precio por kg / L / unidad de un inventario")
+    parser.add_argument('csv', help="Inventario CSV con columnas nombre y precio")
+    parser.add_argument('-o', '--output', help="CSV de salida (por defecto <entrada>_por_unidad.csv)")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        products = list(reader)
+
+    started = time.perf_counter()
+    annotate(products, _column(fieldnames, 'nombre'), _column(fieldnames, 'precio'))
+    elapsed = time.perf_counter() - started
+
+    output = args.output or args.csv.rsplit('.', 1)[0] + '_por_unidad.csv'
+    with open(output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames + ['cantidad_base', 'unidad_base', 'precio_numerico',
+                                                            'precio_por_unidad'])
+        writer.writeheader()
+        writer.writerows(products)
+
+    with_size = sum(1 for p in products if p['unidad_base'])
+    print(f"✓ {len(products)} productos en {elapsed * 1000:.1f} ms; "
+          f"{with_size} con tamaño ({with_size / max(len(products), 1):.0%})")
+    print(f"💾 Guardado en {output}")
+
+
+if __name__ == "__main__":
+    main()
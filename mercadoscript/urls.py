@@ -0,0 +1,135 @@
+"""Forma canónica de las URLs de categorías, paginación y productos.
+
+Los scrapers comparaban URLs como cadenas: ``https://Sirena.do/categoria/``,
+``https://sirena.do/categoria``, ``https://sirena.do/categoria#top`` y
+``https://sirena.do/categoria?utm_source=x`` eran cuatro URLs distintas y se
+descargaban cuatro veces. ``canonical_url`` normaliza:
+
+* esquema y host en minúsculas, sin puerto por defecto ni fragmento;
+* parámetros de seguimiento fuera (``utm_*``, ``gclid``, ``fbclid``...) y
+  el resto ordenado;
+* parámetros que solo repiten el valor por defecto (``?p=1``, ``?page=1``);
+* por sitio (``SITE_RULES``): alias de host, barra final y parámetros
+  propios de la plataforma que no cambian la página.
+
+La URL canónica sigue siendo descargable: es la que se registra, se compara
+y se descarga. ``SeenURLs`` y ``unique_urls`` deduplican en forma canónica y
+cuentan en ``mercadoscript.metrics`` (``fetches_avoided``) las repeticiones
+que la comparación de cadenas no habría detectado.
+
+Uso::
+
+    from mercadoscript.urls import SeenURLs, canonical_url, unique_urls
+
+    canonical_url('https://www.SuperBravo.com.do/lacteos/?utm_source=fb#top', 'bravo')
+    pagination_links = unique_urls(candidates, 'jumbo', exclude=[current_url])
+"""
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from mercadoscript import metrics
+
+TRACKING_PARAMS = frozenset({
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'srsltid',
+    '_ga', '_gl', 'mc_cid', 'mc_eid', '_hsenc', '_hsmi',
+})
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# hosts: alias -> host canónico; trailing_slash: 'strip', 'add' o None (sin
+# cambios); drop_params: parámetros que no cambian el contenido;
+# default_params: parámetro -> valor que equivale a no ponerlo
+DEFAULT_RULES = {
+    'hosts': {},
+    'trailing_slash': None,
+    'drop_params': (),
+    'default_params': {'p': '1', 'page': '1'},
+}
+SITE_RULES = {
+    'sirena': {'hosts': {'sirena.do': 'www.sirena.do'}, 'trailing_slash': 'strip'},
+    'jumbo': {'hosts': {'www.jumbo.com.do': 'jumbo.com.do'}, 'trailing_slash': 'strip'},
+    # Magento: identificadores de sesión y de tienda, y el modo de listado
+    'nacional': {
+        'hosts': {'www.supermercadosnacional.com': 'supermercadosnacional.com'},
+        'trailing_slash': 'strip',
+        'drop_params': ('sid', '___store', '___from_store', 'product_list_mode'),
+    },
+    'bravo': {'hosts': {'superbravo.com.do': 'www.superbravo.com.do'}},
+}
+
+
+def site_rules(site):
+    return {**DEFAULT_RULES, **SITE_RULES.get(site, {})}
+
+
+@lru_cache(maxsize=65536)
+def canonical_url(url, site=None):
+    """Forma canónica de ``url`` con las reglas genéricas y las de ``site``"""
+    try:
+        parsed = urlsplit(url.strip())
+        port = parsed.port
+    except (AttributeError, ValueError):
+        return url
+    scheme = parsed.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parsed.hostname:
+        return url
+
+    rules = site_rules(site)
+    host = parsed.hostname.lower()
+    host = rules['hosts'].get(host, host)
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+
+    path = parsed.path or '/'
+    if path != '/':
+        if rules['trailing_slash'] == 'strip':
+            path = path.rstrip('/') or '/'
+        elif rules['trailing_slash'] == 'add' and not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+            path += '/'
+
+    drop = {param.lower() for param in rules['drop_params']}
+    defaults = rules['default_params']
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+        and key.lower() not in drop and defaults.get(key) != value
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ''))
+
+
+class SeenURLs:
+    """Conjunto de URLs comparadas en forma canónica"""
+
+    def __init__(self, site=None, urls=()):
+        self.site = site
+        self._canonical = set()
+        self._raw = set()
+        for url in urls:
+            self.add(url)
+
+    def add(self, url):
+        """Registrar ``url``; False si ya estaba (en cualquier forma equivalente)"""
+        key = canonical_url(url, self.site)
+        if key in self._canonical:
+            if url not in self._raw:
+                # Repetida solo en forma canónica: sin esta capa se habría descargado
+                metrics.increment('fetches_avoided')
+                self._raw.add(url)
+            return False
+        self._canonical.add(key)
+        self._raw.add(url)
+        return True
+
+    def __contains__(self, url):
+        return canonical_url(url, self.site) in self._canonical
+
+    def __len__(self):
+        return len(self._canonical)
+
+    def __iter__(self):
+        return iter(self._canonical)
+
+
+def unique_urls(urls, site=None, exclude=()):
+    """URLs canónicas sin repetir y en orden, sin las de ``exclude`` (p. ej. la página actual)"""
+    seen = SeenURLs(site, exclude)
+    return [canonical_url(url, site) for url in urls if seen.add(url)]
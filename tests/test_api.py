@@ -0,0 +1,105 @@
+import csv
+import json
+import os
+import threading
+from http.client import HTTPConnection
+
+import pytest
+
+from mercadoscript.api import BadRequest, QueryServer, QueryService, handle_query
+
+
+def write_inventory(path, rows, mtime):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['nombre', 'precio', 'categoria'])
+        writer.writerows(rows)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def service(tmp_path):
+    write_inventory(tmp_path / 'inventario_nacional_20260101.csv', [
+        ('Leche Entera Rica 1 L', 'RD$ 80.00', 'Lácteos'),
+    ], 1_700_000_000)
+    write_inventory(tmp_path / 'inventario_nacional_20260201.csv', [
+        ('Leche Entera Rica 1 L', 'RD$ 85.00', 'Lácteos'),
+        ('Queso Geo 500 g', 'RD$ 310.00', 'Lácteos'),
+        ('Arroz Selecto 5 lb', 'RD$ 250.00', 'Despensa'),
+    ], 1_700_100_000)
+    write_inventory(tmp_path / 'Inventario_Jumbo.csv', [
+        ('Leche Entera Rica 1 L', 'RD$ 83.00', 'Lácteos'),
+    ], 1_700_100_000)
+    return QueryService(str(tmp_path))
+
+
+def test_products_are_filtered_and_paginated(service):
+    body = handle_query(service.snapshot, '/products', {'retailer': 'nacional', 'category': 'Lácteos',
+                                                         'per_page': '1'})
+    assert (body['total'], body['next_page']) == (2, 2)
+    assert body['items'][0]['nombre'] == 'Leche Entera Rica 1 L'
+    assert handle_query(service.snapshot, '/categories', {})['items'][0] == {'categoria': 'Lácteos', 'productos': 3}
+
+
+def test_search_and_price_history(service):
+    body = handle_query(service.snapshot, '/search', {'q': 'leche entera', 'per_page': '1'})
+    assert body['items'][0]['retailer'] == 'jumbo'
+    assert body['next_page'] == 2
+
+    [series] = handle_query(service.snapshot, '/history', {'q': 'leche entera rica 1 l', 'retailer': 'nacional'})[
+        'items']
+    assert [point['precio_num'] for point in series['puntos']] == [80.0, 85.0]
+
+
+@pytest.mark.parametrize('route, params', [
+    ('/search', {}),
+    ('/search', {'q': 'leche', 'sort': 'nombre'}),
+    ('/products', {'page': '0'}),
+    ('/products', {'retailer': 'amazon'}),
+])
+def test_bad_requests(service, route, params):
+    with pytest.raises(BadRequest):
+        handle_query(service.snapshot, route, params)
+
+
+def test_refresh_replaces_the_snapshot_only_when_inventories_change(service, tmp_path):
+    snapshot = service.snapshot
+    assert service.refresh() is False
+    assert service.snapshot is snapshot
+
+    write_inventory(tmp_path / 'Inventario_Jumbo.csv', [('Leche Entera Rica 1 L', 'RD$ 79.00', 'Lácteos')],
+                    1_700_200_000)
+    assert service.refresh() is True
+    assert service.snapshot.version != snapshot.version
+    # El snapshot anterior sigue intacto para las peticiones en curso
+    assert handle_query(snapshot, '/search', {'q': 'leche', 'retailer': 'jumbo'})['items'][0]['precio_num'] == 83.0
+
+
+@pytest.fixture
+def server(service):
+    server = QueryServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_responses_carry_etags(server):
+    connection = HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    connection.request('GET', '/retailers')
+    response = connection.getresponse()
+    body = json.loads(response.read())
+    etag = response.getheader('ETag')
+    assert response.status == 200 and len(body['items']) == 2
+
+    connection.request('GET', '/retailers', headers={'If-None-Match': etag})
+    response = connection.getresponse()
+    response.read()
+    assert response.status == 304
+
+    for path, status in (('/search', 400), ('/nada', 404)):
+        connection.request('GET', path)
+        response = connection.getresponse()
+        assert response.status == status and 'error' in json.loads(response.read())
+    connection.close()
@@ -0,0 +1,63 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mercadoscript import browser_service
+
+
+class DevToolsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({'Browser': 'HeadlessChrome/120.0'}).encode()
+        self.send_response(200 if self.path == '/json/version' else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def devtools():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DevToolsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_address():
+    assert browser_service.parse_address('10.0.0.5:9333') == ('10.0.0.5', 9333)
+    assert browser_service.parse_address(':9333') == ('127.0.0.1', 9333)
+    assert browser_service.parse_address(None) == ('127.0.0.1', 9222)
+
+
+def test_chrome_command_uses_persistent_profile_and_cache(tmp_path):
+    command = browser_service.chrome_command('/usr/bin/chrome', 9333, str(tmp_path))
+    assert command[0] == '/usr/bin/chrome'
+    assert '--remote-debugging-port=9333' in command
+    assert f'--user-data-dir={tmp_path}' in command
+    assert any(arg.startswith('--disk-cache-dir=') for arg in command)
+
+
+def test_health_and_ensure_running_reuse_a_live_browser(devtools, monkeypatch):
+    monkeypatch.setattr(browser_service, 'start', lambda *args, **kwargs: pytest.fail("no debía relanzarse"))
+    assert browser_service.health(devtools) == {'Browser': 'HeadlessChrome/120.0'}
+    assert browser_service.ensure_running(devtools) == devtools
+
+
+def test_unreachable_remote_browser_is_an_error():
+    assert browser_service.health('127.0.0.1:9', timeout=0.5) is None
+    with pytest.raises(RuntimeError):
+        browser_service.ensure_running('10.255.255.1:9', restart=True)
+
+
+def test_state_round_trip_and_stop_without_state(tmp_path):
+    state_path = str(tmp_path / 'estado' / 'browser_service.json')
+    assert browser_service.load_state(state_path) == {}
+    browser_service.save_state({'address': '127.0.0.1:9222'}, state_path)
+    assert browser_service.load_state(state_path) == {'address': '127.0.0.1:9222'}
+    assert browser_service.stop(state_path) is False
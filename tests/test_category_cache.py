@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from mercadoscript import category_cache
+from mercadoscript.category_cache import CategoryCache
+
+BASE = 'https://tienda.do/'
+HOME = """
+<a href="/lacteos/leche">Leche</a>
+<a href="https://www.tienda.do/bebidas">Bebidas</a>
+<a href="https://otra.do/ofertas">Otra tienda</a>
+<a href="#top">Arriba</a>
+"""
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CategoryCache('tienda', cache_dir=str(tmp_path))
+
+
+def test_sections_from_html_keeps_internal_first_segments():
+    assert category_cache.sections_from_html(HOME, BASE) == {'lacteos', 'bebidas'}
+
+
+def test_save_records_the_discovery_baseline(cache):
+    cache.save(['lacteos'], base_url=BASE, home_html=HOME)
+    with open(cache.path, encoding='utf-8') as f:
+        assert json.load(f)['top_level_sections'] == ['bebidas', 'lacteos']
+
+
+def test_validate_marks_stale_on_new_sections(cache, monkeypatch):
+    cache.save(['lacteos'], base_url=BASE, home_html=HOME)
+    monkeypatch.setattr(category_cache, 'top_level_sections', lambda url, **kwargs: {'lacteos', 'bebidas'})
+    assert cache.validate(BASE) == set()
+    assert cache.load() is not None
+
+    monkeypatch.setattr(category_cache, 'top_level_sections', lambda url, **kwargs: {'lacteos', 'bebidas', 'mascotas'})
+    assert cache.validate(BASE) == {'mascotas'}
+    assert cache.load() is None
+
+
+def test_validate_without_baseline_does_not_adopt_current_sections(cache, monkeypatch):
+    cache.save(['lacteos'])
+    monkeypatch.setattr(category_cache, 'top_level_sections', lambda url, **kwargs: {'lacteos'})
+    assert cache.validate(BASE) is None
+    assert cache.load() is None
+
+
+JUMBO = 'https://jumbo.com.do/'
+JUMBO_HOME = """
+<header><nav>
+  <a href="/supermercado.html">Supermercado</a>
+  <a href="/hogar.html">Hogar</a>
+  <a href="/customer/account/">Mi cuenta</a>
+</nav></header>
+<div class="products">{products}</div>
+"""
+
+
+def test_new_featured_products_do_not_invalidate_the_cache(tmp_path, monkeypatch):
+    cache = CategoryCache('jumbo', cache_dir=str(tmp_path))
+    home = JUMBO_HOME.format(products='<a href="/leche-rica-1l.html">Leche Rica 1 L</a>')
+    cache.save(['supermercado', 'hogar'], base_url=JUMBO, home_html=home)
+    with open(cache.path, encoding='utf-8') as f:
+        assert json.load(f)['top_level_sections'] == ['hogar.html', 'supermercado.html']
+
+    # La portada de hoy destaca otros productos y una promoción: ninguno es una sección
+    today = JUMBO_HOME.format(products='<a href="/arroz-selecto-5lb.html">Arroz Selecto 5 lb</a>'
+                                       '<a href="/ofertas-de-la-semana.html">Ofertas</a>')
+    monkeypatch.setattr(category_cache, 'top_level_sections',
+                        lambda url, **kwargs: category_cache.sections_from_html(today, url, **kwargs))
+    assert cache.validate(JUMBO) == set()
+    assert cache.load() is not None
+
+    # Un departamento nuevo en el menú sí
+    today = today.replace('</nav>', '<a href="/deportes.html">Deportes</a></nav>')
+    assert cache.validate(JUMBO) == {'deportes.html'}
+    assert cache.load() is None
+
+
+def test_ttl_and_forced_refresh(tmp_path):
+    cache = CategoryCache('tienda', ttl_hours=1, cache_dir=str(tmp_path))
+    cache.save(['lacteos'])
+    assert cache.load()['categories'] == ['lacteos']
+    assert cache.load(force_refresh=True) is None
+    assert CategoryCache('tienda', ttl_hours=0, cache_dir=str(tmp_path)).load() is None
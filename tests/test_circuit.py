@@ -0,0 +1,96 @@
+import pytest
+
+from mercadoscript import circuit, metrics
+from mercadoscript.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'increment', registry.increment)
+    return registry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_opens_at_the_failure_rate_once_there_are_enough_requests(registry, clock):
+    breaker = CircuitBreaker('sirena.do', failure_rate=0.5, min_requests=4, window=10, cooldown=30)
+    for ok in (False, False, True):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state == CLOSED  # 3 descargas: menos que el mínimo
+    breaker.record(False)
+    assert breaker.is_open()
+
+    assert not breaker.allow()
+    assert not breaker.allow()
+    assert registry.counter_value('circuit_rejected', host='sirena.do') == 2
+
+
+def test_only_recent_outcomes_count(clock):
+    breaker = CircuitBreaker('sirena.do', failure_rate=0.75, min_requests=4, window=4, cooldown=30)
+    for ok in (False, False, True, True, True, True, False, False):
+        breaker.record(ok)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    # 3 errores en las últimas 4, aunque en total sean 5 de 9
+    assert breaker.is_open()
+    assert len(breaker.outcomes) == 4
+
+
+def test_half_open_allows_a_single_probe(registry, clock):
+    breaker = CircuitBreaker('jumbo.com.do', min_requests=1, cooldown=30)
+    breaker.record(False)
+    assert breaker.is_open()
+
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # ya hay una prueba en curso
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    assert registry.counter_value('circuit_transitions', host='jumbo.com.do', state=CLOSED) == 1
+
+
+def test_failed_probe_doubles_the_cooldown_up_to_the_maximum(clock):
+    breaker = CircuitBreaker('jumbo.com.do', min_requests=1, cooldown=500)
+    breaker.record(False)
+    clock[0] += 500
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == OPEN and breaker.current_cooldown == circuit.MAX_COOLDOWN
+
+    clock[0] += 500
+    assert not breaker.allow()
+    clock[0] += circuit.MAX_COOLDOWN - 500
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.current_cooldown == 500
+
+
+def test_zero_cooldown_disables_the_breaker(clock):
+    breaker = CircuitBreaker('bravo.do', min_requests=1, cooldown=0)
+    for _ in range(5):
+        breaker.record(False)
+        assert breaker.allow()
+    assert breaker.state == CLOSED
+
+
+def test_host_failures():
+    assert circuit.is_host_failure(503) and circuit.is_host_failure(429) and circuit.is_host_failure(403)
+    assert not circuit.is_host_failure(404)
+
+
+def test_one_breaker_per_host_with_the_configured_options():
+    breakers = CircuitBreakers()
+    breakers.configure(min_requests=2, cooldown=10)
+    breaker = breakers.for_url('https://WWW.Sirena.do/categoria/lacteos')
+    assert breakers.for_url('https://sirena.do/otra') is breaker
+    assert breakers.for_url('https://jumbo.com.do/') is not breaker
+    assert (breaker.host, breaker.min_requests, breaker.cooldown) == ('sirena.do', 2, 10)
@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from mercadoscript import core, preflight
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_core_does_not_load_heavy_dependencies():
+    code = ("import sys, mercadoscript.core; "
+            "print([name for name in ('requests', 'bs4', 'selenium') if name in sys.modules])")
+    output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    assert output.strip() == '[]'
+
+
+def test_lazy_module_loads_on_first_attribute():
+    module = core.lazy_import('json')
+    assert 'diferido' in repr(module)
+    assert module.dumps([1]) == '[1]'
+    assert 'cargado' in repr(module)
+
+
+def test_batch_normalization_matches_single_text():
+    texts = ['  Leche  ENTERA\tRica ', 'Jamón\nde Pavo', None, '', 'Piña Ñame']
+    assert core.normalizar_textos(texts) == [core.normalizar_texto((text or '').replace('\n', ' ')) for text in texts]
+    assert core.normalizar_textos([]) == []
+
+
+def test_product_hash_ignores_case_accents_and_price_format():
+    assert core.generar_hash_producto('Café Santo Domingo', 'RD$ 150,00') == \
+        core.generar_hash_producto('cafe  santo domingo', '150.00')
+    assert core.normalizar_precio('Sin precio') == ''
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = '<html></html>'
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            error = Exception(f"HTTP {self.status_code}")
+            error.response = self
+            raise error
+
+
+@pytest.mark.parametrize('status, host_failure', [(404, False), (503, True)])
+def test_fetch_errors_feed_the_circuit_breaker(monkeypatch, status, host_failure):
+    recorded = []
+
+    class Breaker:
+        host = 'tienda.do'
+
+        def allow(self):
+            return True
+
+        def record(self, ok):
+            recorded.append(ok)
+
+        def is_open(self):
+            return False
+
+    class Requests:
+        @staticmethod
+        def get(url, **kwargs):
+            return FakeResponse(status)
+
+    monkeypatch.setattr(core, 'requests', Requests)
+    monkeypatch.setattr(core.circuit.breakers, 'for_url', lambda url: Breaker())
+    monkeypatch.setattr(core.time, 'sleep', lambda seconds: None)
+
+    assert core.obtener_pagina('https://tienda.do/x', reintentos=2) is None
+    assert recorded == [not host_failure] * 2
+
+
+def test_preflight_cache_is_reused_until_stale(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / 'entorno.json')
+    driver = tmp_path / 'chromedriver'
+    driver.write_text('')
+    detections = []
+
+    def detect():
+        detections.append(1)
+        return {'fingerprint': preflight._fingerprint(), 'driver_path': str(driver), 'detected_at': time.time(),
+                'mtimes': {'driver_path': os.path.getmtime(driver)}}
+
+    monkeypatch.setattr(preflight, 'detect', detect)
+    assert preflight.preflight(cache_path=cache_path)['cached'] is False
+    assert preflight.preflight(cache_path=cache_path)['cached'] is True
+    assert len(detections) == 1
+
+    # Un driver reemplazado invalida la caché
+    os.utime(driver, (0, 0))
+    assert preflight.load_cached(cache_path) is None
+    with open(cache_path, encoding='utf-8') as f:
+        info = json.load(f)
+    info['mtimes']['driver_path'] = os.path.getmtime(driver)
+    preflight.save(info, cache_path)
+    assert preflight.load_cached(cache_path) is not None
+    # Otro Python, Selenium o PATH también
+    info['fingerprint']['python'] = '0.0'
+    preflight.save(info, cache_path)
+    assert preflight.load_cached(cache_path) is None
+
+
+def test_preflight_problems():
+    info = {'fingerprint': {'selenium': '4.20'}, 'chrome_path': '/usr/bin/chrome', 'chrome_version': '120.0.1',
+            'driver_path': '/usr/bin/chromedriver', 'driver_version': '119.0.2'}
+    assert preflight.problems(info) == ["Versiones incompatibles: Chrome 120 y chromedriver 119"]
+    assert len(preflight.problems({})) == 3
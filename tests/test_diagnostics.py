@@ -0,0 +1,52 @@
+from mercadoscript.core import parse_html
+from mercadoscript.diagnostics import StructureAnalyzer, url_pattern
+
+
+def listing(count):
+    cards = ''.join(
+        f'<div class="product-item"><a href="/p/{i}">Producto {i}</a><span>RD$ {100 + i}</span></div>'
+        for i in range(count)
+    )
+    return parse_html(f'<html><body><div id="product-grid" class="grid">{cards}</div></body></html>')
+
+
+def test_url_pattern_groups_pages_of_the_same_template():
+    assert url_pattern('https://www.superbravo.com.do/categoria/lacteos?page=2') == \
+        url_pattern('https://www.superbravo.com.do/categoria/bebidas?page=7')
+    assert url_pattern('https://www.superbravo.com.do/categoria/lacteos') != \
+        url_pattern('https://www.superbravo.com.do/categoria/lacteos/leche')
+    assert url_pattern('https://www.superbravo.com.do/categoria/lacteos') != \
+        url_pattern('https://www.superbravo.com.do/producto/leche')
+
+
+def test_single_pass_report():
+    analyzer = StructureAnalyzer(sample_every=1, max_samples=3, time_budget=None, cache=False)
+    report = analyzer.analyze(listing(8), 'https://www.superbravo.com.do/lacteos')
+
+    assert report['counts']['product_class'] == 8
+    assert len(report['product_class']) == 3
+    assert report['product_ids'] == [('div', 'product-grid')]
+    assert report['grids'] == [(['grid'], 8)]
+    assert report['price_elements'][0] == ('span', [], 'RD$ 100')
+    assert not report['truncated']
+
+
+def test_sampling_only_reads_every_nth_candidate():
+    analyzer = StructureAnalyzer(sample_every=4, max_samples=10, time_budget=None, cache=False)
+    report = analyzer.analyze(listing(8), 'https://www.superbravo.com.do/lacteos')
+    # 25 candidatos (grid, 8 tarjetas, 8 enlaces y 8 precios); se mira el texto de uno de cada cuatro
+    assert report['counts']['price_candidates'] == 25
+    assert [text for _, _, text in report['price_elements']] == ['RD$ 100', 'RD$ 104']
+
+
+def test_templates_are_analyzed_once():
+    analyzer = StructureAnalyzer(time_budget=None)
+    assert analyzer.analyze(listing(2), 'https://www.superbravo.com.do/categoria/lacteos?page=1') is not None
+    assert analyzer.analyze(listing(2), 'https://www.superbravo.com.do/categoria/bebidas?page=3') is None
+
+
+def test_time_budget_truncates_large_pages():
+    analyzer = StructureAnalyzer(time_budget=1e-9, cache=False)
+    report = analyzer.analyze(listing(300), 'https://www.superbravo.com.do/lacteos')
+    assert report['truncated']
+    assert report['nodes'] < 300 * 3
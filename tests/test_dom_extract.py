@@ -0,0 +1,67 @@
+import pickle
+
+import pytest
+
+from mercadoscript import dom_extract, metrics
+from mercadoscript.dom_extract import DomPage, extract_in_browser
+
+
+class FakeDriver:
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    def execute_script(self, script, rules):
+        self.calls.append((script, rules))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'increment', registry.increment)
+    return registry
+
+
+def test_records_links_and_total_come_back_from_one_script(registry):
+    driver = FakeDriver({
+        'products': [['Leche Rica 1 L', 'RD$ 85.00', 'https://jumbo.com.do/leche', ''],
+                     ['Queso Geo', 'RD$ 310.00', '', 'https://jumbo.com.do/queso.jpg']],
+        'links': [['https://jumbo.com.do/lacteos?p=2', '2']],
+        'total': '48 productos',
+    })
+
+    page = extract_in_browser(driver, {'max_products': 10, 'total': ['.toolbar-amount']})
+
+    [(script, rules)] = driver.calls
+    assert script == dom_extract.EXTRACT_SCRIPT
+    assert rules['max_products'] == 10 and rules['total'] == ['.toolbar-amount']
+    assert rules['min_name'] == dom_extract.DEFAULT_RULES['min_name']
+    assert page.records == [
+        {'nombre': 'Leche Rica 1 L', 'precio_texto': 'RD$ 85.00', 'url': 'https://jumbo.com.do/leche', 'imagen': None},
+        {'nombre': 'Queso Geo', 'precio_texto': 'RD$ 310.00', 'url': None, 'imagen': 'https://jumbo.com.do/queso.jpg'},
+    ]
+    assert page.links == [('https://jumbo.com.do/lacteos?p=2', '2')]
+    assert page.total_text == '48 productos'
+    assert registry.counter_value('dom_extraction_products') == 2
+
+
+@pytest.mark.parametrize('driver', [
+    FakeDriver(error=RuntimeError('javascript error')),
+    FakeDriver(None),
+    FakeDriver({'products': [], 'links': [], 'total': None}),
+])
+def test_failures_and_empty_pages_fall_back_to_page_source(registry, driver):
+    assert extract_in_browser(driver, {}) is None
+    assert registry.counter_value('dom_extraction_fallbacks') == 1
+
+
+def test_dom_page_travels_to_the_parse_pool():
+    page = DomPage([{'nombre': 'Leche', 'precio_texto': 'RD$ 85.00', 'url': None, 'imagen': None}],
+                   [('https://jumbo.com.do/lacteos?p=2', '2')], None)
+    copy = pickle.loads(pickle.dumps(page))
+    assert (copy.records, copy.links, copy.total_text) == (page.records, page.links, None)
+    assert len(copy) == 1
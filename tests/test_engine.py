@@ -0,0 +1,181 @@
+import csv
+
+import pytest
+
+from mercadoscript import engine, sitemap
+from mercadoscript.core import parse_html
+from mercadoscript.engine import ScrapingEngine, merge_similar
+from mercadoscript.profiles import profile
+from mercadoscript.scheduler import YieldScheduler
+
+NACIONAL = 'https://supermercadosnacional.com/lacteos'
+JUMBO = {'name': 'Lácteos', 'url': 'https://jumbo.com.do/lacteos', 'parent': None, 'level': 'main'}
+
+
+class FakeFetcher:
+    """Devuelve la propia URL como página y registra las peticiones"""
+
+    def __init__(self):
+        self.requested = []
+
+    def open(self):
+        pass
+
+    def fetch(self, url, page_type='category', extract=True):
+        self.requested.append(url)
+        return url
+
+    def close(self):
+        pass
+
+
+def products(*names):
+    return [{'nombre': name, 'precio': '100.00', 'url': ''} for name in names]
+
+
+def listing(names, total=None, sizes=(), pages=()):
+    items = ''.join(
+        f'<li class="product-item"><a class="product-item-link" href="/{name.lower()}.html">{name}</a>'
+        f'<span class="price">$100.00</span></li>'
+        for name in names
+    )
+    amount = f'<p class="toolbar-amount">Artículos 1-{len(names)} de {total}</p>' if total else ''
+    limiter = ''.join(f'<option value="{size}">{size}</option>' for size in sizes)
+    links = ''.join(f'<div class="pages"><a href="{NACIONAL}?p={page}">{page}</a></div>' for page in pages)
+    return (f'<html><body>{amount}<select class="limiter-options">{limiter}</select>'
+            f'<ol class="products">{items}</ol>{links}<p>Envío gratis en 3 productos</p></body></html>')
+
+
+@pytest.fixture
+def jumbo():
+    scheduler = YieldScheduler('jumbo', caps={'page': 2}, order='discovery', history_dir=None)
+    return ScrapingEngine('jumbo', fetcher=FakeFetcher(), scheduler=scheduler)
+
+
+def test_page_cap_applies_after_cross_page_dedupe(jumbo):
+    seen = set()
+    assert [p['nombre'] for p in jumbo.keep_new(products('Leche', 'Queso', 'Yogur'), seen)] == ['Leche', 'Queso']
+    # Con el límite antes de descartar duplicados la página 2 no aportaría nada
+    page_2 = jumbo.keep_new(products('Leche', 'Queso', 'Yogur', 'Mantequilla', 'Crema'), seen)
+    assert [p['nombre'] for p in page_2] == ['Yogur', 'Mantequilla']
+
+
+def test_pages_stop_at_the_first_without_new_products(jumbo, monkeypatch):
+    pages = {
+        JUMBO['url']: (products('Leche', 'Queso'), None, [f"{JUMBO['url']}?page=2", f"{JUMBO['url']}?page=3"], []),
+        f"{JUMBO['url']}?page=2": (products('Yogur', 'Leche'), None, [], None),
+        f"{JUMBO['url']}?page=3": (products('Leche', 'Yogur'), None, [], None),
+    }
+    monkeypatch.setattr(engine, 'parse_listing_page', lambda page, url, *args: pages[url])
+
+    found, productive = jumbo._scrape_pages(JUMBO, max_pages=4)
+
+    assert [p['nombre'] for p in found] == ['Leche', 'Queso', 'Yogur']
+    assert productive == 2
+    assert jumbo.found_subcategories == {JUMBO['url']: []}
+
+
+def test_nacional_next_pages_come_from_the_toolbar_total():
+    nacional = profile('nacional')
+    soup = parse_html(listing(['Leche', 'Queso'], total=5, pages=(2,)))
+    links = nacional.pagination_links(soup, NACIONAL)
+    assert nacional.largest_page_size(parse_html(listing(['Leche'], sizes=(12, 24, 36)))) == 36
+    assert nacional.next_page_urls(NACIONAL, links, nacional.total_text(soup), 2, 50) == [
+        f'{NACIONAL}?p=2', f'{NACIONAL}?p=3',
+    ]
+    # Contadores del carrito o de banners no son el total del listado
+    html = listing(['Leche', 'Queso'], pages=(2,)).replace('<body>', '<body><p>Más de 900 artículos en oferta</p>')
+    soup = parse_html(html)
+    assert nacional.next_page_urls(NACIONAL, links, nacional.total_text(soup), 2, 50) == [f'{NACIONAL}?p=2']
+
+
+def test_nacional_category_follows_pages_at_the_largest_size_until_a_repeat(monkeypatch):
+    pages = {
+        f'{NACIONAL}?product_list_limit=36': listing(['Leche', 'Queso'], total=6, sizes=(12, 36), pages=(2,)),
+        f'{NACIONAL}?product_list_limit=36&p=2': listing(['Yogur', 'Crema']),
+        # El sitio repite la última página para números fuera de rango
+        f'{NACIONAL}?product_list_limit=36&p=3': listing(['Yogur', 'Crema']),
+    }
+    requested = []
+
+    def obtener_pagina(url, **kwargs):
+        requested.append(url)
+        return pages.get(url)
+
+    monkeypatch.setattr(engine, 'obtener_pagina', obtener_pagina)
+    nacional = ScrapingEngine('nacional', prefetch=0)
+    nacional.page_size = 36
+
+    found = nacional.scrape_category({'name': 'Lácteos', 'url': NACIONAL, 'parent': None, 'level': 'main'})
+
+    assert [product['nombre'] for product in found] == ['Leche', 'Queso', 'Yogur', 'Crema']
+    assert found[0]['categoria'] == 'Lácteos' and found[0]['url_categoria'] == NACIONAL
+    assert requested[0] == f'{NACIONAL}?product_list_limit=36'
+
+
+def test_sitemap_categories_use_the_profile_filter(monkeypatch):
+    urls = [
+        'https://www.sirena.do/lacteos',
+        'https://www.sirena.do/bebidas/jugos',
+        'https://www.sirena.do/account/login',
+        'https://www.sirena.do/terms',
+        'https://www.sirena.do/producto/leche-rica-1l',
+    ]
+    sirena = ScrapingEngine('sirena', fetcher=FakeFetcher())
+
+    def discover_categories(base_url, **kwargs):
+        category_filter = kwargs.get('category_filter')
+        assert category_filter == sirena.profile.is_category
+        return sitemap.build_category_tree([
+            url for url in urls
+            if sitemap.classify_url(url, f'{base_url}sitemap.xml', base_url, category_filter) == 'category'
+        ])
+
+    monkeypatch.setattr(engine.sitemap, 'discover_categories', discover_categories)
+
+    categories = sirena.discover()
+
+    assert [category['url'] for category in categories] == [
+        'https://www.sirena.do/lacteos', 'https://www.sirena.do/bebidas/jugos',
+    ]
+    assert sirena.fetcher.requested == []
+
+
+def test_jumbo_subcategories_come_from_the_sitemap_tree(jumbo):
+    jumbo.sitemap_tree = sitemap.build_category_tree([
+        'https://jumbo.com.do/lacteos', 'https://jumbo.com.do/lacteos/quesos', 'https://jumbo.com.do/lacteos/leches',
+        'https://jumbo.com.do/bebidas', 'https://jumbo.com.do/bebidas/jugos',
+    ])
+    subcategories = jumbo.subcategories(JUMBO)
+    assert [(s['url'], s['parent'], s['level']) for s in subcategories] == [
+        ('https://jumbo.com.do/lacteos/leches', 'Lácteos', 'sub'),
+        ('https://jumbo.com.do/lacteos/quesos', 'Lácteos', 'sub'),
+    ]
+    assert jumbo.fetcher.requested == []
+
+
+def test_similar_products_are_merged_with_all_their_categories():
+    rows = [
+        {'nombre': 'Leche Rica 1L', 'precio': '$85.00', 'categoria': 'Lácteos'},
+        {'nombre': 'Leche Rica 1L', 'precio': '$85.00', 'categoria': 'Ofertas'},
+        {'nombre': 'Leche Rica', 'precio': '$85.00', 'categoria': 'Desayuno'},
+        {'nombre': 'Leche Rica 1L', 'precio': '$90.00', 'categoria': 'Lácteos'},
+    ]
+    merged = merge_similar(rows)
+    assert [(p['precio'], p['categorias']) for p in merged] == [
+        ('$85.00', ['Lácteos', 'Ofertas', 'Desayuno']), ('$90.00', ['Lácteos']),
+    ]
+
+
+def test_save_writes_the_profile_columns(tmp_path):
+    nacional = ScrapingEngine('nacional', fetcher=FakeFetcher())
+    nacional.products = [{'nombre': 'Leche', 'precio': '$85.00', 'categoria': 'Lácteos', 'url_categoria': NACIONAL,
+                          'url': f'{NACIONAL}/leche'}]
+    nacional.finish()
+
+    path = nacional.save(str(tmp_path / 'inventario.csv'))
+
+    with open(path, encoding='utf-8') as f:
+        assert list(csv.DictReader(f)) == [
+            {'Nombre': 'Leche', 'Precio': '$85.00', 'Categorias': 'Lácteos', 'URL_Categoria': NACIONAL},
+        ]
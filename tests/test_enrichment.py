@@ -0,0 +1,105 @@
+import json
+import time
+
+from mercadoscript.core import parse_html
+from mercadoscript.enrichment import DetailEnricher, DetailStore, parse_details, product_url
+
+BASE = 'https://supermercadosnacional.com/lacteos'
+
+
+def test_product_url_skips_cart_and_script_links():
+    card = parse_html(
+        '<li><a href="javascript:void(0)">Ver</a><a href="/checkout/cart/add/5">Agregar</a>'
+        '<a href="/leche-rica.html?utm_source=home#reviews">Leche Rica</a></li>'
+    ).li
+    assert product_url(card, BASE) == 'https://supermercadosnacional.com/leche-rica.html'
+    assert product_url(parse_html('<li><a href="#">Ver</a></li>').li, BASE) is None
+
+
+def test_details_from_json_ld():
+    data = {'@context': 'https://schema.org', '@graph': [
+        {'@type': 'BreadcrumbList'},
+        {'@type': 'Product', 'name': 'Leche Rica Entera 1 L', 'sku': 'LR-001', 'gtin13': '7460000000011',
+         'brand': {'@type': 'Brand', 'name': 'Rica'},
+         'offers': [{'availability': 'https://schema.org/OutOfStock'}]},
+    ]}
+    soup = parse_html(f'<script type="application/ld+json">{json.dumps(data)}</script>')
+    assert parse_details(soup) == {'sku': 'LR-001', 'codigo_barras': '7460000000011', 'tamano': '1 l',
+                                   'marca': 'Rica', 'disponibilidad': 'agotado'}
+
+
+def test_details_from_microdata():
+    soup = parse_html(
+        '<div itemscope><h1 itemprop="name">Queso Geo 500 g</h1><meta itemprop="sku" content="QG-500">'
+        '<span itemprop="brand">Geo</span><link itemprop="availability" href="https://schema.org/InStock"></div>'
+    )
+    details = parse_details(soup)
+    assert details['sku'] == 'QG-500'
+    assert details['marca'] == 'Geo'
+    assert details['disponibilidad'] == 'disponible'
+    assert details['tamano'] == '500 g'
+
+
+def test_details_from_labelled_text_and_pack_size():
+    soup = parse_html(
+        '<h1>Refresco Cola 355 ml x 6</h1><p>Código: RC-355</p><p>EAN: 7461234567890</p>'
+        '<p>Marca: Cola Real</p><button>Agregar al carrito</button>'
+    )
+    assert parse_details(soup) == {'sku': 'RC-355', 'codigo_barras': '7461234567890', 'tamano': '355 ml x 6',
+                                   'marca': 'Cola Real', 'disponibilidad': 'disponible'}
+
+
+def make_enricher(tmp_path, pages):
+    fetched = []
+    enricher = DetailEnricher('nacional', concurrency=2, min_interval=0,
+                              store=DetailStore('nacional', cache_dir=str(tmp_path)))
+
+    def fetch(url):
+        fetched.append(url)
+        return pages[url]
+
+    enricher.fetch = fetch
+    return enricher, fetched
+
+
+def test_enrich_groups_variants_and_skips_fresh_entries(tmp_path):
+    url = 'https://supermercadosnacional.com/leche-rica.html'
+    enricher, fetched = make_enricher(tmp_path, {
+        url: (200, '<h1>Leche Rica 1 L</h1><p>SKU: LR-001</p>', '"v1"', None),
+    })
+    products = [
+        {'Nombre': 'Leche Rica 1 L', 'URL': url},
+        {'Nombre': 'Leche Rica 1 L', 'URL': 'https://www.supermercadosnacional.com/leche-rica.html?sid=abc'},
+        {'Nombre': 'Sin ficha', 'URL': ''},
+    ]
+    columns = {'sku': 'SKU', 'tamano': 'Tamaño'}
+
+    stats = enricher.enrich(products, url_key='URL', columns=columns, name_key='Nombre')
+
+    assert fetched == [url]
+    assert stats['productos'] == 1 and stats['descargados'] == 1
+    assert [product.get('SKU') for product in products] == ['LR-001', 'LR-001', None]
+    assert products[0]['Tamaño'] == '1 l'
+    assert DetailStore('nacional', cache_dir=str(tmp_path)).get(url)['etag'] == '"v1"'
+
+    # Segunda ejecución dentro del TTL: nada que descargar
+    enricher, fetched = make_enricher(tmp_path, {})
+    stats = enricher.enrich([{'URL': url}], url_key='URL', columns=columns)
+    assert fetched == [] and stats['vigentes'] == 1
+
+
+def test_not_modified_renews_the_entry_without_parsing(tmp_path):
+    url = 'https://supermercadosnacional.com/queso-geo.html'
+    store = DetailStore('nacional', cache_dir=str(tmp_path))
+    store.put(url, {'sku': 'QG-500'}, etag='"v1"')
+    store.entries[url]['enriched_at'] = time.time() - 48 * 3600
+    store.save()
+
+    enricher, fetched = make_enricher(tmp_path, {url: (304, None, None, None)})
+    products = [{'url': url}]
+    stats = enricher.enrich(products)
+
+    assert fetched == [url]
+    assert stats['no_modificados'] == 1 and stats['descargados'] == 0
+    assert products[0]['sku'] == 'QG-500'
+    assert enricher.is_fresh(url)
@@ -0,0 +1,151 @@
+import threading
+import time
+import urllib.error
+
+import pytest
+
+from mercadoscript.frontier import TOKEN_ENV, FrontierServer, RemoteFrontier, SQLiteFrontier, run_worker
+
+
+@pytest.fixture(autouse=True)
+def no_token_from_environment(monkeypatch):
+    monkeypatch.delenv(TOKEN_ENV, raising=False)
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = SQLiteFrontier(str(tmp_path / 'frontier.db'), run_id='test', politeness_seconds=0)
+    yield frontier
+    frontier.close()
+
+
+@pytest.fixture
+def serve(frontier):
+    servers = []
+
+    def serve(token=None):
+        server = FrontierServer(frontier, '127.0.0.1', 0, token=token)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def remote(serve):
+    return RemoteFrontier(serve())
+
+
+def test_enqueue_is_deduplicated_in_canonical_form(frontier):
+    assert frontier.enqueue('https://sirena.do/lacteos', 'sirena')
+    assert not frontier.enqueue('https://www.sirena.do/lacteos/?utm_source=x#top', 'sirena')
+    assert frontier.stats()['pending'] == 1
+
+
+def test_lease_ack_and_lost_lease(frontier):
+    frontier.enqueue('https://sirena.do/lacteos', 'sirena', payload={'name': 'Lácteos'})
+    task = frontier.lease('w1')
+    assert task['payload'] == {'name': 'Lácteos'}
+    assert frontier.lease('w2') is None
+    assert not frontier.ack(task['id'], 'w2')
+    assert frontier.ack(task['id'], 'w1', {'products': 3})
+    assert frontier.stats()['done'] == 1
+
+
+def test_expired_lease_is_retaken_and_attempts_are_bounded(tmp_path):
+    frontier = SQLiteFrontier(str(tmp_path / 'f.db'), run_id='test', lease_seconds=0.05, politeness_seconds=0,
+                              max_attempts=2)
+    frontier.enqueue('https://jumbo.com.do/hogar', 'jumbo')
+    first = frontier.lease('w1')
+    time.sleep(0.1)
+    second = frontier.lease('w2')
+    assert second['id'] == first['id'] and second['attempts'] == 2
+    assert not frontier.ack(first['id'], 'w1')
+    time.sleep(0.1)
+    assert frontier.lease('w3') is None
+    assert frontier.stats()['failed'] == 1
+    frontier.close()
+
+
+def test_extend_lease_keeps_task_from_other_workers(tmp_path):
+    frontier = SQLiteFrontier(str(tmp_path / 'f.db'), run_id='test', lease_seconds=0.2, politeness_seconds=0)
+    frontier.enqueue('https://jumbo.com.do/hogar', 'jumbo')
+    task = frontier.lease('w1')
+    time.sleep(0.12)
+    assert frontier.extend_lease(task['id'], 'w1')
+    time.sleep(0.12)
+    assert frontier.lease('w2') is None
+    assert frontier.ack(task['id'], 'w1')
+    frontier.close()
+
+
+def test_worker_heartbeat_renews_lease_of_slow_task(tmp_path):
+    frontier = SQLiteFrontier(str(tmp_path / 'f.db'), run_id='test', lease_seconds=0.3, politeness_seconds=0)
+    frontier.enqueue('https://sirena.do/lacteos', 'sirena')
+    stolen = []
+
+    def slow(task):
+        for _ in range(6):
+            time.sleep(0.1)
+            stolen.append(frontier.lease('otro'))
+        return {'ok': True}
+
+    assert run_worker(frontier, slow, worker_id='w1', poll_interval=0.01) == 1
+    assert not any(stolen)
+    assert frontier.stats()['done'] == 1
+    frontier.close()
+
+
+def test_idle_worker_waits_for_a_crashed_workers_lease(tmp_path):
+    frontier = SQLiteFrontier(str(tmp_path / 'f.db'), run_id='test', lease_seconds=0.3, politeness_seconds=0)
+    frontier.enqueue('https://sirena.do/lacteos', 'sirena')
+    frontier.lease('caido')  # Nunca confirma ni renueva
+    done = run_worker(frontier, lambda task: None, worker_id='w1', poll_interval=0.02, idle_timeout=0)
+    assert done == 1
+    assert frontier.stats()['done'] == 1
+    frontier.close()
+
+
+def test_remote_frontier_round_trip(remote):
+    assert remote.enqueue('https://supermercadosnacional.com/lacteos', 'nacional', payload={'nombre': 'Lácteos'})
+    assert not remote.enqueue('https://www.supermercadosnacional.com/lacteos/', 'nacional')
+    task = remote.lease('w1', 'nacional')
+    assert task['payload'] == {'nombre': 'Lácteos'}
+    assert remote.lease('w2', 'nacional') is None
+    assert remote.extend_lease(task['id'], 'w1')
+    assert remote.ack(task['id'], 'w1', {'productos': 2})
+    assert remote.stats('nacional')['done'] == 1
+
+
+def test_worker_over_http_processes_every_task(remote):
+    for path in ('lacteos', 'carnes', 'bebidas'):
+        remote.enqueue(f'https://supermercadosnacional.com/{path}', 'nacional')
+    seen = []
+    assert run_worker(remote, lambda task: seen.append(task['url']), retailer='nacional', worker_id='w1',
+                      poll_interval=0.01) == 3
+    assert len(set(seen)) == 3
+
+
+def test_requests_without_the_shared_token_are_rejected(serve, frontier, monkeypatch):
+    url = serve(token='secreto')
+    for client in (RemoteFrontier(url), RemoteFrontier(url, token='otro')):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            client.enqueue('https://supermercadosnacional.com/lacteos', 'nacional')
+        assert error.value.code == 401
+    assert frontier.stats()['pending'] == 0
+
+    assert RemoteFrontier(url, token='secreto').enqueue('https://supermercadosnacional.com/lacteos', 'nacional')
+    # Los workers toman el token de la variable de entorno
+    monkeypatch.setenv(TOKEN_ENV, 'secreto')
+    assert RemoteFrontier(url).stats()['pending'] == 1
+
+
+def test_server_only_leaves_loopback_with_a_token(frontier):
+    with pytest.raises(ValueError):
+        FrontierServer(frontier, '0.0.0.0', 0)
+    server = FrontierServer(frontier, '0.0.0.0', 0, token='secreto')
+    server.server_close()
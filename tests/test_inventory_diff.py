@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+import pytest
+
+from mercadoscript import inventory_diff
+from mercadoscript.inventory_diff import DiffWriter, diff_inventories
+
+
+def write_inventory(path, rows, header=('Nombre', 'Precio', 'Categoria')):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def inventories(tmp_path):
+    old = write_inventory(tmp_path / 'anterior.csv', [
+        ('Leche Rica 1 L', 'RD$ 85.00', 'Lácteos'),
+        ('Queso Geo 500 g', 'RD$ 310.00', 'Lácteos'),
+        ('Pan Sobao', 'RD$ 60.00', 'Panadería'),
+        ('Yogur Yoka', 'Precio no disponible', 'Lácteos'),
+        ('Arroz Selecto 5 lb', 'RD$ 1,250.00', 'Despensa'),
+    ])
+    new = write_inventory(tmp_path / 'nuevo.csv', [
+        # Mismo producto con otra capitalización: misma clave
+        ('LECHE RICA 1 l', 'RD$ 85.00', 'Lácteos'),
+        ('Queso Geo 500 g', 'RD$ 295.50', 'Lácteos'),
+        ('Yogur Yoka', 'RD$ 45.00', 'Lácteos'),
+        ('Arroz Selecto 5 lb', 'RD$ 1,300.00', 'Despensa'),
+        ('Café Santo Domingo', 'RD$ 150.00', 'Despensa'),
+        ('Café Santo Domingo', 'RD$ 999.00', 'Despensa'),
+    ])
+    return old, new
+
+
+def by_change(records):
+    return {(record['cambio'], record['nombre']): record for record in records}
+
+
+def test_changes_between_two_runs(inventories):
+    records = by_change(diff_inventories(*inventories))
+
+    assert set(records) == {
+        ('baja', 'Queso Geo 500 g'), ('sube', 'Arroz Selecto 5 lb'), ('modificado', 'Yogur Yoka'),
+        ('nuevo', 'Café Santo Domingo'), ('eliminado', 'Pan Sobao'),
+    }
+    queso = records['baja', 'Queso Geo 500 g']
+    assert (queso['diferencia'], queso['diferencia_pct']) == (-14.5, -4.68)
+    arroz = records['sube', 'Arroz Selecto 5 lb']
+    assert (arroz['precio_anterior'], arroz['precio_nuevo'], arroz['diferencia']) == \
+        ('RD$ 1,250.00', 'RD$ 1,300.00', 50.0)
+    assert records['modificado', 'Yogur Yoka']['diferencia'] == ''
+    # Con claves repetidas manda la primera fila
+    assert records['nuevo', 'Café Santo Domingo']['precio_nuevo'] == 'RD$ 150.00'
+
+
+def test_partitioned_join_gives_the_same_changes(inventories, tmp_path):
+    single = sorted(map(json.dumps, diff_inventories(*inventories)))
+    partitioned = sorted(map(json.dumps, diff_inventories(*inventories, partitions=4, workdir=str(tmp_path))))
+    assert partitioned == single
+    # Las particiones temporales se borran al terminar
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['anterior.csv', 'nuevo.csv']
+
+
+def test_stable_key_column_is_preferred_over_the_name(tmp_path):
+    header = ('Nombre', 'Precio', 'SKU')
+    old = write_inventory(tmp_path / 'anterior.csv', [('Leche Rica', '85', 'LR-1')], header)
+    new = write_inventory(tmp_path / 'nuevo.csv', [('Leche Rica Entera', '90', 'LR-1')], header)
+    [record] = diff_inventories(old, new)
+    assert (record['cambio'], record['clave']) == ('sube', 'LR-1')
+
+
+def test_missing_name_column_is_an_error(tmp_path):
+    old = write_inventory(tmp_path / 'anterior.csv', [('LR-1', '85')], ('SKU', 'Precio'))
+    with pytest.raises(ValueError):
+        list(diff_inventories(old, old))
+
+
+def test_writer_counts_changes_in_both_formats(inventories):
+    for fmt in ('csv', 'jsonl'):
+        stream = io.StringIO()
+        writer = DiffWriter(stream, fmt)
+        for record in diff_inventories(*inventories):
+            writer.write(record)
+        assert writer.counts == {'nuevo': 1, 'eliminado': 1, 'sube': 1, 'baja': 1, 'modificado': 1}
+        lines = stream.getvalue().splitlines()
+        if fmt == 'csv':
+            assert lines[0] == ','.join(inventory_diff.OUTPUT_FIELDS)
+        else:
+            assert len(lines) == 5 and json.loads(lines[0])['cambio'] in inventory_diff.CHANGES
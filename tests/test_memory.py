@@ -0,0 +1,60 @@
+import argparse
+import json
+
+import pytest
+
+from mercadoscript import memory, metrics
+from mercadoscript.core import parse_html
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    monkeypatch.setattr(metrics, 'increment', registry.increment)
+    return registry
+
+
+def test_dispose_empties_the_tree(registry):
+    soup = parse_html('<html><body>' + '<div><a href="/p">Producto</a></div>' * 20 + '</body></html>')
+    memory.dispose(soup)
+    memory.dispose(None)
+    assert soup.find('a') is None
+    assert registry.counter_value('trees_disposed') == 1
+
+
+def test_tracker_measures_nested_phases(registry):
+    tracker = memory.MemoryTracker(top=3)
+    tracker.start()
+    kept = []
+    with registry.span('category'):
+        with registry.span('parse'):
+            garbage = [bytes(1024) for _ in range(1000)]
+            del garbage
+        kept.append(bytes(512 * 1024))
+    tracker.stop()
+
+    report = tracker.to_dict()
+    assert registry.span_listeners == []
+    assert report['phases']['parse']['peak_bytes'] >= 1000 * 1024
+    assert report['phases']['parse']['retained_bytes'] < 100 * 1024
+    # El pico de la fase anidada cuenta también en la que la contiene
+    assert report['phases']['category']['peak_bytes'] >= report['phases']['parse']['peak_bytes']
+    assert report['phases']['category']['retained_bytes'] >= 512 * 1024
+    assert len(report['top_allocations']) == 3
+
+
+def test_report_is_only_started_when_requested(registry, tmp_path, capsys):
+    parser = argparse.ArgumentParser()
+    memory.add_memory_arguments(parser)
+    assert memory.start(parser.parse_args([]), 'jumbo') is None
+
+    prefix = str(tmp_path / 'memoria')
+    tracker = memory.start(parser.parse_args(['--memory-report', '--memory-output', prefix]), 'jumbo')
+    with registry.span('fetch'):
+        pass
+    memory.finish(tracker)
+
+    with open(f'{prefix}.json', encoding='utf-8') as f:
+        assert json.load(f)['phases']['fetch']['count'] == 1
+    assert 'MEMORIA' in capsys.readouterr().out
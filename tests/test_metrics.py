@@ -0,0 +1,65 @@
+import json
+import threading
+
+from mercadoscript.metrics import MetricsRegistry
+
+
+def test_spans_are_aggregated_by_phase_and_category():
+    registry = MetricsRegistry()
+    registry.start_run('sirena')
+    with registry.category_context('Lácteos'):
+        with registry.span('parse'):
+            pass
+        registry.record('parse', 0.5)
+    registry.record('fetch', 1.25)
+
+    phases = {entry['phase']: entry for entry in registry.snapshot()['phases']}
+    assert phases['parse']['count'] == 2
+    assert phases['parse']['max_seconds'] == 0.5
+    assert phases['fetch']['total_seconds'] == 1.25
+    # Los spans del bloque se atribuyen a la categoría; ``record`` solo con categoría explícita
+    categories = registry.snapshot()['categories']
+    assert [(entry['category'], entry['phase'], entry['count']) for entry in categories] == [('Lácteos', 'parse', 1)]
+
+
+def test_category_context_is_per_thread():
+    registry = MetricsRegistry()
+    seen = []
+    with registry.category_context('Lácteos'):
+        thread = threading.Thread(target=lambda: seen.append(registry.current_category))
+        thread.start()
+        thread.join()
+        assert registry.current_category == 'Lácteos'
+    assert seen == [None]
+    assert registry.current_category is None
+
+
+def test_counters_sum_over_matching_labels():
+    registry = MetricsRegistry()
+    registry.start_run('jumbo')
+    registry.increment('requests')
+    registry.increment('requests', 2)
+    registry.increment('circuit_rejected', host='jumbo.com.do')
+    registry.increment('circuit_rejected', host='sirena.do')
+
+    assert registry.counter_value('requests') == 3
+    assert registry.counter_value('requests', retailer='jumbo') == 3
+    assert registry.counter_value('circuit_rejected', host='sirena.do') == 1
+    assert registry.counter_value('circuit_rejected') == 2
+
+
+def test_exports(tmp_path):
+    registry = MetricsRegistry()
+    registry.start_run('bravo')
+    registry.record('fetch', 0.25, category='Bebidas "frías"')
+    registry.increment('products', 7)
+    registry.finish_run()
+
+    text = registry.to_prometheus()
+    assert 'mercadoscript_phase_seconds_count{retailer="bravo",phase="fetch"} 1' in text
+    assert 'category="Bebidas \\"frías\\""' in text
+    assert 'mercadoscript_products_total{retailer="bravo"} 7' in text
+
+    registry.export(json_path=str(tmp_path / 'm.json'))
+    with open(tmp_path / 'm.json', encoding='utf-8') as f:
+        assert json.load(f)['counters'] == [{'name': 'products', 'labels': {'retailer': 'bravo'}, 'value': 7}]
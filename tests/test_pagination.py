@@ -0,0 +1,60 @@
+import pytest
+
+from mercadoscript import pagination
+
+CATEGORY = 'https://tienda.do/lacteos'
+
+
+@pytest.mark.parametrize('links, kind, param', [
+    (['https://tienda.do/lacteos?p=2'], 'page', 'p'),
+    (['https://tienda.do/lacteos?page=3&order=price'], 'page', 'page'),
+    (['https://tienda.do/lacteos/page/2/'], 'path', 'page'),
+    (['https://tienda.do/lacteos?offset=48', 'https://tienda.do/lacteos?offset=24'], 'offset', 'offset'),
+])
+def test_detect_scheme(links, kind, param):
+    scheme = pagination.detect_scheme(links)
+    assert (scheme.kind, scheme.param) == (kind, param)
+
+
+def test_detect_scheme_without_page_links():
+    assert pagination.detect_scheme(['https://tienda.do/lacteos?order=price']) is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Mostrando 1-24 de 356 productos', (356, 24)),
+    ('Showing 1–12 of 1,250 results', (1250, 12)),
+    ('120 artículos', (120, None)),
+    ('Sin resultados', (None, None)),
+])
+def test_total_results(text, expected):
+    assert pagination.total_results(text) == expected
+
+
+def test_predict_all_pages_from_total():
+    urls = pagination.predict_page_urls(CATEGORY, ['?p=2', '?p=3'], 'Mostrando 1-24 de 100 productos')
+    assert urls == [f'{CATEGORY}?p={page}' for page in range(2, 6)]
+
+
+def test_predict_offset_pages_use_announced_page_size():
+    urls = pagination.predict_page_urls(CATEGORY, ['?offset=20'], 'Mostrando 1-24 de 72 productos')
+    assert urls == [f'{CATEGORY}?offset=24', f'{CATEGORY}?offset=48']
+
+
+def test_total_smaller_than_first_page_is_ignored():
+    urls = pagination.predict_page_urls(CATEGORY, ['?p=2'], '1 producto', per_page=24, max_pages=4)
+    assert len(urls) == 3
+
+
+def test_without_total_element_only_visible_links_are_used():
+    urls = pagination.predict_page_urls(CATEGORY, ['?p=2', '?p=3', CATEGORY], None, per_page=24)
+    assert urls == [f'{CATEGORY}?p=2', f'{CATEGORY}?p=3']
+
+
+def test_max_pages_caps_the_prediction():
+    urls = pagination.predict_page_urls(CATEGORY, ['?p=2'], '5000 productos', per_page=10, max_pages=3)
+    assert urls == [f'{CATEGORY}?p=2', f'{CATEGORY}?p=3']
+
+
+def test_set_query_param_replaces_existing_value():
+    url = pagination.set_query_param('https://tienda.do/lacteos?p=2&q=leche', 'p', 5)
+    assert url == 'https://tienda.do/lacteos?q=leche&p=5'
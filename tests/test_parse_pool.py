@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from mercadoscript import metrics
+from mercadoscript.core import parse_html
+from mercadoscript.parse_pool import ParsePool
+
+
+def extract_names(html, key, suffix=''):
+    """Extracción de prueba: función de módulo para que viaje al trabajador"""
+    with metrics.span('parse'):
+        names = [a.get_text() + suffix for a in parse_html(html).find_all('a')]
+    metrics.increment('products_found', len(names))
+    return {'key': key, 'names': names, 'pid': os.getpid()}
+
+
+def page(*names, padding=0):
+    return '<html><body>' + ''.join(f'<a>{name}</a>' for name in names) + ' ' * padding + '</body></html>'
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    for name in ('registry', 'span', 'increment'):
+        monkeypatch.setattr(metrics, name, registry if name == 'registry' else getattr(registry, name))
+    return registry
+
+
+def test_inline_pool_keeps_order_and_skips_missing_pages(registry):
+    pool = ParsePool(0)
+    pages = [('p1', page('Leche')), ('p2', None), ('p3', page('Queso', 'Pan'))]
+    results = list(pool.ordered(pages, extract_names, '!'))
+    assert [key for key, _ in results] == ['p1', 'p2', 'p3']
+    assert results[1][1] is None
+    assert results[2][1]['names'] == ['Queso!', 'Pan!']
+    assert {result['pid'] for _, result in results if result} == {os.getpid()}
+
+
+def test_already_extracted_pages_are_processed_inline():
+    pool = ParsePool(0)
+    assert pool.parse(lambda page, key: (page, key), ['producto'], 'p1') == (['producto'], 'p1')
+
+
+@pytest.fixture(scope='module')
+def worker_pool():
+    # Umbral pequeño: las páginas con relleno viajan por memoria compartida
+    pool = ParsePool(1, shm_threshold=4096, window=3)
+    yield pool
+    pool.close()
+
+
+def test_worker_results_arrive_in_page_order_with_their_metrics(worker_pool, registry):
+    pages = [(f'p{i}', page(f'Producto {i}', padding=8192 if i % 2 else 0)) for i in range(6)]
+    results = list(worker_pool.ordered(pages, extract_names))
+
+    assert [key for key, _ in results] == [f'p{i}' for i in range(6)]
+    assert [result['names'] for _, result in results] == [[f'Producto {i}'] for i in range(6)]
+    assert {result['pid'] for _, result in results} != {os.getpid()}
+    assert registry.counter_value('shm_pages') == 3
+    assert registry.counter_value('products_found') == 6
+    phases = {entry['phase']: entry for entry in registry.snapshot()['phases']}
+    assert phases['parse']['count'] == 6
+
+
+def test_closing_early_stops_reading_pages(worker_pool, registry):
+    requested = []
+
+    def pages():
+        for i in range(50):
+            requested.append(i)
+            yield f'p{i}', page(f'Producto {i}')
+
+    generator = worker_pool.ordered(pages(), extract_names)
+    assert next(generator)[0] == 'p0'
+    generator.close()
+    # Como mucho la ventana de páginas en vuelo y la que la repuso
+    assert len(requested) <= worker_pool.window + 1
@@ -0,0 +1,82 @@
+import threading
+import time
+from contextlib import closing
+
+from mercadoscript.prefetch import DriverPool, PagePrefetcher
+
+URLS = [f'https://tienda.do/lacteos?p={page}' for page in range(2, 8)]
+
+
+def test_sequential_fetch_in_calling_thread():
+    threads = set()
+
+    def fetch(url):
+        threads.add(threading.current_thread())
+        return url.upper()
+
+    prefetcher = PagePrefetcher(fetch)
+    assert list(prefetcher.pages(URLS[:2])) == [(url, url.upper()) for url in URLS[:2]]
+    assert threads == {threading.current_thread()}
+
+
+def test_prefetched_pages_arrive_in_order_and_window_is_bounded():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fetch(url):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Las primeras tardan más: el orden de entrega no debe depender de cuál termina antes
+        time.sleep(0.05 if url.endswith(('2', '3')) else 0.01)
+        with lock:
+            in_flight -= 1
+        return url
+
+    prefetcher = PagePrefetcher(fetch, lookahead=2)
+    try:
+        assert [url for url, _ in prefetcher.pages(URLS)] == URLS
+    finally:
+        prefetcher.close()
+    assert peak <= 2
+
+
+def test_breaking_early_skips_pending_fetches():
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        time.sleep(0.02)
+        return url
+
+    prefetcher = PagePrefetcher(fetch, lookahead=2)
+    try:
+        with closing(prefetcher.pages(URLS)) as pages:
+            for url, _ in pages:
+                break
+    finally:
+        prefetcher.close()
+    # La primera página, la siguiente de la ventana y como mucho la que la repuso
+    assert len(fetched) <= 3
+
+
+def test_driver_pool_creates_one_driver_per_thread_and_quits_all():
+    class Driver:
+        quit_calls = 0
+
+        def quit(self):
+            Driver.quit_calls += 1
+
+    pool = DriverPool(Driver)
+    main_driver = pool.get()
+    assert pool.get() is main_driver
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.get()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_driver
+
+    pool.close()
+    assert Driver.quit_calls == 2
@@ -0,0 +1,85 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from mercadoscript.profiles import PROFILES, profile
+
+
+@pytest.mark.parametrize('site, url, text, expected', [
+    ('nacional', 'https://supermercadosnacional.com/lacteos', 'Lácteos y Huevos', True),
+    ('nacional', 'https://supermercadosnacional.com/despensa/arroz', 'Arroz', True),
+    ('nacional', 'https://supermercadosnacional.com/customer/account', 'Mi Cuenta', False),
+    ('nacional', 'https://supermercadosnacional.com/ofertas', 'Ofertas de la semana', False),
+    ('nacional', 'https://supermercadosnacional.com/electro', 'Electrodomésticos', False),
+    ('bravo', 'https://www.superbravo.com.do/categoria/bebidas', 'Bebidas', True),
+    ('bravo', 'https://otra.com/bebidas', 'Bebidas', False),
+    ('bravo', 'https://www.superbravo.com.do/sucursales', 'Sucursales', False),
+    ('sirena', 'https://www.sirena.do/lacteos', 'Lácteos', True),
+    ('sirena', 'https://www.sirena.do/account/login', 'Entrar', False),
+    ('sirena', 'https://www.sirena.do/inicio', 'Inicio', False),
+    ('sirena', 'https://jumbo.com.do/lacteos', 'Lácteos', False),
+    ('jumbo', 'https://jumbo.com.do/supermercado', 'Supermercado', True),
+    ('jumbo', 'https://jumbo.com.do/c/ofertas', 'Ofertas', True),
+    ('jumbo', 'https://jumbo.com.do/ayuda', 'Ayuda', False),
+    ('jumbo', 'https://jumbo.com.do/tiendas', 'Tiendas', False),
+])
+def test_is_category(site, url, text, expected):
+    assert profile(site).is_category(url, text) is expected
+
+
+def test_terms_keep_substring_semantics():
+    # "pan" también dentro de "Panadería" y "Empanadas", como con ``in``
+    nacional = profile('nacional')
+    assert nacional.is_category('https://supermercadosnacional.com/empanadas', 'Empanadas')
+    assert not nacional.is_category('', 'Lácteos')
+    assert not nacional.is_category('https://supermercadosnacional.com/x', 'X' * 60)
+
+
+def test_jumbo_departments():
+    jumbo = profile('jumbo')
+    assert jumbo.department('Artículos de Limpieza') == 'Hogar'
+    assert jumbo.department('Juguetes y Juegos') == 'Juguetería'
+    assert jumbo.department('Novedades') is None
+
+
+def test_dom_rules_and_total_text():
+    sirena = profile('sirena')
+    rules = sirena.dom_rules
+    assert rules['cards'] == PROFILES['sirena']['cards']
+    assert (rules['min_name'], rules['max_name']) == (8, 200)
+    assert profile('jumbo').dom_rules['first_match'] is True
+
+    listing = BeautifulSoup('<p class="toolbar-amount">1-24 de 90</p><p>3 productos en el carrito</p>',
+                            'html.parser')
+    assert sirena.total_text(listing) == '1-24 de 90'
+    assert sirena.total_text(BeautifulSoup('<p>3 productos en el carrito</p>', 'html.parser')) is None
+
+
+def test_profiles_are_compiled_once_and_unknown_sites_fail():
+    assert profile('bravo') is profile('bravo')
+    with pytest.raises(ValueError):
+        profile('colmado')
+
+
+def test_price_ranges_are_per_site():
+    # El tope de 500000 es de Jumbo; Sirena vende electrodomésticos de hasta dos millones
+    jumbo = profile('jumbo')
+    assert jumbo.price_from_text('RD$ 1,500.00') == 'RD$1,500.00'
+    assert jumbo.price_from_text('RD$ 600,000.00') is None
+    assert profile('sirena').price_from_text('RD$ 1,500,000') == 'RD$ 1,500,000'
+
+
+def test_sirena_finds_product_containers_without_card_classes():
+    soup = BeautifulSoup(
+        '<div class="navigation"><h3>Electrodomésticos Samsung</h3><span>RD$ 999</span></div>'
+        '<div><img src="nevera.jpg"><h3>Nevera Samsung 18 pies</h3><span>RD$ 45,000</span></div>',
+        'html.parser')
+    products = profile('sirena').extract_products(soup, 'https://www.sirena.do/electrodomesticos')
+    assert [(p['nombre'], p['precio']) for p in products] == [('Nevera Samsung 18 pies', 'RD$ 45,000')]
+
+
+def test_bravo_price_with_trailing_currency_keeps_the_amount():
+    bravo = profile('bravo')
+    assert bravo.price_from_text('250.00 RD$') == '250.00 RD$'
+    soup = BeautifulSoup('<div class="product-item"><h3>Arroz Selecto 5 lb</h3><p>Código 12345</p></div>',
+                         'html.parser')
+    assert bravo.extract_products(soup, 'https://www.superbravo.com.do/arroz')[0]['precio'] == 'No disponible'
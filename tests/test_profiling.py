@@ -0,0 +1,72 @@
+import argparse
+import os
+import pstats
+import threading
+
+import pytest
+
+from mercadoscript import metrics, profiling
+from mercadoscript.profiling import _PhaseGate
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'registry', registry)
+    return registry
+
+
+def test_phase_gate_follows_the_outermost_span_of_each_thread():
+    events = []
+    gate = _PhaseGate(['parse', 'product_extraction'], lambda thread: events.append('on'),
+                      lambda thread: events.append('off'))
+    gate('parse', 'start')
+    gate('product_extraction', 'start')
+    gate('fetch', 'start')
+    gate('fetch', 'end')
+    gate('product_extraction', 'end')
+    assert events == ['on']
+    gate('parse', 'end')
+    assert events == ['on', 'off']
+
+    other = threading.Thread(target=lambda: gate('parse', 'start'))
+    other.start()
+    other.join()
+    assert events == ['on', 'off', 'on']
+
+
+def slow_function():
+    return sum(i * i for i in range(20000))
+
+
+def test_cprofile_only_measures_the_selected_phases(registry, tmp_path):
+    parser = argparse.ArgumentParser()
+    profiling.add_profile_arguments(parser)
+    prefix = str(tmp_path / 'perfil')
+    assert profiling.start(parser.parse_args([]), 'jumbo') is None
+
+    profiler = profiling.start(parser.parse_args(['--profile', 'cprofile', '--profile-phases', 'parse',
+                                                  '--profile-output', prefix]), 'jumbo')
+    slow_function()
+    with registry.span('parse'):
+        sum(range(10))
+    profiling.finish(profiler)
+
+    assert registry.span_listeners == []
+    assert os.path.exists(f'{prefix}_hotspots.txt')
+    functions = {name for _, _, name in pstats.Stats(f'{prefix}.prof').stats}
+    assert 'slow_function' not in functions
+
+
+def test_sampling_profiler_writes_folded_stacks(registry, tmp_path):
+    profiler = profiling.SamplingProfiler(interval=0.001)
+    profiler.start()
+    while not profiler.stacks:
+        slow_function()
+    profiler.stop()
+
+    paths = profiler.write(str(tmp_path / 'perfil'), top=5)
+    assert [os.path.basename(path) for path in paths] == ['perfil.folded', 'perfil_hotspots.txt']
+    with open(paths[0], encoding='utf-8') as f:
+        stack, count = f.readline().rsplit(' ', 1)
+    assert ';' in stack and int(count) >= 1
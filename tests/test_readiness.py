@@ -0,0 +1,73 @@
+import pytest
+
+from mercadoscript import metrics, readiness
+from mercadoscript.readiness import Readiness, grid, present, text
+
+# ``Readiness.wait`` sondea con el ``WebDriverWait`` de Selenium
+pytest.importorskip('selenium')
+
+
+class FakeDriver:
+    """Devuelve una evaluación de ``READY_SCRIPT`` por sondeo; la última se repite"""
+
+    def __init__(self, *checks):
+        self.checks = list(checks)
+        self.rules = []
+
+    def execute_script(self, script, rules):
+        assert script == readiness.READY_SCRIPT
+        self.rules.append(rules)
+        return self.checks.pop(0) if len(self.checks) > 1 else self.checks[0]
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(readiness, 'POLL_SECONDS', 0.01)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'increment', registry.increment)
+    return registry
+
+
+def test_conditions_are_compiled_once_into_json_rules():
+    page = Readiness([grid(['.product-item'], r'RD\$', minimum=2), present('.pages'), text(500)])
+    assert page.rules['ready'] == [
+        {'kind': 'grid', 'cards': ['.product-item'], 'price': r'RD\$', 'min': 2, 'scan': 200},
+        {'kind': 'present', 'selectors': ['.pages']},
+        {'kind': 'text', 'min': 500},
+    ]
+    assert page.rules['broken'] == list(readiness.BROKEN_PATTERNS)
+
+
+def test_page_is_returned_as_soon_as_a_condition_holds(registry):
+    driver = FakeDriver(['pending', 'loading', 0, False], ['pending', 'waiting', 800, True],
+                        ['ready', '.product-item', 5000, True])
+    result = Readiness([present('.product-item')], settle=5).wait(driver, timeout=5)
+    assert (result.state, result.detail, result.text_length) == ('ready', '.product-item', 5000)
+    assert result.usable and len(driver.rules) == 3
+    assert registry.counter_value('readiness', state='ready') == 1
+
+
+def test_broken_pages_fail_immediately():
+    driver = FakeDriver(['broken', 'access denied', 120, True])
+    result = Readiness([present('.product-item')]).wait(driver, timeout=5)
+    assert (result.state, result.usable, len(driver.rules)) == ('broken', False, 1)
+
+
+@pytest.mark.parametrize('text_length, state', [(2000, 'settled'), (40, 'empty')])
+def test_complete_pages_without_conditions_settle(text_length, state):
+    driver = FakeDriver(['pending', 'waiting', text_length, True])
+    result = Readiness([present('.product-item')], min_text=300, settle=0.05).wait(driver, timeout=5)
+    assert result.state == state
+    assert result.usable == (state == 'settled')
+    assert 0.05 <= result.seconds < 1
+
+
+def test_pages_that_never_finish_loading_time_out():
+    driver = FakeDriver(['pending', 'loading', 10, False])
+    result = Readiness([present('.product-item')], settle=0).wait(driver, timeout=0.1)
+    assert (result.state, result.detail, result.text_length) == ('timeout', 'loading', 10)
+    assert not result.usable
@@ -0,0 +1,77 @@
+import pytest
+
+from mercadoscript import scheduler
+from mercadoscript.scheduler import YieldScheduler
+
+
+def category(slug):
+    return {'name': slug.title(), 'url': f'https://jumbo.com.do/{slug}'}
+
+
+def products(*pairs):
+    return [{'nombre': name, 'precio': price} for name, price in pairs]
+
+
+def drain(queue):
+    order = []
+    while len(queue):
+        order.append(queue.pop()[1]['url'].rsplit('/', 1)[-1])
+    return order
+
+
+def test_record_counts_new_and_changed_products():
+    queue = YieldScheduler('jumbo', history_dir=None)
+    lacteos = category('lacteos')
+    assert queue.record(lacteos, products(('Leche', '85'), ('Queso', '310')), 2.0, pages=2) == (2, 0)
+    assert queue.record(lacteos, products(('LECHE', '85'), ('Queso', '295'), ('Yogur', '45')), 1.0, pages=3) == \
+        (1, 1)
+    entry = queue.history[lacteos['url']]
+    # Media móvil: 0.5 * 2/s + 0.5 * 1/s
+    assert entry['rate'] == pytest.approx(1.5)
+    assert (entry['visits'], entry['pages']) == (2, 3)
+
+
+def test_productive_stale_categories_go_first_and_ties_keep_discovery_order(tmp_path, monkeypatch):
+    history = str(tmp_path)
+    past = YieldScheduler('jumbo', history_dir=history)
+    monkeypatch.setattr(scheduler.time, 'time', lambda: 1_000_000.0)
+    past.record(category('bebidas'), products(*[(f'Refresco {i}', '50') for i in range(10)]), 1.0, pages=1)
+    past.record(category('lacteos'), products(('Leche', '85')), 1.0, pages=1)
+    past.save()
+
+    monkeypatch.setattr(scheduler.time, 'time', lambda: 1_000_000.0 + 48 * 3600)
+    queue = YieldScheduler('jumbo', history_dir=history)
+    # Sin historial: la media de las conocidas
+    assert queue.expected_rate(category('limpieza')) == pytest.approx(5.5)
+    for position, slug in enumerate(['lacteos', 'limpieza', 'bebidas', 'panaderia']):
+        queue.push(category(slug), (position,))
+    assert drain(queue) == ['bebidas', 'limpieza', 'panaderia', 'lacteos']
+
+    discovery = YieldScheduler('jumbo', order='discovery', history_dir=history)
+    for position, slug in enumerate(['lacteos', 'limpieza', 'bebidas']):
+        discovery.push(category(slug), (position,))
+    assert drain(discovery) == ['lacteos', 'limpieza', 'bebidas']
+
+
+def test_recent_visits_are_worth_less():
+    queue = YieldScheduler('jumbo', history_dir=None)
+    queue.record(category('lacteos'), products(('Leche', '85')), 1.0, pages=1)
+    assert queue.expected_rate(category('lacteos')) == pytest.approx(scheduler.FRESHNESS_FLOOR, rel=0.01)
+
+
+def test_pages_are_capped_by_the_last_productive_visit():
+    queue = YieldScheduler('jumbo', history_dir=None)
+    queue.record(category('lacteos'), products(('Leche', '85')), 1.0, pages=2)
+    assert queue.max_pages(category('lacteos'), 10) == 3
+    assert queue.max_pages(category('bebidas'), 10) == 10
+    assert YieldScheduler('jumbo', order='discovery', history_dir=None).max_pages(category('lacteos'), 10) == 10
+
+
+def test_target_and_time_budget_stop_the_run(monkeypatch):
+    queue = YieldScheduler('jumbo', caps={'page': 20}, time_budget=60, history_dir=None)
+    assert queue.caps == {**scheduler.DEFAULT_CAPS, 'page': 20}
+    assert queue.exhausted(100, 100)
+    assert not queue.exhausted(10, 100)
+    monkeypatch.setattr(scheduler.time, 'monotonic', lambda: queue.started + 61)
+    assert queue.exhausted(10, 100)
+    assert not YieldScheduler('jumbo', history_dir=None).out_of_time()
@@ -0,0 +1,86 @@
+import csv
+import os
+
+import pytest
+
+from mercadoscript.search import SearchIndex, Segment, tokenize
+
+
+def record(name, price, per_unit=None):
+    return {'nombre': name, 'precio': f'RD$ {price}' if price is not None else '', 'precio_num': price,
+            'precio_por_unidad': per_unit, 'retailer': 'jumbo'}
+
+
+@pytest.fixture
+def segment():
+    return Segment('jumbo', [
+        record('Leche Entera Rica 1 L', 85.0, 85.0),
+        record('Leche Descremada Rica 1 L', 90.0, 90.0),
+        record('Leche Entera Rica 4 L', 300.0, 75.0),
+        record('Leche de Coco', None),
+        record('Jamón de Pavo', 250.0),
+    ])
+
+
+def names(records):
+    return [r['nombre'] for r in records]
+
+
+def test_tokenize_normalizes_case_accents_and_punctuation():
+    assert tokenize('Jamón-de PAVO, 1/2 lb') == ['jamon', 'de', 'pavo', '1', '2', 'lb']
+
+
+def test_documents_are_numbered_by_price(segment):
+    assert names(segment.records)[0] == 'Leche Entera Rica 1 L'
+    assert names(segment.records)[-1] == 'Leche de Coco'
+
+
+def test_last_term_is_a_prefix_and_typos_are_tolerated(segment):
+    assert {segment.records[doc]['nombre'] for doc in segment.match(['leche', 'ent'])} == \
+        {'Leche Entera Rica 1 L', 'Leche Entera Rica 4 L'}
+    assert {segment.records[doc]['nombre'] for doc in segment.match(['lceche', 'coco'])} == {'Leche de Coco'}
+    assert not segment.match(['zzzz'])
+
+
+def write_inventory(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['nombre', 'precio', 'categoria'])
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def index(tmp_path):
+    write_inventory(tmp_path / 'Inventario_Jumbo.csv', [
+        ('Leche Entera Rica 1 L', 'RD$ 85.00', 'Lácteos'),
+        ('Leche Entera Rica 4 L', 'RD$ 300.00', 'Lácteos'),
+    ])
+    write_inventory(tmp_path / 'Inventario_Bravo.csv', [
+        ('Leche Entera Milex 1 L', 'RD$ 80.00', 'Lácteos'),
+        ('Arroz Selecto 5 lb', 'RD$ 250.00', 'Despensa'),
+    ])
+    index = SearchIndex(str(tmp_path))
+    assert sorted(index.refresh()) == ['bravo', 'jumbo']
+    return index
+
+
+def test_search_across_retailers(index):
+    assert names(index.search('leche entera', k=2)) == ['Leche Entera Milex 1 L', 'Leche Entera Rica 1 L']
+    assert names(index.search('leche', min_price=100)) == ['Leche Entera Rica 4 L']
+    assert names(index.search('leche', retailers=['jumbo'], sort='precio_por_unidad', k=1)) == \
+        ['Leche Entera Rica 4 L']
+
+
+def test_refresh_rebuilds_only_changed_inventories(index, tmp_path):
+    generation = index.generation
+    assert index.refresh() == []
+    assert index.generation == generation
+
+    path = tmp_path / 'Inventario_Jumbo.csv'
+    write_inventory(path, [('Leche Entera Rica 1 L', 'RD$ 70.00', 'Lácteos')])
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    bravo = index.segments['bravo']
+
+    assert index.refresh() == ['jumbo']
+    assert index.segments['bravo'] is bravo
+    assert index.search('leche rica')[0]['precio_num'] == 70.0
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+import requests
+
+from mercadoscript import sitemap
+
+BASE = 'https://tienda.do/'
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.status_code = status_code
+        self.text = body
+        self.headers = {'Content-Type': 'application/xml'}
+        self.raw = io.BytesIO(body.encode())
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(self.status_code)
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Sesión con respuestas fijas por URL; registra las URLs pedidas"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url not in self.pages:
+            return FakeResponse('', status_code=404)
+        return FakeResponse(self.pages[url])
+
+
+def urlset(*urls):
+    locs = ''.join(f'<url><loc>{url}</loc></url>' for url in urls)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'
+
+
+@pytest.mark.parametrize('url', [
+    'https://tienda.do/about',
+    'https://tienda.do/contacto',
+    'https://tienda.do/politicas-de-privacidad',
+    'https://tienda.do/blog/recetas-faciles',
+])
+def test_short_paths_without_evidence_are_not_categories(url):
+    assert sitemap.classify_url(url, 'https://tienda.do/sitemap.xml', BASE) is None
+
+
+@pytest.mark.parametrize('url', [
+    'https://tienda.do/categoria/lacteos',
+    'https://tienda.do/product-category/bebidas/jugos',
+    'https://tienda.do/departamento/despensa',
+])
+def test_listing_paths_are_categories(url):
+    assert sitemap.classify_url(url, 'https://tienda.do/sitemap.xml', BASE) == 'category'
+
+
+def test_category_filter_is_positive_evidence():
+    def is_grocery(url, name):
+        return 'lacteos' in name.lower()
+
+    sitemap_url = 'https://tienda.do/sitemap.xml'
+    assert sitemap.classify_url('https://tienda.do/lacteos', sitemap_url, BASE, is_grocery) == 'category'
+    assert sitemap.classify_url('https://tienda.do/nosotros', sitemap_url, BASE, is_grocery) is None
+
+
+def test_sitemap_name_hints_and_foreign_hosts():
+    assert sitemap.classify_url('https://tienda.do/lacteos', 'https://tienda.do/category-sitemap.xml', BASE) == 'category'
+    assert sitemap.classify_url('https://tienda.do/leche-1l', 'https://tienda.do/product-sitemap.xml', BASE) == 'product'
+    assert sitemap.classify_url('https://otra.do/categoria/lacteos', 'https://tienda.do/sitemap.xml', BASE) is None
+
+
+def test_max_urls_is_a_global_cap():
+    session = FakeSession({
+        'https://tienda.do/robots.txt': 'Sitemap: https://tienda.do/a.xml\nSitemap: https://tienda.do/b.xml',
+        'https://tienda.do/a.xml': urlset('https://tienda.do/categoria/lacteos', 'https://tienda.do/categoria/carnes'),
+        'https://tienda.do/b.xml': urlset('https://tienda.do/categoria/bebidas'),
+    })
+    tree = sitemap.discover_categories(BASE, session=session, max_urls=2)
+
+    assert [node['name'] for node in tree] == ['Carnes', 'Lacteos']
+    assert 'https://tienda.do/b.xml' not in session.requested
+
+
+def test_no_categories_returns_none():
+    session = FakeSession({
+        'https://tienda.do/sitemap.xml': urlset('https://tienda.do/about', 'https://tienda.do/contacto'),
+    })
+    assert sitemap.discover_categories(BASE, session=session) is None
+
+
+def test_tree_and_leaves():
+    tree = sitemap.build_category_tree([
+        'https://tienda.do/categoria/bebidas/jugos',
+        'https://tienda.do/categoria/bebidas',
+        'https://tienda.do/categoria/bebidas/',
+    ])
+    assert [(node['name'], node['parent_url']) for node in tree] == [
+        ('Bebidas', None),
+        ('Jugos', 'https://tienda.do/categoria/bebidas'),
+    ]
+    assert [node['name'] for node in sitemap.leaf_categories(tree)] == ['Jugos']
@@ -0,0 +1,59 @@
+import pytest
+
+from mercadoscript import units
+
+
+def size(name):
+    result = units.parse_sizes([name])[0]
+    return (round(result[0], 4), result[1]) if result else None
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Leche Entera 1 L', (1.0, 'l')),
+    ('Refresco 390 Ml', (0.39, 'l')),
+    ('Vino Tinto 75 Cl', (0.75, 'l')),
+    ('Jamón 3/4 lB', (0.3402, 'kg')),
+    ('Arroz 1,5 kg', (1.5, 'kg')),
+    ('Queso 1,000 g', (1.0, 'kg')),
+    ('Harina 12,500 g', (12.5, 'kg')),
+    ('Agua 6 x 355 ml', (2.13, 'l')),
+    ('Cerveza 12 Oz x 6', (2.0412, 'kg')),
+    ('Refresco 2 L x 6 Und', (12.0, 'l')),
+    ('Papel Higiénico 12 Rollos x 2 capas', (12.0, 'un')),
+    ('Servilletas 8 Und/Paq', (8.0, 'un')),
+    ('Jugo 4 Und 200 ml', (0.2, 'l')),
+    ('Detergente Líquido', None),
+])
+def test_parse_sizes(name, expected):
+    assert size(name) == expected
+
+
+def test_rows_stay_aligned_with_newlines_and_none():
+    sizes = units.parse_sizes(['Leche\nEntera 1 L', None, '', 'Queso 1,000 g'])
+    assert sizes == [(1.0, 'l'), None, None, (1.0, 'kg')]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('RD$1,219.96', 1219.96),
+    ('$ 85.50', 85.5),
+    ('1.219,96', 1219.96),
+    ('RD$ 45,50', 45.5),
+    ('RD$ 1,500', 1500.0),
+    ('Agotado', None),
+    (None, None),
+])
+def test_parse_prices(text, expected):
+    assert units.parse_prices([text]) == [expected]
+
+
+def test_unit_prices_and_annotate():
+    products = [{'nombre': 'Arroz 5 lb', 'precio': 'RD$226.80'}, {'nombre': 'Bolsa', 'precio': 'RD$10'}]
+    units.annotate(products)
+    assert products[0]['unidad_base'] == 'kg'
+    assert products[0]['precio_por_unidad'] == pytest.approx(100.0, abs=0.01)
+    assert products[1]['unidad_base'] == '' and products[1]['precio_numerico'] == 10.0
+
+
+def test_size_pattern_keeps_trailing_multiplier():
+    match = units.SIZE_PATTERN.search('Cerveza Presidente 12 Oz x 6')
+    assert (match['qty'], match['unit'], match['times']) == ('12', 'Oz', '6')
@@ -0,0 +1,54 @@
+import pytest
+
+from mercadoscript import metrics
+from mercadoscript.urls import SeenURLs, canonical_url, unique_urls
+
+
+@pytest.mark.parametrize('url, site, expected', [
+    ('HTTPS://Sirena.do:443/categoria/#top', None, 'https://sirena.do/categoria/'),
+    ('https://sirena.do/x?utm_source=fb&b=2&gclid=1&a=1', None, 'https://sirena.do/x?a=1&b=2'),
+    ('https://sirena.do/x?page=1&p=2', None, 'https://sirena.do/x?p=2'),
+    ('http://sirena.do:8080/x', None, 'http://sirena.do:8080/x'),
+    ('https://sirena.do/categoria/lacteos/', 'sirena', 'https://www.sirena.do/categoria/lacteos'),
+    ('https://www.sirena.do/categoria/lacteos', 'sirena', 'https://www.sirena.do/categoria/lacteos'),
+    ('https://www.supermercadosnacional.com/lacteos.html?sid=abc&product_list_mode=grid&p=3', 'nacional',
+     'https://supermercadosnacional.com/lacteos.html?p=3'),
+    ('https://superbravo.com.do/lacteos/', 'bravo', 'https://www.superbravo.com.do/lacteos/'),
+    # Lo que no es una URL web se devuelve tal cual
+    ('javascript:void(0)', None, 'javascript:void(0)'),
+    ('/categoria/lacteos', None, '/categoria/lacteos'),
+    ('https://sirena.do:puerto/x', None, 'https://sirena.do:puerto/x'),
+])
+def test_canonical_url(url, site, expected):
+    assert canonical_url(url, site) == expected
+
+
+def test_canonical_url_is_idempotent():
+    url = canonical_url('https://www.Jumbo.com.do/lacteos/?utm_medium=x&page=2#arriba', 'jumbo')
+    assert canonical_url(url, 'jumbo') == url
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'increment', registry.increment)
+    return registry
+
+
+def test_seen_urls_compare_canonical_forms_and_count_avoided_fetches(registry):
+    seen = SeenURLs('sirena', ['https://www.sirena.do/lacteos'])
+    assert not seen.add('https://www.sirena.do/lacteos')
+    assert not seen.add('https://sirena.do/lacteos/?utm_source=x')
+    assert not seen.add('https://sirena.do/lacteos/?utm_source=x')
+    assert seen.add('https://www.sirena.do/bebidas')
+    assert 'https://SIRENA.do/bebidas/' in seen
+    assert set(seen) == {'https://www.sirena.do/lacteos', 'https://www.sirena.do/bebidas'}
+    assert len(seen) == 2
+    # Solo cuenta la repetición que la comparación de cadenas no habría detectado, y una vez
+    assert registry.counter_value('fetches_avoided') == 1
+
+
+def test_unique_urls_keeps_order_and_excludes_the_current_page(registry):
+    current = 'https://jumbo.com.do/lacteos'
+    candidates = [f'{current}?page=1', f'{current}?page=3', f'{current}?page=2', f'{current}/?page=3#x']
+    assert unique_urls(candidates, 'jumbo', exclude=[current]) == [f'{current}?page=3', f'{current}?page=2']